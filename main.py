@@ -20,6 +20,7 @@ def ask(
     max_plan_iterations=1,
     max_step_num=3,
     enable_background_investigation=True,
+    max_parallel_steps=1,
 ):
     """Run the agent workflow with the given question.
 
@@ -29,6 +30,7 @@ def ask(
         max_plan_iterations: Maximum number of plan iterations
         max_step_num: Maximum number of steps in a plan
         enable_background_investigation: If True, performs web search before planning to enhance context
+        max_parallel_steps: Maximum number of research steps executed concurrently
     """
     asyncio.run(
         run_agent_workflow_async(
@@ -37,6 +39,7 @@ def ask(
             max_plan_iterations=max_plan_iterations,
             max_step_num=max_step_num,
             enable_background_investigation=enable_background_investigation,
+            max_parallel_steps=max_parallel_steps,
         )
     )
 
@@ -46,6 +49,7 @@ def main(
     max_plan_iterations=1,
     max_step_num=3,
     enable_background_investigation=True,
+    max_parallel_steps=1,
 ):
     """Interactive mode with built-in questions.
 
@@ -54,6 +58,7 @@ def main(
         debug: If True, enables debug level logging
         max_plan_iterations: Maximum number of plan iterations
         max_step_num: Maximum number of steps in a plan
+        max_parallel_steps: Maximum number of research steps executed concurrently
     """
     # First select language
     language = inquirer.select(
@@ -93,6 +98,7 @@ def main(
         max_plan_iterations=max_plan_iterations,
         max_step_num=max_step_num,
         enable_background_investigation=enable_background_investigation,
+        max_parallel_steps=max_parallel_steps,
     )
 
 
@@ -117,6 +123,12 @@ if __name__ == "__main__":
         default=3,
         help="Maximum number of steps in a plan (default: 3)",
     )
+    parser.add_argument(
+        "--max_parallel_steps",
+        type=int,
+        default=1,
+        help="Maximum number of research steps executed concurrently (default: 1)",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument(
         "--no-background-investigation",
@@ -134,6 +146,7 @@ if __name__ == "__main__":
             max_plan_iterations=args.max_plan_iterations,
             max_step_num=args.max_step_num,
             enable_background_investigation=args.enable_background_investigation,
+            max_parallel_steps=args.max_parallel_steps,
         )
     else:
         # Parse user input from command line arguments or user input
@@ -149,4 +162,5 @@ if __name__ == "__main__":
             max_plan_iterations=args.max_plan_iterations,
             max_step_num=args.max_step_num,
             enable_background_investigation=args.enable_background_investigation,
+            max_parallel_steps=args.max_parallel_steps,
         )
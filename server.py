@@ -38,6 +38,12 @@ if __name__ == "__main__":
         default=8000,
         help="Port to bind the server to (default: 8000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -57,9 +63,10 @@ if __name__ == "__main__":
 
     logger.info("Starting DeerFlow API server")
     uvicorn.run(
-        "src.server:app",
+        "src.server.app:app",
         host=args.host,
         port=args.port,
         reload=reload,
+        workers=args.workers,
         log_level=args.log_level,
     )
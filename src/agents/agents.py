@@ -1,10 +1,13 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from collections import OrderedDict
+
 from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
 from src.tools import (
+    batch_crawl_tool,
     crawl_tool,
     python_repl_tool,
     web_search_tool,
@@ -25,8 +28,32 @@ def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template:
     )
 
 
+# Cache for agents created with dynamically loaded tools
+_agent_cache: OrderedDict[tuple, object] = OrderedDict()
+_AGENT_CACHE_SIZE = 32
+
+
+def get_or_create_agent(
+    agent_name: str, agent_type: str, tools: list, prompt_template: str
+):
+    """Return the cached agent for this tool set, creating it on first use."""
+    # The cached agent keeps its tools alive, so their ids stay unique
+    key = (agent_name, agent_type, prompt_template, tuple(id(tool) for tool in tools))
+    if key in _agent_cache:
+        _agent_cache.move_to_end(key)
+        return _agent_cache[key]
+    agent = create_agent(agent_name, agent_type, tools, prompt_template)
+    _agent_cache[key] = agent
+    while len(_agent_cache) > _AGENT_CACHE_SIZE:
+        _agent_cache.popitem(last=False)
+    return agent
+
+
 # Create agents using the factory function
 research_agent = create_agent(
-    "researcher", "researcher", [web_search_tool, crawl_tool], "researcher"
+    "researcher",
+    "researcher",
+    [web_search_tool, crawl_tool, batch_crawl_tool],
+    "researcher",
 )
 coder_agent = create_agent("coder", "coder", [python_repl_tool], "coder")
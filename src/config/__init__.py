@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 from .tools import SEARCH_MAX_RESULTS, SELECTED_SEARCH_ENGINE, SearchEngine
-from .loader import load_yaml_config
+from .loader import load_yaml_config, load_conf_section
 from .questions import BUILT_IN_QUESTIONS, BUILT_IN_QUESTIONS_ZH_CN
 
 from dotenv import load_dotenv
@@ -14,6 +14,12 @@ class Configuration:
 
     max_plan_iterations: int = 1  # Maximum number of plan iterations
     max_step_num: int = 3  # Maximum number of steps in a plan
+    # Maximum number of research steps executed concurrently
+    max_parallel_steps: int = 1
+    # Token budget of prior findings given to a step
+    max_findings_tokens: int = 8000
+    # Token budget of findings given to the reporter
+    max_report_findings_tokens: int = 32000
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
 
     @classmethod
@@ -3,8 +3,11 @@
 
 import os
 import yaml
+from pathlib import Path
 from typing import Dict, Any
 
+CONF_PATH = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+
 
 def replace_env_vars(value: str) -> str:
     """Replace environment variables in string values."""
@@ -50,3 +53,8 @@ def load_yaml_config(file_path: str) -> Dict[str, Any]:
     # 将处理后的配置存入缓存
     _config_cache[file_path] = processed_config
     return processed_config
+
+
+def load_conf_section(section: str) -> Dict[str, Any]:
+    """Load a top-level section of the project conf.yaml, {} if it is missing."""
+    return load_yaml_config(CONF_PATH).get(section) or {}
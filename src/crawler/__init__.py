@@ -2,9 +2,21 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
-from .crawler import Crawler
+from .chunk_selector import select_chunks
+from .crawl_cache import CrawlCache, get_crawl_cache
+from .crawler import Crawler, CrawlerSettings
+from .direct_client import BlockedAddressError, DirectClient, UnsupportedContentError
+from .lxml_readability import LxmlReadabilityExtractor
 
 __all__ = [
     "Article",
+    "BlockedAddressError",
+    "CrawlCache",
     "Crawler",
+    "CrawlerSettings",
+    "DirectClient",
+    "LxmlReadabilityExtractor",
+    "UnsupportedContentError",
+    "get_crawl_cache",
+    "select_chunks",
 ]
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Optional
 from urllib.parse import urljoin
 
 from markdownify import markdownify as md
@@ -10,15 +11,23 @@ from markdownify import markdownify as md
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: Optional[str] = None):
         self.title = title
         self.html_content = html_content
+        # converted lazily from html_content, or restored from the crawl cache
+        self.markdown = markdown
+        # whether the extraction stopped before the end of the article
+        self.truncated = False
+        # seconds spent per extraction stage
+        self.timings: dict[str, float] = {}
 
     def to_markdown(self, including_title: bool = True) -> str:
+        if self.markdown is None:
+            self.markdown = md(self.html_content)
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        markdown += self.markdown
         return markdown
 
     def to_message(self) -> list[dict]:
@@ -0,0 +1,195 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pick the parts of a crawled page that matter for a query.
+
+The markdown is split into chunks of paragraphs within a section, each
+chunk is scored against the query with BM25, and the best chunks that fit
+into the character budget are returned in page order. Chinese text has no
+spaces, so runs of CJK characters are indexed as overlapping bigrams.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Optional
+
+_TOKEN = re.compile(
+    r"[a-z0-9]+(?:[.,][0-9]+)*|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+"
+)
+_BLOCK_SEPARATOR = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[。！？；.!?;])\s*")
+_SETEXT_UNDERLINE = re.compile(r"^(=+|-+)\s*$")
+_GAP = "\n\n...\n\n"
+_TAIL = "\n\n..."
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words, numbers and CJK bigrams."""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        word = match.group()
+        if word[0].isascii():
+            tokens.append(word)
+        elif len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25:
+    """
+    Okapi BM25 index over a fixed list of tokenized documents.
+    """
+
+    def __init__(self, documents: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.frequencies = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.avg_length = sum(self.lengths) / len(documents) if documents else 0.0
+        document_frequency = Counter(
+            token for frequencies in self.frequencies for token in frequencies
+        )
+        n = len(documents)
+        self.idf = {
+            token: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for token, df in document_frequency.items()
+        }
+
+    def scores(self, query: list[str]) -> list[float]:
+        """Return the score of every document for the query tokens."""
+        query = [token for token in set(query) if token in self.idf]
+        scores = []
+        for frequencies, length in zip(self.frequencies, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            scores.append(
+                sum(
+                    self.idf[token]
+                    * frequencies[token]
+                    * (self.k1 + 1)
+                    / (frequencies[token] + norm)
+                    for token in query
+                    if token in frequencies
+                )
+            )
+        return scores
+
+
+def _is_heading(block: str) -> bool:
+    lines = block.splitlines()
+    return block.startswith("#") or (
+        len(lines) == 2 and bool(_SETEXT_UNDERLINE.match(lines[1]))
+    )
+
+
+def _pack(pieces: list[str], max_chars: int, separator: str) -> list[str]:
+    packed, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            packed.append(current)
+            current = ""
+        current = f"{current}{separator}{piece}" if current else piece
+    return packed + [current] if current else packed
+
+
+def _split_block(block: str, max_chars: int) -> list[str]:
+    if len(block) <= max_chars:
+        return [block]
+    lines = block.splitlines()
+    # Every piece of a table keeps its header row
+    if len(lines) > 2 and lines[0].startswith("|") and lines[1].startswith("|"):
+        header = "\n".join(lines[:2])
+        return [
+            f"{header}\n{rows}"
+            for rows in _pack(lines[2:], max_chars - len(header) - 1, "\n")
+        ]
+    pieces = []
+    for line in lines:
+        pieces.extend(
+            sentence for sentence in _SENTENCE_END.split(line) if sentence.strip()
+        )
+    # A sentence longer than max_chars stays whole, the budget cuts it later
+    return _pack(pieces, max_chars, " ")
+
+
+def split_chunks(markdown: str, max_chars: int = 500) -> list[tuple[str, str]]:
+    """
+    Split markdown into (heading, chunk) pairs of at most max_chars.
+
+    Consecutive paragraphs of a section are packed into one chunk, a
+    heading starts a new chunk, and oversized paragraphs and tables are
+    split by sentence and by row.
+    """
+    chunks, heading, blocks = [], "", []
+
+    def flush():
+        chunks.extend((heading, chunk) for chunk in _pack(blocks, max_chars, "\n\n"))
+        blocks.clear()
+
+    for block in _BLOCK_SEPARATOR.split(markdown):
+        block = block.strip()
+        if not block:
+            continue
+        if _is_heading(block):
+            flush()
+            heading = block.splitlines()[0].lstrip("#").strip()
+        blocks.extend(_split_block(block, max_chars))
+    flush()
+    return chunks
+
+
+def select_chunks(
+    markdown: str,
+    query: Optional[str],
+    budget: int,
+    max_chunk_chars: Optional[int] = None,
+) -> str:
+    """
+    Return the chunks of markdown most relevant to query within budget
+    characters, in page order, with "..." marking the skipped parts.
+
+    Without a query, or when nothing matches it, the page is cut at a
+    chunk boundary instead.
+    """
+    if len(markdown) <= budget:
+        return markdown
+    max_chunk_chars = max_chunk_chars or max(200, budget // 3)
+    chunks = split_chunks(markdown, max_chunk_chars)
+    if not chunks:
+        return ""
+
+    scores = [0.0] * len(chunks)
+    query_tokens = tokenize(query or "")
+    if query_tokens:
+        index = BM25([tokenize(f"{heading} {chunk}") for heading, chunk in chunks])
+        scores = index.scores(query_tokens)
+    # Ties, including a query without any match, go to the earlier chunk
+    ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+
+    # Every chunk pays for a gap, plus room for the trailing one
+    selected, used = set(), len(_TAIL)
+    for i in ranked:
+        cost = len(chunks[i][1]) + len(_GAP)
+        if used + cost <= budget:
+            selected.add(i)
+            used += cost
+        elif scores[i] <= 0:
+            # Unmatched chunks only fill up the budget from the top of the page
+            break
+    if not selected:
+        return chunks[ranked[0]][1][:budget]
+
+    content, previous = "", None
+    for i in sorted(selected):
+        if previous is not None:
+            content += "\n\n" if i == previous + 1 else _GAP
+        elif i > 0:
+            content += "...\n\n"
+        content += chunks[i][1]
+        previous = i
+    if previous < len(chunks) - 1:
+        content += _TAIL
+    return content
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cache of extracted articles keyed by normalized URL.
+
+Configured by the `CRAWL_CACHE` section of conf.yaml:
+
+    CRAWL_CACHE:
+      enabled: true
+      path: .cache/crawl_cache.db
+      max_entries: 512
+      ttl_seconds: 86400
+      domain_ttl_seconds:
+        finance.sina.com.cn: 300  # quotes and news pages go stale fast
+        sec.gov: 604800  # filings never change
+"""
+
+import hashlib
+from dataclasses import dataclass, field, fields
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.config import load_conf_section
+from src.utils.cache import TwoTierCache
+
+from .article import Article
+
+# Query parameters that only track the visitor and never change the content
+_TRACKING_PARAMS = {"fbclid", "gclid", "spm"}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so that equivalent addresses share one cache key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+@dataclass(kw_only=True)
+class CrawlCacheSettings:
+    """The crawl cache fields of conf.yaml."""
+
+    enabled: bool = True
+    path: Optional[str] = ".cache/crawl_cache.db"  # Disk tier, memory only if empty
+    max_entries: int = 512  # Articles kept in memory
+    ttl_seconds: int = 24 * 3600  # Default time to live of an article
+    domain_ttl_seconds: dict = field(default_factory=dict)  # Per-domain overrides
+
+    @classmethod
+    def from_conf(cls) -> "CrawlCacheSettings":
+        """Create a CrawlCacheSettings instance from conf.yaml."""
+        conf = load_conf_section("CRAWL_CACHE")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if f.name in conf and conf[f.name] is not None
+            }
+        )
+
+
+class CrawlCache:
+    """
+    Cache of crawled articles, storing their title and markdown.
+    """
+
+    def __init__(self, settings: Optional[CrawlCacheSettings] = None):
+        self.settings = settings or CrawlCacheSettings.from_conf()
+        self._cache = TwoTierCache(
+            max_entries=self.settings.max_entries,
+            ttl_seconds=self.settings.ttl_seconds,
+            path=self.settings.path or None,
+        )
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        """Return the time to live of url, the most specific domain rule wins."""
+        host = (urlsplit(url).hostname or "").lower()
+        best_match, ttl = "", self.settings.ttl_seconds
+        for domain, domain_ttl in self.settings.domain_ttl_seconds.items():
+            domain = domain.lower().lstrip(".")
+            if (host == domain or host.endswith("." + domain)) and len(domain) > len(
+                best_match
+            ):
+                best_match, ttl = domain, domain_ttl
+        return ttl
+
+    def get(self, url: str, min_chars: Optional[int] = None) -> Optional[Article]:
+        """
+        Return the cached article of url, or None.
+
+        A truncated article is only returned when it holds min_chars of
+        markdown, and never when min_chars is None.
+        """
+        if not self.settings.enabled:
+            return None
+        entry = self._cache.get(self._key(url))
+        if entry is None:
+            return None
+        if entry.get("truncated") and (
+            min_chars is None or len(entry["markdown"]) < min_chars
+        ):
+            return None
+        article = Article(
+            title=entry["title"], html_content="", markdown=entry["markdown"]
+        )
+        article.truncated = entry.get("truncated", False)
+        article.url = url
+        return article
+
+    def set(self, url: str, article: Article):
+        """
+        Store the title and markdown of article under url.
+
+        Articles without markdown, e.g. of a failed parse or a blocked page,
+        aren't stored, so the next crawl tries again.
+        """
+        if not self.settings.enabled:
+            return
+        markdown = article.to_markdown(including_title=False)
+        if not markdown.strip():
+            return
+        self._cache.set(
+            self._key(url),
+            {
+                "url": normalize_url(url),
+                "title": article.title,
+                "markdown": markdown,
+                "truncated": article.truncated,
+            },
+            ttl_seconds=self.ttl_for(url),
+        )
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+_crawl_cache: Optional[CrawlCache] = None
+
+
+def get_crawl_cache() -> CrawlCache:
+    """Get the process-wide crawl cache."""
+    global _crawl_cache
+    if _crawl_cache is None:
+        _crawl_cache = CrawlCache()
+    return _crawl_cache
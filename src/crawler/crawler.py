@@ -1,15 +1,103 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import sys
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Optional, Union
+from urllib.parse import urlsplit
+
+from src.config import load_conf_section
 
 from .article import Article
+from .crawl_cache import CrawlCache, get_crawl_cache
+from .direct_client import DirectClient
 from .jina_client import JinaClient
+from .lxml_readability import LxmlReadabilityExtractor
 from .readability_extractor import ReadabilityExtractor
 
 
+@dataclass(kw_only=True)
+class CrawlerSettings:
+    """The crawler fields of conf.yaml."""
+
+    # jina fetches pages through the Jina reader, direct from their own site
+    backend: str = "jina"
+    max_page_bytes: int = 5 * 1024 * 1024  # Direct fetches are cut off beyond
+    user_agent: Optional[str] = None  # Of direct fetches, a desktop browser if empty
+    # Let direct fetches reach loopback, private and link-local addresses
+    allow_private_addresses: bool = False
+    # lxml extracts in process, readabilipy runs Readability.js through Node.js
+    extractor: str = "lxml"
+    max_concurrency: int = 8  # Pages crawled at the same time, across batches
+    max_concurrency_per_domain: int = 2  # Of which on the same domain
+    max_batch_size: int = 10  # URLs accepted by one batch
+    content_budget: int = 1000  # Characters of a page returned by the crawl tools
+    max_extract_chars: int = 20000  # Markdown the most relevant parts are picked from
+
+    @classmethod
+    def from_conf(cls) -> "CrawlerSettings":
+        """Create a CrawlerSettings instance from conf.yaml."""
+        conf = load_conf_section("CRAWLER")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+class _CrawlLimits:
+    """Crawl slots shared by every batch running on one event loop."""
+
+    def __init__(self, settings: CrawlerSettings):
+        self.global_limit = asyncio.Semaphore(settings.max_concurrency)
+        self.per_domain = settings.max_concurrency_per_domain
+        # domain -> [semaphore, crawls holding or waiting for it]
+        self._domains: dict[str, list] = {}
+
+    @asynccontextmanager
+    async def slot(self, domain: str):
+        entry = self._domains.setdefault(
+            domain, [asyncio.Semaphore(self.per_domain), 0]
+        )
+        entry[1] += 1
+        try:
+            # Wait for the domain first, so a busy domain holds no global slot
+            async with entry[0], self.global_limit:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._domains[domain]
+
+
+# asyncio.Semaphore can't be shared across event loops
+_crawl_limits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_crawl_limits(settings: CrawlerSettings) -> _CrawlLimits:
+    loop = asyncio.get_running_loop()
+    limits = _crawl_limits.get(loop)
+    if limits is None:
+        limits = _CrawlLimits(settings)
+        _crawl_limits[loop] = limits
+    return limits
+
+
 class Crawler:
-    def crawl(self, url: str) -> Article:
+    def __init__(
+        self,
+        cache: Optional[CrawlCache] = None,
+        settings: Optional[CrawlerSettings] = None,
+    ):
+        self.cache = cache or get_crawl_cache()
+        self.settings = settings or CrawlerSettings.from_conf()
+
+    def crawl(self, url: str, max_chars: Optional[int] = None) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
         # them into text and image blocks for one single and unified
@@ -17,16 +105,82 @@ class Crawler:
         #
         # Jina is not the best crawler on readability, however it's
         # much easier and free to use.
+        # With CRAWLER.backend set to direct, pages are fetched from their
+        # own site instead, saving the hop through the Jina reader.
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        #
+        # Extracted articles are cached by normalized URL, so revisiting
+        # a page within its TTL skips both the fetch and the extraction.
+        #
+        # With max_chars, the lxml extractor stops converting once it has
+        # produced that much markdown, callers reading only the beginning
+        # of a page don't pay for the rest of it.
+        article = self.cache.get(url, min_chars=max_chars)
+        if article is not None:
+            return article
+        html = self._fetcher().crawl(url, return_format="html")
+        article = self._extract(html, max_chars)
+        article.url = url
+        self.cache.set(url, article)
+        return article
+
+    async def acrawl(self, url: str, max_chars: Optional[int] = None) -> Article:
+        """Asynchronous version of `crawl`, extracting off the event loop."""
+        article = await asyncio.to_thread(self.cache.get, url, max_chars)
+        if article is not None:
+            return article
+        html = await self._fetcher().acrawl(url, return_format="html")
+        article = await asyncio.to_thread(self._extract, html, max_chars)
         article.url = url
+        await asyncio.to_thread(self.cache.set, url, article)
         return article
 
+    async def crawl_many(
+        self, urls: list[str], max_chars: Optional[int] = None
+    ) -> AsyncIterator[tuple[str, Union[Article, Exception]]]:
+        """
+        Crawl urls concurrently, yielding (url, article) as each one completes.
+
+        At most max_concurrency pages are crawled at the same time, and at
+        most max_concurrency_per_domain of them on the same domain, counting
+        every batch running on the event loop. A page that fails yields its
+        exception instead of an article.
+        """
+        limits = _get_crawl_limits(self.settings)
+
+        async def crawl(url: str) -> tuple[str, Union[Article, Exception]]:
+            domain = (urlsplit(url).hostname or "").lower()
+            async with limits.slot(domain):
+                try:
+                    return url, await self.acrawl(url, max_chars)
+                except Exception as e:
+                    return url, e
+
+        # Duplicates are crawled once
+        tasks = [asyncio.create_task(crawl(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _fetcher(self) -> Union[JinaClient, DirectClient]:
+        if self.settings.backend == "direct":
+            return DirectClient(
+                self.settings.max_page_bytes,
+                self.settings.user_agent,
+                self.settings.allow_private_addresses,
+            )
+        return JinaClient()
+
+    def _extract(self, html: str, max_chars: Optional[int]) -> Article:
+        if self.settings.extractor == "readabilipy":
+            return ReadabilityExtractor().extract_article(html)
+        return LxmlReadabilityExtractor().extract_article(html, max_chars)
+
 
 if __name__ == "__main__":
     if len(sys.argv) == 2:
@@ -0,0 +1,258 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Fetch pages directly from their site instead of through the Jina reader.
+
+Bodies are streamed through the shared HTTP client and cut off at
+max_bytes, only HTML and plain text are accepted, and the charset is taken
+from the headers, the byte order mark or the page's meta tags, in that
+order. GB2312 and GBK pages, common on Chinese financial sites, are decoded
+as GB18030, which covers the characters they often use without declaring.
+
+The URLs come from search results and LLM output, so unless private
+addresses are allowed, every host is resolved before it is fetched and
+loopback, private, link-local and other non-public addresses are refused.
+Redirects are followed one hop at a time, checking each target the same way.
+
+The check doesn't pin the resolved addresses: the shared client resolves
+the host again when it connects. A DNS server answering with a public
+address to the check and an internal one to the connection (DNS
+rebinding) gets past it. Deployments that must not reach their internal
+network from the crawler need to block it at the network level too, e.g.
+with an egress firewall or proxy.
+"""
+
+import asyncio
+import codecs
+import importlib.util
+import ipaddress
+import logging
+import re
+import socket
+from typing import Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.utils.http_client import get_http_client
+from src.utils.rate_limiter import get_rate_limit_scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+_ACCEPTED_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]+)""", re.I
+)
+# Servers often send their default instead of the charset of the page
+_DEFAULT_HEADER_CHARSETS = {"iso8859-1", "ascii"}
+# Declared charsets decoded with a superset
+_SUPERSETS = {"gb2312": "gb18030", "gbk": "gb18030", "big5": "big5hkscs"}
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_MAX_REDIRECTS = 10
+
+
+class BlockedAddressError(ValueError):
+    """Raised when a URL points at a loopback, private or other internal address."""
+
+
+class UnsupportedContentError(ValueError):
+    """Raised when a page isn't HTML or text."""
+
+
+def _normalize_charset(charset: Optional[str]) -> Optional[str]:
+    if not charset:
+        return None
+    try:
+        name = codecs.lookup(charset.strip().strip("\"'")).name
+    except LookupError:
+        return None
+    return _SUPERSETS.get(name, name)
+
+
+def _decodes(body: bytes, charset: str) -> bool:
+    # The body may be cut off in the middle of a character
+    try:
+        codecs.getincrementaldecoder(charset)().decode(body, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_charset(body: bytes, content_type: str = "") -> str:
+    """
+    Return the charset of an HTML body.
+
+    The Content-Type header wins unless it names a common server default,
+    then the byte order mark and the meta tags. Undeclared bodies are tried
+    as UTF-8 and GB18030 before falling back to a statistical guess.
+    """
+    header_charset = None
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            header_charset = _normalize_charset(value)
+    if header_charset and header_charset not in _DEFAULT_HEADER_CHARSETS:
+        return header_charset
+    for bom, charset in _BOMS:
+        if body.startswith(bom):
+            return charset
+    if match := _META_CHARSET.search(body[:4096]):
+        if charset := _normalize_charset(match.group(1).decode("ascii")):
+            return charset
+    if header_charset:
+        return header_charset
+    for charset in ("utf-8", "gb18030"):
+        if _decodes(body, charset):
+            return charset
+    if importlib.util.find_spec("charset_normalizer") is not None:
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(body[:65536]).best()
+        if best is not None and (charset := _normalize_charset(best.encoding)):
+            return charset
+    return "utf-8"
+
+
+def decode_html(body: bytes, content_type: str = "") -> str:
+    """Decode an HTML body, replacing the bytes that don't fit its charset."""
+    charset = detect_charset(body, content_type)
+    # The decoder skips a BOM of its own charset
+    return body.decode("utf-8-sig" if charset == "utf-8" else charset, "replace")
+
+
+def _host_and_port(url: str) -> tuple[str, int]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Direct fetches only support http(s) URLs, not {url}")
+    return parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _is_public(address: Union[ipaddress.IPv4Address, ipaddress.IPv6Address]) -> bool:
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def _check_addresses(url: str, addrinfo: list) -> None:
+    for *_, sockaddr in addrinfo:
+        address = ipaddress.ip_address(sockaddr[0])
+        if not _is_public(address):
+            raise BlockedAddressError(
+                f"Refusing to fetch {url}, it resolves to internal address {address}"
+            )
+
+
+def _redirect_target(response: httpx.Response) -> str:
+    return str(response.url.join(response.headers["Location"]))
+
+
+def _check_content_type(response: httpx.Response):
+    content_type = response.headers.get("Content-Type", "")
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type and media_type not in _ACCEPTED_TYPES:
+        raise UnsupportedContentError(f"Can't extract an article from {media_type}")
+
+
+def _read_capped(chunks: Iterable[bytes], max_bytes: int) -> bytes:
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if len(body) >= max_bytes:
+            break
+    return bytes(body[:max_bytes])
+
+
+class DirectClient:
+    """Fetch the HTML of a page from its own site."""
+
+    def __init__(
+        self,
+        max_bytes: int = 5 * 1024 * 1024,
+        user_agent: Optional[str] = None,
+        allow_private_addresses: bool = False,
+    ):
+        self.max_bytes = max_bytes
+        self.allow_private_addresses = allow_private_addresses
+        self.headers = {
+            "User-Agent": user_agent or DEFAULT_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,text/plain;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+        }
+
+    @staticmethod
+    def _check_format(return_format: str):
+        if return_format != "html":
+            raise ValueError(f"Direct fetches only return html, not {return_format}")
+
+    def _check_url(self, url: str):
+        host, port = _host_and_port(url)
+        if not self.allow_private_addresses:
+            _check_addresses(
+                url, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            )
+
+    async def _acheck_url(self, url: str):
+        host, port = _host_and_port(url)
+        if not self.allow_private_addresses:
+            addrinfo = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+            _check_addresses(url, addrinfo)
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        self._check_format(return_format)
+        for _ in range(_MAX_REDIRECTS + 1):
+            self._check_url(url)
+            get_rate_limit_scheduler().acquire(domain=urlsplit(url).hostname)
+            with get_http_client().client.stream(
+                "GET", url, headers=self.headers, follow_redirects=False
+            ) as response:
+                if response.is_redirect:
+                    url = _redirect_target(response)
+                    continue
+                response.raise_for_status()
+                _check_content_type(response)
+                body = _read_capped(response.iter_bytes(), self.max_bytes)
+            return self._decode(url, response, body)
+        raise httpx.TooManyRedirects(
+            f"Exceeded {_MAX_REDIRECTS} redirects", request=response.request
+        )
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        self._check_format(return_format)
+        for _ in range(_MAX_REDIRECTS + 1):
+            await self._acheck_url(url)
+            await get_rate_limit_scheduler().acquire_async(
+                domain=urlsplit(url).hostname
+            )
+            async with get_http_client().async_client.stream(
+                "GET", url, headers=self.headers, follow_redirects=False
+            ) as response:
+                if response.is_redirect:
+                    url = _redirect_target(response)
+                    continue
+                response.raise_for_status()
+                _check_content_type(response)
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= self.max_bytes:
+                        break
+            return self._decode(url, response, bytes(body[: self.max_bytes]))
+        raise httpx.TooManyRedirects(
+            f"Exceeded {_MAX_REDIRECTS} redirects", request=response.request
+        )
+
+    def _decode(self, url: str, response: httpx.Response, body: bytes) -> str:
+        if len(body) >= self.max_bytes:
+            logger.warning(f"Page {url} was cut off at {self.max_bytes} bytes")
+        return decode_html(body, response.headers.get("Content-Type", ""))
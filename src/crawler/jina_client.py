@@ -3,14 +3,15 @@
 
 import logging
 import os
+from urllib.parse import urlsplit
 
-import requests
+from src.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def _headers(self, return_format: str) -> dict[str, str]:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +22,43 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
+        return headers
+
+    @staticmethod
+    def _rate_limits(url: str) -> dict[str, str]:
+        # Jina grants a much lower quota to requests without an API key
+        return {
+            "upstream": "jina" if os.getenv("JINA_API_KEY") else "jina_anonymous",
+            "domain": urlsplit(url).hostname or "",
+        }
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        headers = self._headers(return_format)
+        data = {"url": url}
+        response = get_http_client().request(
+            "POST",
+            "https://r.jina.ai/",
+            headers=headers,
+            json=data,
+            # Reading a page has no side effects, so it is safe to replay
+            retry=True,
+            **self._rate_limits(url),
+        )
+        # Error pages must not be mistaken for the article
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        headers = self._headers(return_format)
         data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        response = await get_http_client().arequest(
+            "POST",
+            "https://r.jina.ai/",
+            headers=headers,
+            json=data,
+            # Reading a page has no side effects, so it is safe to replay
+            retry=True,
+            **self._rate_limits(url),
+        )
+        response.raise_for_status()
         return response.text
@@ -0,0 +1,344 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process readability extraction on top of lxml.
+
+A Python take on the arc90 readability scoring, replacing readabilipy,
+which runs Readability.js in a Node.js process for every page. Paragraphs
+score their parent and grandparent by text length and commas, candidates
+are penalized by their link density, and the best one is kept together
+with its related siblings. The content is then converted to markdown block
+by block, so the conversion stops as soon as max_chars were produced.
+"""
+
+import logging
+import re
+import time
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+from markdownify import markdownify as md
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+# Elements that never hold article content. Forms are only dropped once the
+# content was chosen, ASP.NET pages wrap their whole body into one.
+_REMOVED_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "object",
+    "embed",
+    "button",
+    "input",
+    "select",
+    "textarea",
+    "nav",
+    "aside",
+    "svg",
+    "canvas",
+    "template",
+    "link",
+    "meta",
+]
+_UNLIKELY = re.compile(
+    r"banner|breadcrumb|combx|comment|community|cover-wrap|disqus|extra|foot|"
+    r"header|legends|menu|related|remark|replies|rss|shoutbox|sidebar|skyscraper|"
+    r"social|sponsor|ad-break|agegate|pagination|pager|popup|share|subscribe|"
+    r"copyright|login|recommend",
+    re.I,
+)
+_MAYBE_CANDIDATE = re.compile(r"and|article|body|column|content|main|shadow", re.I)
+_POSITIVE = re.compile(
+    r"article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story|"
+    r"detail|news",
+    re.I,
+)
+_NEGATIVE = re.compile(
+    r"-ad-|hidden|^hid$| hid$| hid |^hid |banner|combx|comment|com-|contact|foot|"
+    r"footer|footnote|gdpr|masthead|media|meta|outbrain|promo|related|scroll|"
+    r"share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|widget",
+    re.I,
+)
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "blockquote",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figure",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "ul",
+}
+_PARAGRAPH_TAGS = {"p", "pre", "td", "blockquote"}
+_TAG_WEIGHTS = {
+    "div": 5,
+    "article": 5,
+    "section": 3,
+    "pre": 3,
+    "td": 3,
+    "blockquote": 3,
+    "address": -3,
+    "ol": -3,
+    "ul": -3,
+    "dl": -3,
+    "dd": -3,
+    "dt": -3,
+    "li": -3,
+    "h1": -5,
+    "h2": -5,
+    "h3": -5,
+    "h4": -5,
+    "h5": -5,
+    "h6": -5,
+    "th": -5,
+}
+# Commas of Latin and CJK text
+_COMMAS = re.compile(r"[,，、]")
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>", re.I)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+_MIN_PARAGRAPH_CHARS = 25
+# Forms and fieldsets inside the content are kept only when they read like text
+_CONDITIONAL_TAGS = ("form", "fieldset")
+_MIN_CONDITIONAL_COMMAS = 10
+
+
+def _text(element) -> str:
+    return element.text_content().strip()
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for name in (element.get("class"), element.get("id")):
+        if not name:
+            continue
+        if _NEGATIVE.search(name):
+            weight -= 25
+        if _POSITIVE.search(name):
+            weight += 25
+    return weight
+
+
+def _link_density(element) -> float:
+    length = len(_text(element))
+    if not length:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.iter("a"))
+    return link_length / length
+
+
+def _title(doc) -> str:
+    for xpath in ('//meta[@property="og:title"]/@content', "//title/text()"):
+        found = doc.xpath(xpath)
+        if found and str(found[0]).strip():
+            return str(found[0]).strip()
+    heading = doc.find(".//h1")
+    return _text(heading) if heading is not None else ""
+
+
+class LxmlReadabilityExtractor:
+    """
+    Extract the main article of an HTML page without leaving the process.
+    """
+
+    def extract_article(self, html: str, max_chars: Optional[int] = None) -> Article:
+        """
+        Extract the article of html.
+
+        Args:
+            html: The page
+            max_chars: Stop converting once this many markdown characters
+                were produced, None converts the whole article
+
+        Returns:
+            The article, its markdown already converted and its per-stage
+            timings in seconds in article.timings
+        """
+        timings = {}
+        started = last = time.perf_counter()
+
+        def lap(stage: str):
+            nonlocal last
+            now = time.perf_counter()
+            timings[stage] = now - last
+            last = now
+
+        html = _XML_DECLARATION.sub("", html or "", count=1)
+        try:
+            doc = lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            doc = None
+        lap("parse")
+        if doc is None:
+            article = Article(title="", html_content="", markdown="")
+            article.timings = {**timings, "total": time.perf_counter() - started}
+            return article
+
+        title = _title(doc)
+        self._clean(doc)
+        lap("clean")
+        content = self._select_content(doc)
+        self._clean_conditionally(content)
+        lap("score")
+        html_content, markdown, truncated = self._convert(content, max_chars)
+        lap("markdown")
+
+        article = Article(title=title, html_content=html_content, markdown=markdown)
+        article.truncated = truncated
+        article.timings = {**timings, "total": time.perf_counter() - started}
+        logger.debug(
+            "Extracted article: "
+            + ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in article.timings.items())
+        )
+        return article
+
+    @staticmethod
+    def _clean(doc):
+        etree.strip_elements(doc, *_REMOVED_TAGS, etree.Comment, with_tail=False)
+        for element in list(doc.iter()):
+            if not isinstance(element.tag, str) or element.tag in (
+                "html",
+                "body",
+                "article",
+                "main",
+            ):
+                continue
+            if element.getparent() is None:
+                continue
+            names = f"{element.get('class', '')} {element.get('id', '')}"
+            if (
+                names.strip()
+                and _UNLIKELY.search(names)
+                and not _MAYBE_CANDIDATE.search(names)
+            ):
+                element.drop_tree()
+
+    @staticmethod
+    def _select_content(doc) -> list:
+        scores: dict = {}
+
+        def initial_score(element) -> float:
+            return _TAG_WEIGHTS.get(element.tag, 0) + _class_weight(element)
+
+        for element in doc.iter(*_PARAGRAPH_TAGS, "div"):
+            # Divs holding text without block children count as paragraphs
+            if element.tag == "div" and any(
+                child.tag in _BLOCK_TAGS for child in element
+            ):
+                continue
+            text = _text(element)
+            if len(text) < _MIN_PARAGRAPH_CHARS:
+                continue
+            score = 1 + len(_COMMAS.findall(text)) + min(len(text) / 100, 3)
+            parent = element.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            for ancestor, share in ((parent, 1), (grandparent, 2)):
+                if ancestor is None or not isinstance(ancestor.tag, str):
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = initial_score(ancestor)
+                scores[ancestor] += score / share
+
+        if not scores:
+            body = doc.find("body")
+            return [body if body is not None else doc]
+
+        for element in scores:
+            scores[element] *= 1 - _link_density(element)
+        top = max(scores, key=scores.get)
+
+        # Keep the siblings that look like more of the same article
+        parent = top.getparent()
+        if parent is None:
+            return [top]
+        threshold = max(10, scores[top] * 0.2)
+        content = []
+        for sibling in parent:
+            if sibling is top:
+                content.append(sibling)
+            elif sibling in scores and scores[sibling] >= threshold:
+                content.append(sibling)
+            elif sibling.tag == "p":
+                text = _text(sibling)
+                density = _link_density(sibling)
+                if (len(text) > 80 and density < 0.25) or (
+                    0 < len(text) <= 80 and density == 0 and _COMMAS.search(text)
+                ):
+                    content.append(sibling)
+        return content
+
+    @staticmethod
+    def _clean_conditionally(content: list):
+        """Drop the search boxes, logins and signups left in the content."""
+        for node in content:
+            for element in list(node.iter(*_CONDITIONAL_TAGS)):
+                if element is node or element.getparent() is None:
+                    continue
+                text = _text(element)
+                if _class_weight(element) < 0 or (
+                    len(_COMMAS.findall(text)) < _MIN_CONDITIONAL_COMMAS
+                    and (
+                        len(text) < 4 * _MIN_PARAGRAPH_CHARS
+                        or _link_density(element) > 0.2
+                    )
+                ):
+                    element.drop_tree()
+
+    @staticmethod
+    def _blocks(content: list):
+        """Yield the HTML of the content, one block element at a time."""
+        for node in content:
+            inline = [node.text or ""]
+            for child in node:
+                if not isinstance(child.tag, str):
+                    inline.append(child.tail or "")
+                elif child.tag in _BLOCK_TAGS:
+                    if "".join(inline).strip():
+                        yield "".join(inline)
+                    yield lxml.html.tostring(child, encoding="unicode", with_tail=False)
+                    inline = [child.tail or ""]
+                else:
+                    inline.append(lxml.html.tostring(child, encoding="unicode"))
+            if "".join(inline).strip():
+                yield "".join(inline)
+
+    def _convert(
+        self, content: list, max_chars: Optional[int]
+    ) -> tuple[str, str, bool]:
+        html_parts, markdown_parts, length = [], [], 0
+        truncated = False
+        for block in self._blocks(content):
+            if max_chars is not None and length >= max_chars:
+                truncated = True
+                break
+            markdown = md(block).strip()
+            html_parts.append(block)
+            if markdown:
+                markdown_parts.append(markdown)
+                length += len(markdown) + 2
+        markdown = _BLANK_LINES.sub("\n\n", "\n\n".join(markdown_parts))
+        return f"<div>{''.join(html_parts)}</div>", markdown, truncated
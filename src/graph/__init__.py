@@ -1,9 +1,22 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .builder import build_graph_with_memory, build_graph
+from .checkpointer import open_checkpointer, prune_checkpoints, run_checkpoint_pruner
 
 __all__ = [
     "build_graph_with_memory",
     "build_graph",
+    "open_checkpointer",
+    "prune_checkpoints",
+    "run_checkpoint_pruner",
 ]
+
+
+def __getattr__(name: str):
+    # The builder creates the agents and their models on import, load it on
+    # first use so helpers like src.graph.findings work without a conf.yaml
+    if name in ("build_graph_with_memory", "build_graph"):
+        from . import builder
+
+        return getattr(builder, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
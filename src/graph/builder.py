@@ -1,8 +1,11 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from langgraph.graph import StateGraph, START, END
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
 
 from .types import State
 from .nodes import (
@@ -33,11 +36,16 @@ def _build_base_graph():
     return builder
 
 
-def build_graph_with_memory():
-    """Build and return the agent workflow graph with memory."""
+def build_graph_with_memory(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """Build and return the agent workflow graph with memory.
+
+    Args:
+        checkpointer: The checkpointer used to save conversation history,
+            see `open_checkpointer` for the durable SQLite / PostgreSQL
+            backends. Defaults to an in-process MemorySaver.
+    """
     # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    memory = checkpointer or MemorySaver()
 
     # build state graph
     builder = _build_base_graph()
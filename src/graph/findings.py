@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token-budgeted context of research findings.
+
+Every completed step keeps a compressed summary next to its full result, so
+later steps and the reporter can fit all findings into a fixed token budget
+instead of concatenating every full result again.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Token budget of the summary kept for each completed step
+FINDING_SUMMARY_TOKENS = 800
+
+_CJK_PATTERN = re.compile(
+    r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]"
+)
+_TRUNCATED = "\n\n[...]"
+
+
+@dataclass
+class Finding:
+    title: str
+    content: str
+    summary: Optional[str] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text, without a model tokenizer."""
+    cjk_chars = len(_CJK_PATTERN.findall(text))
+    return cjk_chars + (len(text) - cjk_chars + 3) // 4
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + _TRUNCATED
+
+
+def _block_priority(block: str) -> int:
+    stripped = block.lstrip()
+    if stripped.startswith("#"):
+        return 3
+    if any(char.isdigit() for char in block):
+        return 2
+    if stripped.startswith(("-", "*", "|")) or re.match(r"\d+\.", stripped):
+        return 1
+    return 0
+
+
+def summarize_finding(text: str, max_tokens: int = FINDING_SUMMARY_TOKENS) -> str:
+    """
+    Compress a finding into at most max_tokens tokens.
+
+    Headings, blocks carrying figures and lists/tables are kept first, then
+    the remaining paragraphs in document order. The kept blocks are returned
+    in their original order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    blocks = [block for block in re.split(r"\n\s*\n", text) if block.strip()]
+    ranked = sorted(range(len(blocks)), key=lambda i: (-_block_priority(blocks[i]), i))
+    kept, used = {}, 0
+    for i in ranked:
+        remaining = max_tokens - used
+        cost = estimate_tokens(blocks[i]) + 1
+        if cost <= remaining:
+            kept[i] = blocks[i]
+            used += cost
+        elif remaining > 32:
+            # Keep the head of an oversized block rather than dropping it
+            kept[i] = _truncate(blocks[i], remaining - 8)
+            used = max_tokens
+    summary = "\n\n".join(kept[i] for i in sorted(kept))
+    return summary if summary.endswith(_TRUNCATED) else summary + _TRUNCATED
+
+
+def build_findings_context(findings: list[Finding], max_tokens: int) -> list[str]:
+    """
+    Fit findings into max_tokens tokens, returning one text per finding.
+
+    Full results are used while they fit. Otherwise every finding falls back
+    to its summary and the most recent findings are upgraded back to their
+    full result as long as the budget allows. Summaries are truncated evenly
+    as a last resort.
+    """
+    if not findings:
+        return []
+    full_cost = [estimate_tokens(f.content) for f in findings]
+    if sum(full_cost) <= max_tokens:
+        return [f.content for f in findings]
+
+    per_finding = max(max_tokens // len(findings), 1)
+    texts = [
+        f.summary if f.summary is not None else summarize_finding(f.content)
+        for f in findings
+    ]
+    costs = [estimate_tokens(text) for text in texts]
+    if sum(costs) > max_tokens:
+        return [_truncate(text, per_finding) for text in texts]
+
+    budget = max_tokens - sum(costs)
+    for i in reversed(range(len(findings))):
+        extra = full_cost[i] - costs[i]
+        if extra <= budget:
+            texts[i] = findings[i].content
+            budget -= extra
+    return texts
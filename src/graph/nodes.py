@@ -1,20 +1,24 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
+from contextlib import AsyncExitStack
 from typing import Annotated, Literal
 
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from langgraph.types import Command, interrupt
-from langchain_mcp_adapters.client import MultiServerMCPClient
 
-from src.agents.agents import coder_agent, research_agent, create_agent
+from src.agents.agents import coder_agent, research_agent, get_or_create_agent
 
+from src.tools.crawl import crawl_focus
+from src.tools.mcp_pool import mcp_client_pool
 from src.tools.search import LoggedTavilySearch
 from src.tools import (
+    batch_crawl_tool,
     crawl_tool,
     web_search_tool,
     python_repl_tool,
@@ -23,10 +27,16 @@ from src.tools import (
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
 from src.llms.llm import get_llm_by_type
-from src.prompts.planner_model import Plan, StepType
+from src.prompts.planner_model import Plan, Step, StepType
 from src.prompts.template import apply_prompt_template
 from src.utils.json_utils import repair_json_output
 
+from .findings import (
+    FINDING_SUMMARY_TOKENS,
+    Finding,
+    build_findings_context,
+    summarize_finding,
+)
 from .types import State
 from ..config import SEARCH_MAX_RESULTS, SELECTED_SEARCH_ENGINE, SearchEngine
 
@@ -44,13 +54,13 @@ def handoff_to_planner(
     return
 
 
-def background_investigation_node(state: State) -> Command[Literal["planner"]]:
+async def background_investigation_node(state: State) -> Command[Literal["planner"]]:
     logger.info("background investigation node is running.")
     query = state["messages"][-1].content
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY:
-        searched_content = LoggedTavilySearch(max_results=SEARCH_MAX_RESULTS).invoke(
-            {"query": query}
-        )
+        searched_content = await LoggedTavilySearch(
+            max_results=SEARCH_MAX_RESULTS
+        ).ainvoke({"query": query})
         background_investigation_results = None
         if isinstance(searched_content, list):
             background_investigation_results = [
@@ -62,7 +72,7 @@ def background_investigation_node(state: State) -> Command[Literal["planner"]]:
                 f"Tavily search returned malformed response: {searched_content}"
             )
     else:
-        background_investigation_results = web_search_tool.invoke(query)
+        background_investigation_results = await web_search_tool.ainvoke(query)
     return Command(
         update={
             "background_investigation_results": json.dumps(
@@ -73,7 +83,7 @@ def background_investigation_node(state: State) -> Command[Literal["planner"]]:
     )
 
 
-def planner_node(
+async def planner_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["human_feedback", "reporter"]]:
     """Planner node that generate the full plan."""
@@ -112,11 +122,11 @@ def planner_node(
 
     full_response = ""
     if AGENT_LLM_MAP["planner"] == "basic":
-        response = llm.invoke(messages)
+        response = await llm.ainvoke(messages)
         full_response = response.model_dump_json(indent=4, exclude_none=True)
     else:
-        response = llm.stream(messages)
-        for chunk in response:
+        response = llm.astream(messages)
+        async for chunk in response:
             full_response += chunk.content
     logger.debug(f"Current state messages: {state['messages']}")
     logger.info(f"Planner response: {full_response}")
@@ -200,7 +210,7 @@ def human_feedback_node(
     )
 
 
-def coordinator_node(
+async def coordinator_node(
     state: State,
 ) -> Command[Literal["planner", "background_investigator", "__end__"]]:
     """Coordinator node that communicate with customers."""
@@ -212,10 +222,10 @@ def coordinator_node(
     retry_count = 0
     
     while retry_count < max_retries:
-        response = (
+        response = await (
             get_llm_by_type(AGENT_LLM_MAP["coordinator"])
             .bind_tools([handoff_to_planner])
-            .invoke(messages)
+            .ainvoke(messages)
         )
         logger.debug(f"Current state messages: {state['messages']}")
 
@@ -247,8 +257,7 @@ def coordinator_node(
             )
             retry_count += 1
             # 在重试之前稍作延迟
-            import time
-            time.sleep(1)
+            await asyncio.sleep(1)
             continue
     
     # 如果所有重试都失败了，记录错误并终止
@@ -259,9 +268,10 @@ def coordinator_node(
     )
 
 
-def reporter_node(state: State):
+async def reporter_node(state: State, config: RunnableConfig):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
     current_plan = state.get("current_plan")
     thread_id = state.get("thread_id")
     user_id = state.get("user_id")
@@ -287,7 +297,24 @@ def reporter_node(state: State):
         )
     )
 
-    for observation in observations:
+    # Fit the observations into the reporter's token budget, reusing the
+    # summaries stored on the steps that produced them
+    summaries = {
+        step.execution_res: step.execution_summary
+        for step in current_plan.steps
+        if step.execution_res
+    }
+    findings = [
+        Finding(
+            title=f"Observation {i + 1}",
+            content=observation,
+            summary=summaries.get(observation),
+        )
+        for i, observation in enumerate(observations)
+    ]
+    for observation in build_findings_context(
+        findings, int(configurable.max_report_findings_tokens)
+    ):
         invoke_messages.append(
             HumanMessage(
                 content=f"Below are some observations for the research task:\n\n{observation}",
@@ -295,46 +322,60 @@ def reporter_node(state: State):
             )
         )
     logger.debug(f"Current invoke messages: {invoke_messages}")
-    response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
+    response = await get_llm_by_type(AGENT_LLM_MAP["reporter"]).ainvoke(invoke_messages)
     response_content = response.content
     logger.info(f"Reporter generated response with length: {len(response_content)}")
     
     # Save report to database if user_id is provided
     if user_id and thread_id:
-        try:
-            from src.server.database import SessionLocal
-            from src.server.models import Report
-            from datetime import datetime
-            import json
-            
-            db = SessionLocal()
-            # 将分析过程和研报保存到数据库
-            report = Report(
-                user_id=user_id,
-                thread_id=thread_id,
-                title=current_plan.title if hasattr(current_plan, 'title') else "Research Report",
-                content=response_content,
-                analysis=json.dumps({
-                    'observations': observations,
-                    'thought': current_plan.thought if hasattr(current_plan, 'thought') else "",
-                    'steps': [step.dict() for step in current_plan.steps] if hasattr(current_plan, 'steps') else []
-                }, ensure_ascii=False),  # 确保中文正确保存
-                status="completed",
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(report)
-            db.commit()
-            logger.info(f"Successfully saved report to database for user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to save report to database: {str(e)}", exc_info=True)
-            # 继续执行，不要因为保存失败而中断整个流程
-        finally:
-            db.close()
+        # 数据库写入是阻塞操作，放到线程中执行以免阻塞事件循环
+        await asyncio.to_thread(
+            _save_report, user_id, thread_id, current_plan, observations, response_content
+        )
 
     return {"final_report": response_content}
 
 
+def _save_report(
+    user_id: int,
+    thread_id: str,
+    current_plan: Plan,
+    observations: list[str],
+    response_content: str,
+):
+    """Save the final report and its analysis to the database."""
+    try:
+        from src.server.database import SessionLocal
+        from src.server.models import Report
+        from datetime import datetime
+        import json
+        
+        db = SessionLocal()
+        # 将分析过程和研报保存到数据库
+        report = Report(
+            user_id=user_id,
+            thread_id=thread_id,
+            title=current_plan.title if hasattr(current_plan, 'title') else "Research Report",
+            content=response_content,
+            analysis=json.dumps({
+                'observations': observations,
+                'thought': current_plan.thought if hasattr(current_plan, 'thought') else "",
+                'steps': [step.dict() for step in current_plan.steps] if hasattr(current_plan, 'steps') else []
+            }, ensure_ascii=False),  # 确保中文正确保存
+            status="completed",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.add(report)
+        db.commit()
+        logger.info(f"Successfully saved report to database for user {user_id}")
+    except Exception as e:
+        logger.error(f"Failed to save report to database: {str(e)}", exc_info=True)
+        # 继续执行，不要因为保存失败而中断整个流程
+    finally:
+        db.close()
+
+
 def research_team_node(
     state: State,
 ) -> Command[Literal["planner", "researcher", "coder"]]:
@@ -355,65 +396,113 @@ def research_team_node(
     return Command(goto="planner")
 
 
+def _get_steps_to_execute(plan: Plan, max_parallel_steps: int = 1) -> list[Step]:
+    """Collect the next batch of steps that can be executed concurrently.
+
+    Research steps only gather information, so consecutive pending research
+    steps do not depend on each other and can run side by side. Processing
+    steps may rely on everything gathered before them, so they always run
+    alone.
+    """
+    batch = []
+    for step in plan.steps:
+        if step.execution_res:
+            if batch:
+                break
+            continue
+        if batch and (
+            step.step_type != StepType.RESEARCH or len(batch) >= max_parallel_steps
+        ):
+            break
+        batch.append(step)
+        if step.step_type != StepType.RESEARCH:
+            break
+    return batch
+
+
 async def _execute_agent_step(
-    state: State, agent, agent_name: str
+    state: State,
+    agent,
+    agent_name: str,
+    max_parallel_steps: int = 1,
+    max_findings_tokens: int = 8000,
 ) -> Command[Literal["research_team"]]:
-    """Helper function to execute a step using the specified agent."""
+    """Helper function to execute the next batch of steps using the specified agent."""
     current_plan = state.get("current_plan")
     observations = state.get("observations", [])
 
-    # Find the first unexecuted step
-    current_step = None
-    completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
-
-    if not current_step:
+    # Find the next unexecuted steps
+    current_steps = _get_steps_to_execute(current_plan, max(1, max_parallel_steps))
+    if not current_steps:
         logger.warning("No unexecuted step found")
         return Command(goto="research_team")
+    completed_steps = [step for step in current_plan.steps if step.execution_res]
 
-    logger.info(f"Executing step: {current_step.title}")
-
-    # Format completed steps information
+    # Format completed steps information within the token budget
     completed_steps_info = ""
     if completed_steps:
         completed_steps_info = "# Existing Research Findings\n\n"
-        for i, step in enumerate(completed_steps):
+        findings = build_findings_context(
+            [
+                Finding(
+                    title=step.title,
+                    content=step.execution_res,
+                    summary=step.execution_summary,
+                )
+                for step in completed_steps
+            ],
+            max_findings_tokens,
+        )
+        for i, (step, finding) in enumerate(zip(completed_steps, findings)):
             completed_steps_info += f"## Existing Finding {i+1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
-
-    # Prepare the input for the agent with completed steps info
-    agent_input = {
-        "messages": [
-            HumanMessage(
-                content=f"{completed_steps_info}# Current Task\n\n## Title\n\n{current_step.title}\n\n## Description\n\n{current_step.description}\n\n## Locale\n\n{state.get('locale', 'en-US')}"
-            )
-        ]
-    }
+            completed_steps_info += f"<finding>\n{finding}\n</finding>\n\n"
+
+    async def _run(step: Step) -> str:
+        logger.info(f"Executing step: {step.title}")
+        # Crawled pages are cut down to what matters for this step
+        crawl_focus.set(f"{step.title}\n{step.description}")
+        # Prepare the input for the agent with completed steps info
+        agent_input = {
+            "messages": [
+                HumanMessage(
+                    content=f"{completed_steps_info}# Current Task\n\n## Title\n\n{step.title}\n\n## Description\n\n{step.description}\n\n## Locale\n\n{state.get('locale', 'en-US')}"
+                )
+            ]
+        }
 
-    # Add citation reminder for researcher agent
-    if agent_name == "researcher":
-        agent_input["messages"].append(
-            HumanMessage(
-                content="IMPORTANT: DO NOT include inline citations in the text. Instead, track all sources and include a References section at the end using link reference format. Include an empty line between each citation for better readability. Use this format for each reference:\n- [Source Title](URL)\n\n- [Another Source](URL)",
-                name="system",
+        # Add citation reminder for researcher agent
+        if agent_name == "researcher":
+            agent_input["messages"].append(
+                HumanMessage(
+                    content="IMPORTANT: DO NOT include inline citations in the text. Instead, track all sources and include a References section at the end using link reference format. Include an empty line between each citation for better readability. Use this format for each reference:\n- [Source Title](URL)\n\n- [Another Source](URL)",
+                    name="system",
+                )
             )
-        )
-
-    # Invoke the agent
-    result = await agent.ainvoke(input=agent_input)
 
-    # Process the result
-    response_content = result["messages"][-1].content
-    logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
+        # Invoke the agent
+        result = await agent.ainvoke(input=agent_input)
+        return result["messages"][-1].content
 
-    # Update the step with the execution result
-    current_step.execution_res = response_content
-    logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
+    # Run the batch concurrently, results come back in plan order. The batch
+    # is capped at max_parallel_steps already.
+    tasks = [asyncio.create_task(_run(step)) for step in current_steps]
+    try:
+        responses = await asyncio.gather(*tasks)
+    except BaseException:
+        # Don't leave the other steps running once the node failed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    for step, response_content in zip(current_steps, responses):
+        logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
+        # Update the step with the execution result and its summary
+        step.execution_res = response_content
+        step.execution_summary = summarize_finding(
+            response_content, FINDING_SUMMARY_TOKENS
+        )
+        logger.info(f"Step '{step.title}' execution completed by {agent_name}")
 
     return Command(
         update={
@@ -422,8 +511,9 @@ async def _execute_agent_step(
                     content=response_content,
                     name=agent_name,
                 )
+                for response_content in responses
             ],
-            "observations": observations + [response_content],
+            "observations": observations + list(responses),
         },
         goto="research_team",
     )
@@ -439,9 +529,11 @@ async def _setup_and_execute_agent_step(
     """Helper function to set up an agent with appropriate tools and execute a step.
 
     This function handles the common logic for both researcher_node and coder_node:
-    1. Configures MCP servers and tools based on agent type
-    2. Creates an agent with the appropriate tools or uses the default agent
-    3. Executes the agent on the current step
+    1. Configures MCP servers and tools based on agent type, using the shared
+       MCP session pool
+    2. Reuses or creates an agent with the appropriate tools, or uses the default agent
+    3. Executes the agent on the current step, or on a batch of independent
+       research steps when `max_parallel_steps` is greater than 1
 
     Args:
         state: The current state
@@ -474,19 +566,37 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        async with MultiServerMCPClient(mcp_servers) as client:
+        # MCP sessions are pooled across steps and requests, and agents are
+        # reused as long as their tool set doesn't change
+        async with AsyncExitStack() as stack:
             loaded_tools = default_tools[:]
-            for tool in client.get_tools():
-                if tool.name in enabled_tools:
-                    tool.description = (
-                        f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
-                    )
-                    loaded_tools.append(tool)
-            agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
-            return await _execute_agent_step(state, agent, agent_type)
+            for server_name, server_config in mcp_servers.items():
+                # The lease keeps the session open until the step is done
+                tools = await stack.enter_async_context(
+                    mcp_client_pool.lease(server_name, server_config)
+                )
+                for tool in tools:
+                    if enabled_tools.get(tool.name) == server_name:
+                        loaded_tools.append(tool)
+            agent = get_or_create_agent(
+                agent_type, agent_type, loaded_tools, agent_type
+            )
+            return await _execute_agent_step(
+                state,
+                agent,
+                agent_type,
+                int(configurable.max_parallel_steps),
+                int(configurable.max_findings_tokens),
+            )
     else:
         # Use default agent if no MCP servers are configured
-        return await _execute_agent_step(state, default_agent, agent_type)
+        return await _execute_agent_step(
+            state,
+            default_agent,
+            agent_type,
+            int(configurable.max_parallel_steps),
+            int(configurable.max_findings_tokens),
+        )
 
 
 async def researcher_node(
@@ -499,7 +609,7 @@ async def researcher_node(
         config,
         "researcher",
         research_agent,
-        [web_search_tool, crawl_tool],
+        [web_search_tool, crawl_tool, batch_crawl_tool],
     )
 
 
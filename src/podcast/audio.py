@@ -0,0 +1,355 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Audio mixing engine of the podcast.
+
+Every synthesized line is decoded into a float32 NumPy buffer, normalized
+to a target loudness, joined to the previous line with a short equal-power
+crossfade through a pause of silence, and fed to a streaming encoder. Only
+the crossfade tail of the previous line is kept between lines, so memory
+stays proportional to one line rather than to the whole podcast.
+
+Configured by the `PODCAST_AUDIO` section of conf.yaml:
+
+    PODCAST_AUDIO:
+      input_format: auto  # mp3 (decoded by ffmpeg) or wav (decoded by NumPy)
+      output_format: mp3  # mp3 (encoded by ffmpeg) or wav
+      sample_rate: 24000
+      target_dbfs: -20
+      pause_ms: 250
+      crossfade_ms: 20
+
+The wav formats only need NumPy and the standard library, which keeps the
+engine usable and testable offline.
+"""
+
+import io
+import logging
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import wave
+from dataclasses import dataclass, fields
+from typing import Optional
+
+import numpy as np
+
+from src.config import load_conf_section
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class PodcastAudioSettings:
+    """The podcast audio fields of conf.yaml."""
+
+    input_format: str = "auto"  # Format requested from TTS: auto, mp3 or wav
+    output_format: str = "mp3"  # Format of the podcast: mp3 or wav
+    sample_rate: int = 24000  # Sample rate of the mix
+    bitrate_kbps: int = 64  # MP3 bitrate of the podcast
+    target_dbfs: float = -20.0  # Target RMS loudness of every line
+    max_gain_db: float = 20.0  # Upper bound of the normalization gain
+    pause_ms: int = 250  # Silence between two lines
+    crossfade_ms: int = 20  # Equal-power crossfade at every join
+
+    @classmethod
+    def from_conf(cls) -> "PodcastAudioSettings":
+        """Create a PodcastAudioSettings instance from conf.yaml."""
+        conf = load_conf_section("PODCAST_AUDIO")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+    def tts_encoding(self) -> str:
+        """The encoding to request from TTS, mp3 needs ffmpeg to be decoded."""
+        if self.input_format != "auto":
+            return self.input_format
+        return "mp3" if shutil.which("ffmpeg") else "wav"
+
+
+class AudioDecodeError(ValueError):
+    """Raised when a synthesized line can't be decoded."""
+
+
+def decode_wav(data: bytes, sample_rate: int) -> np.ndarray:
+    """Decode a 16-bit PCM WAV file into a mono float32 buffer at sample_rate."""
+    with wave.open(io.BytesIO(data)) as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Unsupported WAV sample width: {wav.getsampwidth()}")
+        channels, source_rate = wav.getnchannels(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    pcm = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    pcm = pcm.reshape(-1, channels).mean(axis=1)
+    return resample(pcm, source_rate, sample_rate)
+
+
+def decode_with_ffmpeg(data: bytes, sample_rate: int) -> np.ndarray:
+    """Decode any format ffmpeg understands into a mono float32 buffer."""
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", "pipe:0"]
+        + ["-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        input=data,
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype="<f4")
+
+
+def resample(pcm: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Linearly resample a mono buffer."""
+    if source_rate == target_rate or len(pcm) == 0:
+        return pcm
+    length = int(round(len(pcm) * target_rate / source_rate))
+    positions = np.linspace(0, len(pcm) - 1, length)
+    return np.interp(positions, np.arange(len(pcm)), pcm).astype(np.float32)
+
+
+def normalize_loudness(
+    pcm: np.ndarray, target_dbfs: float, max_gain_db: float = 20.0
+) -> np.ndarray:
+    """Scale pcm to the target RMS loudness without clipping its peaks."""
+    if len(pcm) == 0:
+        return pcm
+    # Leave near-silence out of the RMS, so pauses don't inflate the gain
+    voiced = pcm[np.abs(pcm) > 1e-3]
+    if len(voiced) == 0:
+        return pcm
+    rms = float(np.sqrt(np.mean(np.square(voiced))))
+    gain_db = min(target_dbfs - 20 * np.log10(rms), max_gain_db)
+    gain = 10 ** (gain_db / 20)
+    peak = float(np.max(np.abs(pcm)))
+    gain = min(gain, 0.98 / peak)
+    return (pcm * gain).astype(np.float32)
+
+
+def _to_int16(pcm: np.ndarray) -> bytes:
+    return (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class WavEncoder:
+    """Streaming 16-bit mono WAV encoder."""
+
+    media_type = "audio/wav"
+    extension = "wav"
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._started = False
+
+    def _header(self, data_size: int) -> bytes:
+        return (
+            b"RIFF"
+            + struct.pack("<I", min(data_size + 36, 0xFFFFFFFF))
+            + b"WAVEfmt "
+            + struct.pack(
+                "<IHHIIHH", 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16
+            )
+            + b"data"
+            + struct.pack("<I", min(data_size, 0xFFFFFFFF))
+        )
+
+    def encode(self, pcm: np.ndarray) -> bytes:
+        data = _to_int16(pcm)
+        if not self._started:
+            # The length is unknown while streaming, see finalize
+            self._started = True
+            return self._header(0xFFFFFFFF) + data
+        return data
+
+    def flush(self) -> bytes:
+        if not self._started:
+            self._started = True
+            return self._header(0)
+        return b""
+
+    def finalize(self, data: bytes) -> bytes:
+        """Fix the lengths of a complete, buffered encode."""
+        return self._header(len(data) - 44) + data[44:]
+
+    def close(self):
+        pass
+
+
+class FFmpegEncoder:
+    """Streaming MP3 encoder backed by an ffmpeg subprocess."""
+
+    media_type = "audio/mpeg"
+    extension = "mp3"
+
+    def __init__(self, sample_rate: int, bitrate_kbps: int):
+        self.sample_rate = sample_rate
+        self.bitrate_kbps = bitrate_kbps
+        # Started by the first encode, so an unused encoder holds no process
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._output: queue.Queue[bytes] = queue.Queue()
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["ffmpeg", "-v", "error", "-f", "s16le", "-ac", "1"]
+                + ["-ar", str(self.sample_rate), "-i", "pipe:0"]
+                + ["-f", "mp3", "-b:a", f"{self.bitrate_kbps}k", "pipe:1"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            # Read on a thread, so a full stdout pipe can't block our writes
+            self._reader = threading.Thread(target=self._read, daemon=True)
+            self._reader.start()
+        return self._process
+
+    def _read(self):
+        while data := self._process.stdout.read1(65536):
+            self._output.put(data)
+
+    def _drain(self) -> bytes:
+        chunks = []
+        while not self._output.empty():
+            chunks.append(self._output.get_nowait())
+        return b"".join(chunks)
+
+    def encode(self, pcm: np.ndarray) -> bytes:
+        process = self._start()
+        process.stdin.write(_to_int16(pcm))
+        process.stdin.flush()
+        return self._drain()
+
+    def flush(self) -> bytes:
+        process = self._start()
+        process.stdin.close()
+        self._reader.join()
+        process.wait()
+        return self._drain()
+
+    def finalize(self, data: bytes) -> bytes:
+        return data
+
+    def close(self):
+        """Stop ffmpeg, discarding the audio that wasn't flushed."""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._reader.join()
+        for pipe in (self._process.stdin, self._process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                # Writes still buffered for the killed process
+                pass
+
+
+def create_encoder(settings: PodcastAudioSettings):
+    """Create the encoder of the podcast, falling back to WAV without MP3 support."""
+    if settings.output_format == "mp3":
+        if shutil.which("ffmpeg"):
+            return FFmpegEncoder(settings.sample_rate, settings.bitrate_kbps)
+        logger.warning("ffmpeg is not available, encoding WAV")
+    return WavEncoder(settings.sample_rate)
+
+
+class AudioMixer:
+    """
+    Incremental mixer, feed it the lines in order and stream its output.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[PodcastAudioSettings] = None,
+        input_format: Optional[str] = None,
+    ):
+        """
+        Initialize the mixer.
+
+        Args:
+            settings: Mixing settings, read from conf.yaml if not provided
+            input_format: Format of the fed chunks, settings.tts_encoding() if not provided
+        """
+        self.settings = settings or PodcastAudioSettings.from_conf()
+        self.input_format = input_format or self.settings.tts_encoding()
+        self.encoder = create_encoder(self.settings)
+        rate = self.settings.sample_rate
+        self._crossfade = int(rate * self.settings.crossfade_ms / 1000)
+        self._pause = np.zeros(int(rate * self.settings.pause_ms / 1000), np.float32)
+        self._tail: Optional[np.ndarray] = None
+
+    @property
+    def media_type(self) -> str:
+        return self.encoder.media_type
+
+    def decode(self, chunk: bytes) -> np.ndarray:
+        """
+        Decode a line into PCM.
+
+        Raises:
+            AudioDecodeError: If the chunk isn't valid audio of input_format
+        """
+        try:
+            if self.input_format == "wav":
+                return decode_wav(chunk, self.settings.sample_rate)
+            return decode_with_ffmpeg(chunk, self.settings.sample_rate)
+        except subprocess.CalledProcessError as e:
+            stderr = (e.stderr or b"").decode("utf-8", "replace").strip()
+            raise AudioDecodeError(
+                f"ffmpeg failed to decode the audio: {stderr}"
+            ) from e
+        except (wave.Error, EOFError, ValueError) as e:
+            raise AudioDecodeError(f"Invalid WAV audio: {e}") from e
+
+    def _join(self, segment: np.ndarray) -> np.ndarray:
+        """Crossfade segment onto the held back tail, returning the settled audio."""
+        if self._tail is not None:
+            if len(segment) >= len(self._tail):
+                overlap = len(self._tail)
+                ramp = np.linspace(0, np.pi / 2, overlap, dtype=np.float32)
+                head = self._tail * np.cos(ramp) + segment[:overlap] * np.sin(ramp)
+                segment = np.concatenate([head, segment[overlap:]])
+            else:
+                segment = np.concatenate([self._tail, segment])
+        keep = min(self._crossfade, len(segment))
+        self._tail = segment[len(segment) - keep :]
+        return segment[: len(segment) - keep]
+
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        Mix the next line, returning the encoded audio that is final so far.
+
+        Raises:
+            AudioDecodeError: If the line can't be decoded, the mix is left
+                as it was, so the next lines can still be fed
+        """
+        pcm = normalize_loudness(
+            self.decode(chunk), self.settings.target_dbfs, self.settings.max_gain_db
+        )
+        if len(pcm) == 0:
+            return b""
+        settled = []
+        if self._tail is not None and len(self._pause):
+            settled.append(self._join(self._pause))
+        settled.append(self._join(pcm))
+        return self.encoder.encode(np.concatenate(settled))
+
+    def finish(self) -> bytes:
+        """Flush the held back tail and the encoder."""
+        output = b""
+        if self._tail is not None:
+            ramp = np.linspace(0, np.pi / 2, len(self._tail), dtype=np.float32)
+            output = self.encoder.encode(self._tail * np.cos(ramp))
+            self._tail = None
+        return output + self.encoder.flush()
+
+    def finalize(self, data: bytes) -> bytes:
+        """Fix up the complete output of a buffered (non-streamed) mix."""
+        return self.encoder.finalize(data)
+
+    def close(self):
+        """Release the encoder, also when the mix was abandoned half way."""
+        self.encoder.close()
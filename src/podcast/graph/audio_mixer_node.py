@@ -3,6 +3,7 @@
 
 import logging
 
+from src.podcast.audio import AudioDecodeError, AudioMixer
 from src.podcast.graph.state import PodcastState
 
 logger = logging.getLogger(__name__)
@@ -10,7 +11,29 @@ logger = logging.getLogger(__name__)
 
 def audio_mixer_node(state: PodcastState):
     logger.info("Mixing audio chunks for podcast...")
-    audio_chunks = state["audio_chunks"]
-    combined_audio = b"".join(audio_chunks)
+    mixer = AudioMixer(input_format=state.get("audio_format"))
+    failed_lines = list(state.get("failed_lines", []))
+    # The chunks of the lines that failed to synthesize are missing
+    indexes = [
+        index
+        for index in range(len(state["script"].lines))
+        if index not in failed_lines
+    ]
+    parts = []
+    try:
+        for index, audio_chunk in zip(indexes, state["audio_chunks"]):
+            try:
+                parts.append(mixer.feed(audio_chunk))
+            except AudioDecodeError as e:
+                logger.error(f"Skipping line {index} of the podcast: {e}")
+                failed_lines.append(index)
+        parts.append(mixer.finish())
+    finally:
+        mixer.close()
+    combined_audio = mixer.finalize(b"".join(parts))
     logger.info("The podcast audio is now ready.")
-    return {"output": combined_audio}
+    return {
+        "output": combined_audio,
+        "output_media_type": mixer.media_type,
+        "failed_lines": sorted(failed_lines),
+    }
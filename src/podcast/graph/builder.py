@@ -26,14 +26,17 @@ def build_graph():
 workflow = build_graph()
 
 if __name__ == "__main__":
+    import asyncio
+
     from dotenv import load_dotenv
 
     load_dotenv()
 
     report_content = open("examples/nanjing_tangbao.md").read()
-    final_state = workflow.invoke({"input": report_content})
+    final_state = asyncio.run(workflow.ainvoke({"input": report_content}))
     for line in final_state["script"].lines:
         print("<M>" if line.speaker == "male" else "<F>", line.text)
 
-    with open("final.mp3", "wb") as f:
+    extension = "wav" if final_state["output_media_type"] == "audio/wav" else "mp3"
+    with open(f"final.{extension}", "wb") as f:
         f.write(final_state["output"])
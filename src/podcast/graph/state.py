@@ -16,7 +16,10 @@ class PodcastState(MessagesState):
 
     # Output
     output: Optional[bytes] = None
+    output_media_type: str = "audio/mpeg"
 
     # Assets
     script: Optional[Script] = None
     audio_chunks: list[bytes] = []
+    audio_format: str = "mp3"  # Encoding of the audio chunks
+    failed_lines: list[int] = []  # Indexes of script lines without audio
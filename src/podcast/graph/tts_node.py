@@ -1,47 +1,89 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import base64
 import logging
-import os
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Optional
 
+from src.config import load_conf_section
+from src.podcast.audio import PodcastAudioSettings
 from src.podcast.graph.state import PodcastState
-from src.tools.tts import VolcengineTTS
+from src.podcast.types import ScriptLine
+from src.tools.tts import get_tts_client
+from src.tools.tts_pipeline import synthesize_segments
 
 logger = logging.getLogger(__name__)
 
 
-def tts_node(state: PodcastState):
-    logger.info("Generating audio chunks for podcast...")
-    tts_client = _create_tts_client()
-    for line in state["script"].lines:
-        tts_client.voice_type = (
-            "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
+@dataclass(kw_only=True)
+class PodcastTTSSettings:
+    """The podcast TTS fields of conf.yaml."""
+
+    speed_ratio: float = 1.05
+
+    @classmethod
+    def from_conf(cls) -> "PodcastTTSSettings":
+        """Create a PodcastTTSSettings instance from conf.yaml."""
+        conf = load_conf_section("PODCAST_TTS")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
         )
-        result = tts_client.text_to_speech(line.paragraph, speed_ratio=1.05)
-        if result["success"]:
-            audio_data = result["audio_data"]
-            audio_chunk = base64.b64decode(audio_data)
-            state["audio_chunks"].append(audio_chunk)
+
+
+def _voice_type(line: ScriptLine) -> str:
+    return "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
+
+
+async def synthesize_lines(
+    lines: list[ScriptLine],
+    settings: Optional[PodcastTTSSettings] = None,
+    encoding: str = "mp3",
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """
+    Synthesize script lines concurrently, yielding (index, audio) in line order.
+
+    Unchanged lines of a regenerated podcast come from the TTS cache. See
+    synthesize_segments for the concurrency, retries and rate limit.
+    """
+    settings = settings or PodcastTTSSettings.from_conf()
+    segments = [
+        (
+            line.paragraph,
+            {
+                "encoding": encoding,
+                "speed_ratio": settings.speed_ratio,
+                "voice_type": _voice_type(line),
+            },
+        )
+        for line in lines
+    ]
+    async for index, audio_chunk in synthesize_segments(get_tts_client(), segments):
+        yield index, audio_chunk
+
+
+async def tts_node(state: PodcastState):
+    logger.info("Generating audio chunks for podcast...")
+    lines = state["script"].lines
+    # Synthesize in the format the audio mixer can decode
+    encoding = PodcastAudioSettings.from_conf().tts_encoding()
+    audio_chunks = []
+    failed_lines = []
+    async for index, audio_chunk in synthesize_lines(lines, encoding=encoding):
+        if audio_chunk is None:
+            failed_lines.append(index)
         else:
-            logger.error(result["error"])
+            audio_chunks.append(audio_chunk)
+    if failed_lines:
+        logger.error(
+            f"Synthesized {len(lines) - len(failed_lines)}/{len(lines)} lines, "
+            f"failed lines: {failed_lines}"
+        )
     return {
-        "audio_chunks": state["audio_chunks"],
+        "audio_chunks": audio_chunks,
+        "audio_format": encoding,
+        "failed_lines": failed_lines,
     }
-
-
-def _create_tts_client():
-    app_id = os.getenv("VOLCENGINE_TTS_APPID", "")
-    if not app_id:
-        raise Exception("VOLCENGINE_TTS_APPID is not set")
-    access_token = os.getenv("VOLCENGINE_TTS_ACCESS_TOKEN", "")
-    if not access_token:
-        raise Exception("VOLCENGINE_TTS_ACCESS_TOKEN is not set")
-    cluster = os.getenv("VOLCENGINE_TTS_CLUSTER", "volcano_tts")
-    voice_type = "BV001_streaming"
-    return VolcengineTTS(
-        appid=app_id,
-        access_token=access_token,
-        cluster=cluster,
-        voice_type=voice_type,
-    )
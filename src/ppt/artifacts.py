@@ -0,0 +1,248 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Content-addressed store of generated PPTX decks.
+
+Decks are stored once per distinct file content under `objects/`, and
+`refs/` maps the key of a generation (see deck_cache_key) to the deck it
+produced, so rendering the same report twice serves the stored deck
+without composing it again. The files are
+sent with `FileResponse`, which supports range requests, and are removed
+once they haven't been used for retention_seconds. Configured by the
+`PPT_ARTIFACTS` section of conf.yaml:
+
+    PPT_ARTIFACTS:
+      path: .cache/ppt
+      retention_seconds: 86400
+      max_bytes: 1073741824
+      gc_interval_seconds: 600
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+from src.config import load_conf_section
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class PPTArtifactSettings:
+    """The PPT artifact store fields of conf.yaml."""
+
+    path: str = ".cache/ppt"  # Directory of the stored decks
+    retention_seconds: int = 86400  # Decks unused for longer are removed
+    max_bytes: int = 1024 * 1024 * 1024  # Total size of the stored decks
+    gc_interval_seconds: int = 600  # Interval of the garbage collection
+
+    @classmethod
+    def from_conf(cls) -> "PPTArtifactSettings":
+        """Create a PPTArtifactSettings instance from conf.yaml."""
+        conf = load_conf_section("PPT_ARTIFACTS")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def deck_cache_key(report_content: str, prompt: str, model_id: str) -> str:
+    """
+    Return the key of the deck composed from report_content.
+
+    The rendered composer prompt stands for the template version, so editing
+    ppt/ppt_composer.md invalidates every deck composed with the old one.
+    """
+    payload = json.dumps(
+        {
+            "input": report_content,
+            "prompt": _sha256(prompt.encode("utf-8")),
+            "model": model_id,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return _sha256(payload.encode("utf-8"))
+
+
+def _write_atomic(directory: str, path: str, data: bytes):
+    # Write then rename, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PPTArtifactStore:
+    """
+    Directory of decks addressed by the SHA-256 of their content.
+    """
+
+    def __init__(self, settings: Optional[PPTArtifactSettings] = None):
+        self.settings = settings or PPTArtifactSettings.from_conf()
+        self.objects_dir = os.path.join(self.settings.path, "objects")
+        self.refs_dir = os.path.join(self.settings.path, "refs")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.deduplicated = 0
+        self.collected = 0
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.pptx")
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.refs_dir, _sha256(key.encode("utf-8")))
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the path of the deck stored under key, or None."""
+        ref_path = self._ref_path(key)
+        try:
+            with open(ref_path, encoding="ascii") as f:
+                path = self._object_path(f.read().strip())
+            # The modification time keeps both files from being collected
+            os.utime(path)
+            os.utime(ref_path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def store(self, pptx: bytes, key: Optional[str] = None) -> str:
+        """
+        Store a deck, returning its path.
+
+        Args:
+            pptx: Content of the deck
+            key: Key to look the deck up by later, e.g. from deck_cache_key
+        """
+        digest = _sha256(pptx)
+        path = self._object_path(digest)
+        with self._lock:
+            if os.path.exists(path):
+                os.utime(path)
+                self.deduplicated += 1
+            else:
+                _write_atomic(self.objects_dir, path, pptx)
+                self.stores += 1
+            if key is not None:
+                _write_atomic(
+                    self.refs_dir, self._ref_path(key), digest.encode("ascii")
+                )
+        return path
+
+    def gc(self) -> int:
+        """
+        Remove decks unused for retention_seconds, then the least recently
+        used ones beyond max_bytes, returning how many were removed.
+        """
+        with self._lock:
+            now = time.time()
+            objects = []
+            for entry in os.scandir(self.objects_dir):
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    objects.append((stat.st_mtime, entry.path, stat.st_size))
+            objects.sort()
+            total_bytes = sum(size for _, _, size in objects)
+            removed = 0
+            for mtime, path, size in objects:
+                if (
+                    now - mtime <= self.settings.retention_seconds
+                    and total_bytes <= self.settings.max_bytes
+                ):
+                    break
+                _remove(path)
+                total_bytes -= size
+                removed += 1
+
+            # Drop the refs to removed decks and the expired ones
+            for entry in os.scandir(self.refs_dir):
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                try:
+                    with open(entry.path, encoding="ascii") as f:
+                        digest = f.read().strip()
+                    expired = (
+                        now - entry.stat().st_mtime > self.settings.retention_seconds
+                    )
+                except OSError:
+                    continue
+                if expired or not os.path.exists(self._object_path(digest)):
+                    _remove(entry.path)
+            self.collected += removed
+        if removed:
+            logger.info(f"Removed {removed} generated decks")
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        entries, total_bytes = 0, 0
+        for entry in os.scandir(self.objects_dir):
+            if entry.is_file() and not entry.name.startswith("."):
+                entries += 1
+                total_bytes += entry.stat().st_size
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "deduplicated": self.deduplicated,
+            "collected": self.collected,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_store: Optional[PPTArtifactStore] = None
+
+
+def get_ppt_artifact_store() -> PPTArtifactStore:
+    """Get the process-wide PPT artifact store."""
+    global _store
+    if _store is None:
+        _store = PPTArtifactStore()
+    return _store
+
+
+async def run_ppt_artifact_gc(store: Optional[PPTArtifactStore] = None):
+    """Collect the artifact store periodically until cancelled."""
+    store = store or get_ppt_artifact_store()
+    while True:
+        try:
+            await asyncio.to_thread(store.gc)
+        except Exception as e:
+            logger.error(f"Failed to collect generated decks: {e}", exc_info=True)
+        await asyncio.sleep(store.settings.gc_interval_seconds)
@@ -8,6 +8,11 @@ from src.ppt.graph.ppt_generator_node import ppt_generator_node
 from src.ppt.graph.state import PPTState
 
 
+def route_after_composer(state: PPTState):
+    # A deck composed from the same report is reused as is
+    return END if state.get("generated_file_path") else "ppt_generator"
+
+
 def build_graph():
     """Build and return the ppt workflow graph."""
     # build state graph
@@ -15,7 +20,9 @@ def build_graph():
     builder.add_node("ppt_composer", ppt_composer_node)
     builder.add_node("ppt_generator", ppt_generator_node)
     builder.add_edge(START, "ppt_composer")
-    builder.add_edge("ppt_composer", "ppt_generator")
+    builder.add_conditional_edges(
+        "ppt_composer", route_after_composer, ["ppt_generator", END]
+    )
     builder.add_edge("ppt_generator", END)
     return builder.compile()
 
@@ -2,13 +2,12 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-import os
-import uuid
 
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
 from src.llms.llm import get_llm_by_type
+from src.ppt.artifacts import deck_cache_key, get_ppt_artifact_store
 from src.prompts.template import get_prompt_template
 
 from .state import PPTState
@@ -17,17 +16,23 @@ logger = logging.getLogger(__name__)
 
 
 def ppt_composer_node(state: PPTState):
-    logger.info("Generating ppt content...")
     model = get_llm_by_type(AGENT_LLM_MAP["ppt_composer"])
+    system_prompt = get_prompt_template("ppt/ppt_composer")
+    cache_key = deck_cache_key(
+        state["input"], system_prompt, f"{model.openai_api_base}/{model.model_name}"
+    )
+    generated_file_path = get_ppt_artifact_store().lookup(cache_key)
+    if generated_file_path is not None:
+        logger.info(f"Reusing the deck of the same report: {generated_file_path}")
+        return {"cache_key": cache_key, "generated_file_path": generated_file_path}
+
+    logger.info("Generating ppt content...")
     ppt_content = model.invoke(
         [
-            SystemMessage(content=get_prompt_template("ppt/ppt_composer")),
+            SystemMessage(content=system_prompt),
             HumanMessage(content=state["input"]),
         ],
     )
     logger.info(f"ppt_content: {ppt_content}")
-    # save the ppt content in a temp file
-    temp_ppt_file_path = os.path.join(os.getcwd(), f"ppt_content_{uuid.uuid4()}.md")
-    with open(temp_ppt_file_path, "w") as f:
-        f.write(ppt_content.content)
-    return {"ppt_content": ppt_content, "ppt_file_path": temp_ppt_file_path}
+    # the markdown goes to the renderer in memory, no temp file needed
+    return {"cache_key": cache_key, "ppt_content": ppt_content.content}
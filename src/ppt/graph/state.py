@@ -17,4 +17,4 @@ class PPTState(MessagesState):
 
     # Assets
     ppt_content: str = ""
-    ppt_file_path: str = ""
+    cache_key: str = ""
@@ -0,0 +1,326 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pool of warm marp renderers converting slide markdown into PPTX.
+
+Spawning marp for every deck pays the Node.js startup and the browser
+launch each time. The pool keeps a few `marp --server` processes running
+and converts decks through their HTTP endpoint instead. The markdown is
+only placed in the private directory served by the worker for the length
+of the request. When the servers can't start or a conversion fails, the
+pool falls back to a one-shot `marp --stdin` that reads the markdown from
+stdin and writes the deck to stdout. Decks that find the queue full, or no
+free server within timeout_seconds, are rejected with RendererBusyError.
+
+`marp --server` has no host option and listens on every interface, where it
+would list and convert the decks being rendered for anyone on the network.
+The workers are started with a Node.js preload that binds their listening
+sockets to 127.0.0.1 instead. A marp build that ignores NODE_OPTIONS, like
+the standalone binary, doesn't get that guard, use `mode: oneshot` with it.
+
+Configured by the `MARP` section of conf.yaml:
+
+    MARP:
+      command: marp
+      mode: server  # or oneshot
+      workers: 2
+      max_queue_size: 16
+      timeout_seconds: 120
+      start_timeout_seconds: 30
+"""
+
+import logging
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+import httpx
+
+from src.config import load_conf_section
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class MarpSettings:
+    """The marp renderer fields of conf.yaml."""
+
+    command: str = "marp"
+    mode: str = "server"  # server keeps warm workers, oneshot spawns marp per deck
+    workers: int = 2  # Warm marp servers
+    max_queue_size: int = 16  # Decks waiting for a worker, renders fail beyond
+    timeout_seconds: float = 120.0  # Time limit of one conversion
+    start_timeout_seconds: float = 30.0  # Time limit for a marp server to start
+
+    @classmethod
+    def from_conf(cls) -> "MarpSettings":
+        """Create a MarpSettings instance from conf.yaml."""
+        conf = load_conf_section("MARP")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+class RendererBusyError(Exception):
+    """Raised when too many decks are waiting for a renderer."""
+
+
+# Preloaded into marp so that its server only listens on the loopback interface
+_LOOPBACK_PRELOAD = """\
+const net = require("net");
+const listen = net.Server.prototype.listen;
+net.Server.prototype.listen = function (...args) {
+  if (typeof args[0] === "number" || /^\\d+$/.test(args[0])) {
+    if (typeof args[1] !== "string") args.splice(1, 0, "127.0.0.1");
+  } else if (args[0] && typeof args[0] === "object" && args[0].path === undefined) {
+    args[0] = { ...args[0], host: "127.0.0.1" };
+  }
+  return listen.apply(this, args);
+};
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _private_dir() -> str:
+    # Prefer shared memory, so the markdown never touches the disk
+    parent = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    return tempfile.mkdtemp(prefix="marp-", dir=parent)
+
+
+class _MarpServer:
+    """One `marp --server` process serving a private directory."""
+
+    def __init__(self, settings: MarpSettings):
+        self.settings = settings
+        self.directory = _private_dir()
+        self.port = _free_port()
+        # Kept outside of the served directory
+        fd, self.preload = tempfile.mkstemp(prefix="marp-", suffix=".js")
+        with os.fdopen(fd, "w") as f:
+            f.write(_LOOPBACK_PRELOAD)
+        node_options = os.environ.get("NODE_OPTIONS", "")
+        self.process = subprocess.Popen(
+            [settings.command, "--server", self.directory],
+            env={
+                **os.environ,
+                "PORT": str(self.port),
+                "NODE_OPTIONS": f'{node_options} --require "{self.preload}"'.strip(),
+            },
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.renders = 0
+        self._wait_ready()
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + self.settings.start_timeout_seconds
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.stop()
+                raise RuntimeError(f"marp server exited with {self.process.returncode}")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise TimeoutError("marp server didn't start in time")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def render(self, markdown: str) -> bytes:
+        name = f"{uuid.uuid4().hex}.md"
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        try:
+            response = httpx.get(
+                f"http://127.0.0.1:{self.port}/{name}?pptx",
+                timeout=self.settings.timeout_seconds,
+            )
+            response.raise_for_status()
+            self.renders += 1
+            return response.content
+        finally:
+            os.remove(path)
+
+    def stop(self):
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        try:
+            os.remove(self.preload)
+        except FileNotFoundError:
+            pass
+
+
+class MarpRendererPool:
+    """
+    Bounded pool of warm marp servers with a one-shot fallback.
+    """
+
+    def __init__(self, settings: Optional[MarpSettings] = None):
+        self.settings = settings or MarpSettings.from_conf()
+        self._idle: queue.Queue[_MarpServer] = queue.Queue()
+        self._servers: list[_MarpServer] = []
+        self._lock = threading.Lock()
+        # Held while the servers boot, so _lock stays free for stats()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._waiting = 0
+
+        # Metrics
+        self.server_renders = 0
+        self.oneshot_renders = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def _start(self):
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            servers = []
+            if self.settings.mode == "server":
+                for _ in range(self.settings.workers):
+                    try:
+                        servers.append(_MarpServer(self.settings))
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to start marp server, using one-shot: {e}"
+                        )
+                        break
+            with self._lock:
+                self._servers.extend(servers)
+            for server in servers:
+                self._idle.put(server)
+            self._started = True
+
+    def render(self, markdown: str) -> bytes:
+        """
+        Convert slide markdown into PPTX bytes.
+
+        Raises:
+            RendererBusyError: If max_queue_size decks are waiting already, or
+                no server became available within timeout_seconds
+            subprocess.SubprocessError: If the one-shot fallback fails too
+        """
+        self._start()
+        if not self._servers:
+            return self._render_oneshot(markdown)
+
+        with self._lock:
+            if self._waiting >= self.settings.max_queue_size:
+                self.rejected += 1
+                raise RendererBusyError("Too many decks are waiting for a renderer")
+            self._waiting += 1
+        try:
+            server = self._idle.get(timeout=self.settings.timeout_seconds)
+        except queue.Empty:
+            server = None
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if server is None:
+            # Spawning marp here would pile up processes exactly under load
+            with self._lock:
+                self.rejected += 1
+            raise RendererBusyError("No marp server became available in time")
+
+        if not server.alive:
+            server = self._replace(server)
+            if server is None:
+                return self._render_oneshot(markdown)
+        try:
+            pptx = server.render(markdown)
+            self.server_renders += 1
+            return pptx
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"marp server failed to render, using one-shot: {e!r}")
+            server = self._replace(server)
+            return self._render_oneshot(markdown)
+        finally:
+            if server is not None:
+                self._idle.put(server)
+
+    def _replace(self, server: _MarpServer) -> Optional[_MarpServer]:
+        server.stop()
+        with self._lock:
+            self._servers.remove(server)
+        try:
+            replacement = _MarpServer(self.settings)
+        except Exception as e:
+            logger.error(f"Failed to restart marp server: {e}")
+            return None
+        with self._lock:
+            self._servers.append(replacement)
+        return replacement
+
+    def _render_oneshot(self, markdown: str) -> bytes:
+        result = subprocess.run(
+            [self.settings.command, "--stdin", "--pptx", "-o", "-"],
+            input=markdown.encode("utf-8"),
+            capture_output=True,
+            timeout=self.settings.timeout_seconds,
+            check=True,
+        )
+        self.oneshot_renders += 1
+        return result.stdout
+
+    def close(self):
+        """Stop every marp server of the pool."""
+        with self._lock:
+            servers, self._servers = self._servers, []
+            self._started = False
+        for server in servers:
+            server.stop()
+        self._idle = queue.Queue()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.settings.mode,
+            "servers": sum(server.alive for server in self._servers),
+            "idle": self._idle.qsize(),
+            "waiting": self._waiting,
+            "server_renders": self.server_renders,
+            "oneshot_renders": self.oneshot_renders,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_renderer: Optional[MarpRendererPool] = None
+
+
+def get_marp_renderer() -> MarpRendererPool:
+    """Get the process-wide marp renderer pool."""
+    global _renderer
+    if _renderer is None:
+        _renderer = MarpRendererPool()
+    return _renderer
@@ -22,6 +22,9 @@ class Step(BaseModel):
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
+    execution_summary: Optional[str] = Field(
+        default=None, description="The compressed Step execution result"
+    )
 
 
 class Plan(BaseModel):
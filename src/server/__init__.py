@@ -1,6 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .app import app
-
 __all__ = ["app"]
+
+
+def __getattr__(name: str):
+    # The app builds every graph on import, load it on first use so modules
+    # like src.server.jobs work without a conf.yaml
+    if name == "app":
+        from .app import app
+
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
@@ -13,14 +14,18 @@ from sqlalchemy.orm import Session
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, ToolMessage
 from langgraph.types import Command
 
+from src.crawler import get_crawl_cache
 from src.graph.builder import build_graph_with_memory
-from src.podcast.graph.builder import build_graph as build_podcast_graph
-from src.ppt.graph.builder import build_graph as build_ppt_graph
-from src.prose.graph.builder import build_graph as build_prose_graph
+from src.graph.checkpointer import open_checkpointer, run_checkpoint_pruner
+from src.podcast.graph.script_writer_node import script_writer_node
+from src.podcast.graph.tts_node import synthesize_lines
+from src.podcast.audio import AudioDecodeError, AudioMixer
+from src.ppt.artifacts import get_ppt_artifact_store, run_ppt_artifact_gc
+from src.ppt.renderer import RendererBusyError, get_marp_renderer
 from src.server.chat_request import (
     ChatMessage,
     ChatRequest,
@@ -30,21 +35,66 @@ from src.server.chat_request import (
     TTSRequest,
 )
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
-from src.server.mcp_utils import load_mcp_tools
-from src.tools import VolcengineTTS
+from src.server.mcp_utils import mcp_metadata_cache
+from src.tools.tts import get_tts_client
+from src.tools.tts_cache import get_tts_cache, synthesis_cache_key
+from src.tools.tts_pipeline import (
+    TTSSettings,
+    split_text,
+    stream_part,
+    synthesize_segments,
+)
+from src.tools.mcp_pool import mcp_client_pool
+from src.tools.search_cache import get_search_cache
+from src.utils.http_client import get_http_client
+from src.utils.rate_limiter import get_rate_limit_scheduler
 from .routes import auth
 from .routes import chat  # 添加chat路由导入
-from .database import SessionLocal, get_db
-from .models import Chat, Report
+from .chat_writer import chat_writer
+from .graph_registry import graph_registry
+from .jobs import Job, JobResult, QueueFullError, job_manager, run_graph
+from .database import SessionLocal
+from .models import Report
 
 logger = logging.getLogger(__name__)
 # 设置日志级别为DEBUG以显示详细信息
 logger.setLevel(logging.DEBUG)
 
+graph = build_graph_with_memory()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the durable checkpointer and background writers for the server lifetime."""
+    global graph
+    async with open_checkpointer() as checkpointer:
+        graph = build_graph_with_memory(checkpointer)
+        pruner = asyncio.create_task(run_checkpoint_pruner(checkpointer))
+        chat_writer.start()
+        job_manager.start()
+        # Compile the artifact workflows once, off the event loop
+        await asyncio.to_thread(graph_registry.compile_all)
+        mcp_reaper = asyncio.create_task(mcp_client_pool.run_idle_reaper())
+        ppt_gc = asyncio.create_task(run_ppt_artifact_gc())
+        try:
+            yield
+        finally:
+            pruner.cancel()
+            mcp_reaper.cancel()
+            ppt_gc.cancel()
+            await job_manager.stop()
+            await mcp_client_pool.close()
+            await asyncio.to_thread(get_marp_renderer().close)
+            await chat_writer.stop()
+            await get_http_client().aclose()
+            get_http_client().close()
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -60,17 +110,6 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(chat.router, prefix="/api", tags=["chat"])  # 修改前缀为/api
 
-graph = build_graph_with_memory()
-
-# 修正异步上下文管理器的实现
-@asynccontextmanager
-async def get_async_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     # 添加用户认证检查
@@ -89,25 +128,12 @@ async def chat_stream(request: ChatRequest):
     # 如果有用户ID，保存用户消息到数据库
     if request.user_id and request.messages:
         logger.info(f"Attempting to save user message for user_id: {request.user_id}, thread_id: {thread_id}")
-        try:
-            async with get_async_db() as db:
-                # 保存用户最新的消息
-                last_message = request.messages[-1]
-                content = (last_message.content if isinstance(last_message.content, str) 
-                          else last_message.content[0].text)
-                logger.debug(f"Message content: {content[:100]}...")  # 只记录前100个字符
-                
-                chat = Chat(
-                    user_id=request.user_id,
-                    thread_id=thread_id,
-                    role=last_message.role,
-                    content=content
-                )
-                db.add(chat)
-                db.commit()
-                logger.info(f"Successfully saved user message to database")
-        except Exception as e:
-            logger.error(f"Failed to save user message to database: {str(e)}", exc_info=True)
+        # 保存用户最新的消息
+        last_message = request.messages[-1]
+        content = (last_message.content if isinstance(last_message.content, str) 
+                  else last_message.content[0].text)
+        logger.debug(f"Message content: {content[:100]}...")  # 只记录前100个字符
+        await chat_writer.enqueue(request.user_id, thread_id, last_message.role, content)
     else:
         logger.warning(f"Skipping database save - user_id: {request.user_id}, has_messages: {bool(request.messages)}")
     
@@ -144,6 +170,7 @@ async def chat_stream(request: ChatRequest):
             request.mcp_settings,
             request.enable_background_investigation,
             request.user_id,  # 传入用户ID
+            request.max_parallel_steps,
         ),
         media_type="text/event-stream",
     )
@@ -159,6 +186,7 @@ async def _astream_workflow_generator(
     mcp_settings: dict,
     enable_background_investigation: bool,
     user_id: Optional[int] = None,  # 添加用户ID参数
+    max_parallel_steps: int = 1,
 ):
     logger.debug(f"Starting workflow generator for thread_id: {thread_id}, user_id: {user_id}")
     
@@ -202,142 +230,117 @@ async def _astream_workflow_generator(
         "thread_id": thread_id,
         "max_plan_iterations": max_plan_iterations,
         "max_step_num": max_step_num,
+        "max_parallel_steps": max_parallel_steps,
         "mcp_settings": mcp_settings,
         "user_id": user_id,  # 添加用户ID到配置中
     }
     
-    async for agent, _, event_data in graph.astream(
-        input_,
-        config=config,
-        stream_mode=["messages", "updates"],
-        subgraphs=True,
-    ):
-        if isinstance(event_data, dict):
-            if "__interrupt__" in event_data:
-                logger.info(f"Handling interrupt event for thread_id: {thread_id}")
-                # 保存中断消息到数据库
-                if user_id:
-                    try:
-                        async with get_async_db() as db:
-                            chat = Chat(
-                                user_id=user_id,
-                                thread_id=thread_id,
-                                role="assistant",
-                                content=event_data["__interrupt__"][0].value
-                            )
-                            db.add(chat)
-                            db.commit()
-                            logger.info(f"Successfully saved interrupt message to database")
-                    except Exception as e:
-                        logger.error(f"Failed to save interrupt message: {str(e)}", exc_info=True)
+    try:
+        async for agent, _, event_data in graph.astream(
+            input_,
+            config=config,
+            stream_mode=["messages", "updates"],
+            subgraphs=True,
+        ):
+            if isinstance(event_data, dict):
+                if "__interrupt__" in event_data:
+                    logger.info(f"Handling interrupt event for thread_id: {thread_id}")
+                    # 保存中断消息到数据库
+                    if user_id:
+                        await chat_writer.enqueue(
+                            user_id, thread_id, "assistant", event_data["__interrupt__"][0].value
+                        )
                 
-                yield _make_event(
-                    "interrupt",
-                    {
-                        "thread_id": thread_id,
-                        "id": event_data["__interrupt__"][0].ns[0],
-                        "role": "assistant",
-                        "content": event_data["__interrupt__"][0].value,
-                        "finish_reason": "interrupt",
-                        "options": [
-                            {"text": "修改思路", "value": "edit_plan"},
-                            {"text": "开始研究", "value": "accepted"},
-                        ],
-                    },
-                )
-            continue
-        message_chunk, message_metadata = cast(
-            tuple[AIMessageChunk, dict[str, any]], event_data
-        )
+                    yield _make_event(
+                        "interrupt",
+                        {
+                            "thread_id": thread_id,
+                            "id": event_data["__interrupt__"][0].ns[0],
+                            "role": "assistant",
+                            "content": event_data["__interrupt__"][0].value,
+                            "finish_reason": "interrupt",
+                            "options": [
+                                {"text": "修改思路", "value": "edit_plan"},
+                                {"text": "开始研究", "value": "accepted"},
+                            ],
+                        },
+                    )
+                continue
+            message_chunk, message_metadata = cast(
+                tuple[AIMessageChunk, dict[str, any]], event_data
+            )
         
-        # 收集消息内容
-        if not isinstance(message_chunk, ToolMessage):
-            # 从 message_metadata 中获取角色信息，如果没有则默认为 "assistant"
-            current_role = "assistant"
-            if hasattr(message_chunk, "type") and message_chunk.type == "human":
-                current_role = "user"
+            # 收集消息内容
+            if not isinstance(message_chunk, ToolMessage):
+                # 从 message_metadata 中获取角色信息，如果没有则默认为 "assistant"
+                current_role = "assistant"
+                if hasattr(message_chunk, "type") and message_chunk.type == "human":
+                    current_role = "user"
             
-            if current_message["role"] != current_role:
-                # 如果是新角色的消息，且之前有未保存的完整消息，先保存之前的消息
-                if current_message["content"] and current_message["role"] and user_id:
-                    try:
-                        async with get_async_db() as db:
-                            chat = Chat(
-                                user_id=user_id,
-                                thread_id=thread_id,
-                                role=current_message["role"],
-                                content=current_message["content"]
-                            )
-                            db.add(chat)
-                            db.commit()
-                            logger.info(f"Successfully saved complete message to database")
-                    except Exception as e:
-                        logger.error(f"Failed to save complete message: {str(e)}", exc_info=True)
+                if current_message["role"] != current_role:
+                    # 如果是新角色的消息，且之前有未保存的完整消息，先保存之前的消息
+                    if current_message["content"] and current_message["role"] and user_id:
+                        await chat_writer.enqueue(
+                            user_id, thread_id, current_message["role"], current_message["content"]
+                        )
                 
-                # 重置当前消息
-                current_message["content"] = message_chunk.content
-                current_message["role"] = current_role
-                current_message["is_complete"] = False
-            else:
-                # 同一角色的消息，继续累积内容
-                current_message["content"] += message_chunk.content
+                    # 重置当前消息
+                    current_message["content"] = message_chunk.content
+                    current_message["role"] = current_role
+                    current_message["is_complete"] = False
+                else:
+                    # 同一角色的消息，继续累积内容
+                    current_message["content"] += message_chunk.content
             
-            # 检查消息是否完成
-            if message_chunk.response_metadata and message_chunk.response_metadata.get("finish_reason"):
-                current_message["is_complete"] = True
-                # 保存完整的消息
-                if user_id:
-                    try:
-                        async with get_async_db() as db:
-                            chat = Chat(
-                                user_id=user_id,
-                                thread_id=thread_id,
-                                role=current_message["role"],
-                                content=current_message["content"]
-                            )
-                            db.add(chat)
-                            db.commit()
-                            logger.info(f"Successfully saved complete message to database")
-                            # 重置当前消息
-                            current_message["content"] = ""
-                            current_message["role"] = ""
-                            current_message["is_complete"] = False
-                    except Exception as e:
-                        logger.error(f"Failed to save complete message: {str(e)}", exc_info=True)
+                # 检查消息是否完成
+                if message_chunk.response_metadata and message_chunk.response_metadata.get("finish_reason"):
+                    current_message["is_complete"] = True
+                    # 保存完整的消息
+                    if user_id:
+                        await chat_writer.enqueue(
+                            user_id, thread_id, current_message["role"], current_message["content"]
+                        )
+                        # 重置当前消息
+                        current_message["content"] = ""
+                        current_message["role"] = ""
+                        current_message["is_complete"] = False
         
-        event_stream_message: dict[str, any] = {
-            "thread_id": thread_id,
-            "agent": agent[0].split(":")[0],
-            "id": message_chunk.id,
-            "role": "assistant",
-            "content": message_chunk.content,
-        }
-        if message_chunk.response_metadata and message_chunk.response_metadata.get("finish_reason"):
-            event_stream_message["finish_reason"] = message_chunk.response_metadata.get(
-                "finish_reason"
-            )
-        if isinstance(message_chunk, ToolMessage):
-            # Tool Message - Return the result of the tool call
-            event_stream_message["tool_call_id"] = message_chunk.tool_call_id
-            yield _make_event("tool_call_result", event_stream_message)
-        else:
-            # AI Message - Raw message tokens
-            if message_chunk.tool_calls:
-                # AI Message - Tool Call
-                event_stream_message["tool_calls"] = message_chunk.tool_calls
-                event_stream_message["tool_call_chunks"] = (
-                    message_chunk.tool_call_chunks
-                )
-                yield _make_event("tool_calls", event_stream_message)
-            elif message_chunk.tool_call_chunks:
-                # AI Message - Tool Call Chunks
-                event_stream_message["tool_call_chunks"] = (
-                    message_chunk.tool_call_chunks
+            event_stream_message: dict[str, any] = {
+                "thread_id": thread_id,
+                "agent": agent[0].split(":")[0],
+                "id": message_chunk.id,
+                "role": "assistant",
+                "content": message_chunk.content,
+            }
+            if message_chunk.response_metadata and message_chunk.response_metadata.get("finish_reason"):
+                event_stream_message["finish_reason"] = message_chunk.response_metadata.get(
+                    "finish_reason"
                 )
-                yield _make_event("tool_call_chunks", event_stream_message)
+            if isinstance(message_chunk, ToolMessage):
+                # Tool Message - Return the result of the tool call
+                event_stream_message["tool_call_id"] = message_chunk.tool_call_id
+                yield _make_event("tool_call_result", event_stream_message)
             else:
                 # AI Message - Raw message tokens
-                yield _make_event("message_chunk", event_stream_message)
+                if message_chunk.tool_calls:
+                    # AI Message - Tool Call
+                    event_stream_message["tool_calls"] = message_chunk.tool_calls
+                    event_stream_message["tool_call_chunks"] = (
+                        message_chunk.tool_call_chunks
+                    )
+                    yield _make_event("tool_calls", event_stream_message)
+                elif message_chunk.tool_call_chunks:
+                    # AI Message - Tool Call Chunks
+                    event_stream_message["tool_call_chunks"] = (
+                        message_chunk.tool_call_chunks
+                    )
+                    yield _make_event("tool_call_chunks", event_stream_message)
+                else:
+                    # AI Message - Raw message tokens
+                    yield _make_event("message_chunk", event_stream_message)
+    finally:
+        # 流结束时确保本次会话的消息都已写入数据库
+        await chat_writer.flush()
 
 
 def _make_event(event_type: str, data: dict[str, any]):
@@ -350,98 +353,193 @@ def _make_event(event_type: str, data: dict[str, any]):
 async def text_to_speech(request: TTSRequest):
     """Convert text to speech using volcengine TTS API."""
     try:
-        app_id = os.getenv("VOLCENGINE_TTS_APPID", "")
-        if not app_id:
-            raise HTTPException(
-                status_code=400, detail="VOLCENGINE_TTS_APPID is not set"
-            )
-        access_token = os.getenv("VOLCENGINE_TTS_ACCESS_TOKEN", "")
-        if not access_token:
-            raise HTTPException(
-                status_code=400, detail="VOLCENGINE_TTS_ACCESS_TOKEN is not set"
+        try:
+            tts_client = get_tts_client()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        options = {
+            "encoding": request.encoding,
+            "speed_ratio": request.speed_ratio,
+            "volume_ratio": request.volume_ratio,
+            "pitch_ratio": request.pitch_ratio,
+            "text_type": request.text_type,
+            "with_frontend": request.with_frontend,
+            "frontend_type": request.frontend_type,
+        }
+        media_type = f"audio/{request.encoding}"
+        headers = {
+            "Content-Disposition": f"attachment; filename=tts_output.{request.encoding}"
+        }
+
+        # Long texts are split at sentence boundaries and streamed in order
+        segments = split_text(request.text, TTSSettings.from_conf().max_segment_bytes)
+        if len(segments) > 1:
+            return StreamingResponse(
+                _stream_tts_audio(tts_client, segments, options),
+                media_type=media_type,
+                headers=headers,
             )
-        cluster = os.getenv("VOLCENGINE_TTS_CLUSTER", "volcano_tts")
-        voice_type = os.getenv("VOLCENGINE_TTS_VOICE_TYPE", "BV700_V2_streaming")
-
-        tts_client = VolcengineTTS(
-            appid=app_id,
-            access_token=access_token,
-            cluster=cluster,
-            voice_type=voice_type,
-        )
+        text = segments[0] if segments else request.text
+
+        # Serve previously synthesized audio straight from disk
+        cache = get_tts_cache()
+        key = synthesis_cache_key(tts_client, text, **options)
+        path = cache.get_path(key, request.encoding)
+        if path is not None:
+            return FileResponse(path, media_type=media_type, headers=headers)
+
         # Call the TTS API
-        result = tts_client.text_to_speech(
-            text=request.text[:1024],
-            encoding=request.encoding,
-            speed_ratio=request.speed_ratio,
-            volume_ratio=request.volume_ratio,
-            pitch_ratio=request.pitch_ratio,
-            text_type=request.text_type,
-            with_frontend=request.with_frontend,
-            frontend_type=request.frontend_type,
-        )
+        result = await tts_client.text_to_speech_async(text=text, **options)
 
         if not result["success"]:
             raise HTTPException(status_code=500, detail=str(result["error"]))
 
         # Decode the base64 audio data
         audio_data = base64.b64decode(result["audio_data"])
+        path = await asyncio.to_thread(cache.set, key, request.encoding, audio_data)
+        if path is not None:
+            return FileResponse(path, media_type=media_type, headers=headers)
 
         # Return the audio file
-        return Response(
-            content=audio_data,
-            media_type=f"audio/{request.encoding}",
-            headers={
-                "Content-Disposition": (
-                    f"attachment; filename=tts_output.{request.encoding}"
-                )
-            },
-        )
+        return Response(content=audio_data, media_type=media_type, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error in TTS endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_tts_audio(tts_client, segments: list[str], options: dict):
+    """Yield the audio of the segments in order, while later ones are synthesized."""
+    first = True
+    async for index, audio in synthesize_segments(
+        tts_client, [(segment, options) for segment in segments]
+    ):
+        if audio is None:
+            logger.error(f"TTS segment {index + 1}/{len(segments)} failed, skipping it")
+            continue
+        yield stream_part(audio, options["encoding"], first)
+        first = False
+
+
 @app.post("/api/podcast/generate")
 async def generate_podcast(request: GeneratePodcastRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_podcast_graph()
-        final_state = workflow.invoke({"input": report_content})
+        if request.stream:
+            # Write the script up front, so that its errors still get a 500
+            script_state = await asyncio.to_thread(
+                script_writer_node, {"input": report_content}
+            )
+            mixer = AudioMixer()
+            return StreamingResponse(
+                _stream_podcast_audio(script_state["script"].lines, mixer),
+                media_type=mixer.media_type,
+            )
+        workflow = graph_registry.get("podcast")
+        final_state = await workflow.ainvoke({"input": report_content})
         audio_bytes = final_state["output"]
-        return Response(content=audio_bytes, media_type="audio/mp3")
+        headers = {}
+        if final_state.get("failed_lines"):
+            # Partial result, some script lines couldn't be synthesized
+            headers["X-Podcast-Failed-Lines"] = ",".join(
+                str(index) for index in final_state["failed_lines"]
+            )
+        return Response(
+            content=audio_bytes,
+            media_type=final_state["output_media_type"],
+            headers=headers,
+        )
     except Exception as e:
         logger.exception(f"Error occurred during podcast generation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_podcast_audio(lines, mixer: AudioMixer):
+    """Yield the mixed podcast audio, line by line in order."""
+    failed_lines = []
+    try:
+        async for index, audio_chunk in synthesize_lines(
+            lines, encoding=mixer.input_format
+        ):
+            if audio_chunk is None:
+                failed_lines.append(index)
+                continue
+            try:
+                output = await asyncio.to_thread(mixer.feed, audio_chunk)
+            except AudioDecodeError as e:
+                logger.error(f"Skipping line {index} of the podcast: {e}")
+                failed_lines.append(index)
+                continue
+            if output:
+                yield output
+        yield await asyncio.to_thread(mixer.finish)
+    finally:
+        # A client disconnecting mid-stream would leave ffmpeg waiting on stdin
+        mixer.close()
+    if failed_lines:
+        logger.error(f"Podcast streamed without lines: {failed_lines}")
+
+
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+# Seconds a client should wait before retrying a rejected ppt generation
+PPT_RETRY_AFTER_SECONDS = 10
+
+
+def _update_report_content(user_id: int, report_id: int, content: str):
+    db = SessionLocal()
+    try:
+        report = db.query(Report).filter(
+            Report.id == report_id,
+            Report.user_id == user_id
+        ).first()
+        if report:
+            report.content = content
+            report.updated_at = datetime.utcnow()
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _generate_ppt_file(report_content: str, job: Optional[Job] = None) -> str:
+    workflow = graph_registry.get("ppt")
+    if job is None:
+        final_state = await workflow.ainvoke({"input": report_content})
+    else:
+        final_state = await run_graph(job, workflow, {"input": report_content})
+    return final_state["generated_file_path"]
+
+
 @app.post("/api/ppt/generate")
 async def generate_ppt(request: GeneratePPTRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_ppt_graph()
-        final_state = workflow.invoke({"input": report_content})
-        generated_file_path = final_state["generated_file_path"]
+        generated_file_path = await _generate_ppt_file(report_content)
         
         # 如果提供了用户ID和报告ID，更新报告记录
         if request.user_id and request.report_id:
-            with get_db() as db:
-                report = db.query(Report).filter(
-                    Report.id == request.report_id,
-                    Report.user_id == request.user_id
-                ).first()
-                if report:
-                    report.content = report_content
-                    report.updated_at = datetime.utcnow()
-                    db.commit()
+            await asyncio.to_thread(
+                _update_report_content,
+                request.user_id,
+                request.report_id,
+                report_content,
+            )
         
-        with open(generated_file_path, "rb") as f:
-            ppt_bytes = f.read()
-        return Response(
-            content=ppt_bytes,
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        return FileResponse(generated_file_path, media_type=PPTX_MEDIA_TYPE)
+    except RendererBusyError as e:
+        logger.warning(f"Rejected ppt generation: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(PPT_RETRY_AFTER_SECONDS)},
         )
     except Exception as e:
         logger.exception(f"Error occurred during ppt generation: {str(e)}")
@@ -452,19 +550,16 @@ async def generate_ppt(request: GeneratePPTRequest):
 async def generate_prose(request: GenerateProseRequest):
     try:
         logger.info(f"Generating prose for prompt: {request.prompt}")
-        workflow = build_prose_graph()
+        workflow = graph_registry.get("prose")
         
         # 如果提供了用户ID和报告ID，更新报告记录
         if request.user_id and request.report_id:
-            with get_db() as db:
-                report = db.query(Report).filter(
-                    Report.id == request.report_id,
-                    Report.user_id == request.user_id
-                ).first()
-                if report:
-                    report.content = request.prompt
-                    report.updated_at = datetime.utcnow()
-                    db.commit()
+            await asyncio.to_thread(
+                _update_report_content,
+                request.user_id,
+                request.report_id,
+                request.prompt,
+            )
         
         events = workflow.astream(
             {
@@ -484,6 +579,125 @@ async def generate_prose(request: GenerateProseRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _podcast_job(job: Job, request: GeneratePodcastRequest) -> JobResult:
+    final_state = await run_graph(job, graph_registry.get("podcast"), {"input": request.content})
+    headers = {}
+    if final_state.get("failed_lines"):
+        headers["X-Podcast-Failed-Lines"] = ",".join(
+            str(index) for index in final_state["failed_lines"]
+        )
+    return JobResult(final_state["output"], final_state["output_media_type"], headers)
+
+
+async def _ppt_job(job: Job, request: GeneratePPTRequest) -> JobResult:
+    generated_file_path = await _generate_ppt_file(request.content, job)
+    if request.user_id and request.report_id:
+        await asyncio.to_thread(
+            _update_report_content, request.user_id, request.report_id, request.content
+        )
+    return JobResult(b"", PPTX_MEDIA_TYPE, path=generated_file_path)
+
+
+async def _prose_job(job: Job, request: GenerateProseRequest) -> JobResult:
+    if request.user_id and request.report_id:
+        await asyncio.to_thread(
+            _update_report_content, request.user_id, request.report_id, request.prompt
+        )
+    final_state = await run_graph(
+        job,
+        graph_registry.get("prose"),
+        {
+            "content": request.prompt,
+            "option": request.option,
+            "command": request.command,
+        },
+    )
+    return JobResult(final_state.get("output", ""), "text/plain; charset=utf-8")
+
+
+def _submit_job(kind: str, runner) -> dict:
+    try:
+        job = job_manager.submit(kind, runner)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job.to_dict()
+
+
+@app.post("/api/podcast/jobs")
+async def submit_podcast_job(request: GeneratePodcastRequest):
+    """Queue a podcast generation, track it with /api/jobs/{job_id}."""
+    return _submit_job("podcast", lambda job: _podcast_job(job, request))
+
+
+@app.post("/api/ppt/jobs")
+async def submit_ppt_job(request: GeneratePPTRequest):
+    """Queue a ppt generation, track it with /api/jobs/{job_id}."""
+    return _submit_job("ppt", lambda job: _ppt_job(job, request))
+
+
+@app.post("/api/prose/jobs")
+async def submit_prose_job(request: GenerateProseRequest):
+    """Queue a prose generation, track it with /api/jobs/{job_id}."""
+    return _submit_job("prose", lambda job: _prose_job(job, request))
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a job."""
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Stream the progress events of a job until it finishes."""
+    job = _get_job(job_id)
+    return StreamingResponse(
+        (_make_event(event["event"], dict(event)) async for event in job.watch()),
+        media_type="text/event-stream",
+    )
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Get the result of a succeeded job."""
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status == "cancelled":
+        raise HTTPException(status_code=410, detail="Job was cancelled")
+    if job.result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.result.path is not None:
+        if not os.path.exists(job.result.path):
+            raise HTTPException(status_code=410, detail="Result was removed")
+        return FileResponse(
+            job.result.path,
+            media_type=job.result.media_type,
+            headers=job.result.headers,
+        )
+    return Response(
+        content=job.result.content,
+        media_type=job.result.media_type,
+        headers=job.result.headers,
+    )
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = _get_job(job_id)
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.to_dict()
+
+
 @app.post("/api/mcp/server/metadata", response_model=MCPServerMetadataResponse)
 async def mcp_server_metadata(request: MCPServerMetadataRequest):
     """Get information about an MCP server."""
@@ -495,14 +709,15 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         if request.timeout_seconds is not None:
             timeout = request.timeout_seconds
 
-        # Load tools from the MCP server using the utility function
-        tools = await load_mcp_tools(
+        # Load tools from the MCP server, served from cache when possible
+        tools = await mcp_metadata_cache.get_tools(
             server_type=request.transport,
             command=request.command,
             args=request.args,
             url=request.url,
             env=request.env,
             timeout_seconds=timeout,
+            refresh=request.refresh,
         )
 
         # Create the response with tools
@@ -521,3 +736,23 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
             logger.exception(f"Error in MCP server metadata endpoint: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
         raise
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Get runtime metrics of the server's background subsystems."""
+    return {
+        "chat_writer": chat_writer.stats(),
+        "jobs": job_manager.stats(),
+        "graphs": graph_registry.stats(),
+        "marp": get_marp_renderer().stats(),
+        "ppt_artifacts": get_ppt_artifact_store().stats(),
+        "mcp_pool": mcp_client_pool.stats(),
+        "mcp_metadata_cache": mcp_metadata_cache.stats(),
+        "tts_cache": get_tts_cache().stats(),
+        "crawl_cache": get_crawl_cache().stats(),
+        "rate_limits": get_rate_limit_scheduler().stats(),
+        "search_cache": (
+            get_search_cache().stats() if get_search_cache() else {"enabled": False}
+        ),
+    }
@@ -39,6 +39,11 @@ class ChatRequest(BaseModel):
     max_step_num: Optional[int] = Field(
         3, description="The maximum number of steps in a plan"
     )
+    max_parallel_steps: int = Field(
+        1,
+        ge=1,
+        description="The maximum number of research steps executed concurrently",
+    )
     auto_accepted_plan: Optional[bool] = Field(
         False, description="Whether to automatically accept the plan"
     )
@@ -71,6 +76,9 @@ class TTSRequest(BaseModel):
 
 class GeneratePodcastRequest(BaseModel):
     content: str = Field(..., description="The content of the podcast")
+    stream: Optional[bool] = Field(
+        False, description="Whether to stream the audio while it is synthesized"
+    )
 
 
 class GeneratePPTRequest(BaseModel):
@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Write-behind persistence of chat messages.
+
+Streams hand their completed messages to a shared queue and keep going; a
+single background task drains the queue and commits the rows in batched
+transactions on a worker thread, so the event loop never blocks on SQLite.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from .database import SessionLocal
+from .models import Chat
+
+logger = logging.getLogger(__name__)
+
+
+class ChatWriter:
+    """
+    Background writer that persists Chat rows in batches.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Initialize the chat writer.
+
+        Args:
+            max_queue_size: Maximum number of pending rows, producers wait when full
+            batch_size: Maximum number of rows committed in one transaction
+            flush_interval: Seconds to wait for more rows before committing a batch
+        """
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flush_count = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self):
+        """Start the background flush task on the running event loop."""
+        if self._task and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush all pending rows and stop the background task."""
+        if not self._task:
+            return
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def enqueue(self, user_id: int, thread_id: str, role: str, content: str):
+        """Queue a chat message for persistence, waiting if the buffer is full."""
+        if not self._task:
+            self.start()
+        await self._queue.put(
+            {
+                "user_id": user_id,
+                "thread_id": thread_id,
+                "role": role,
+                "content": content,
+            }
+        )
+
+    async def flush(self):
+        """Wait until every row queued before this call has been committed."""
+        if not self._task:
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(done)
+        await done
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "flush_count": self.flush_count,
+            "last_flush_latency": self.last_flush_latency,
+            "max_flush_latency": self.max_flush_latency,
+            "avg_flush_latency": (
+                self.total_flush_latency / self.flush_count if self.flush_count else 0.0
+            ),
+        }
+
+    async def _run(self):
+        while True:
+            rows, waiters = [], []
+            item = await self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, asyncio.Future):
+                    # A flush request commits everything queued before it
+                    waiters.append(item)
+                    break
+                rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if rows:
+                await self._write(rows)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _write(self, rows: list[dict]):
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write_batch, rows)
+            self.rows_written += len(rows)
+            logger.debug(f"Saved {len(rows)} chat messages to database")
+        except Exception as e:
+            self.rows_failed += len(rows)
+            logger.error(f"Failed to save chat messages: {str(e)}", exc_info=True)
+        latency = time.perf_counter() - started
+        self.flush_count += 1
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+        self.total_flush_latency += latency
+
+    @staticmethod
+    def _write_batch(rows: list[dict]):
+        db = SessionLocal()
+        try:
+            db.add_all([Chat(**row) for row in rows])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+chat_writer = ChatWriter()
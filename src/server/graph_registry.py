@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Registry of the compiled artifact workflows (podcast, PPT and prose).
+
+The graphs never change at runtime, so each one is compiled once, at
+startup, and shared by every request. Warming a graph creates its LLM
+clients and compiles its prompt templates ahead of the first request.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.config.agents import AGENT_LLM_MAP
+from src.llms.llm import get_llm_by_type
+from src.podcast.graph.builder import build_graph as build_podcast_graph
+from src.ppt.graph.builder import build_graph as build_ppt_graph
+from src.prompts.template import get_prompt_template
+from src.prose.graph.builder import build_graph as build_prose_graph
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _GraphEntry:
+    builder: Callable[[], Any]
+    agents: list[str] = field(default_factory=list)  # Keys of AGENT_LLM_MAP
+    prompts: list[str] = field(default_factory=list)  # Prompt template names
+    graph: Any = None
+    compile_seconds: Optional[float] = None
+    warm_seconds: Optional[float] = None
+
+
+class GraphRegistry:
+    """
+    Named workflows, compiled at most once.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, _GraphEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        builder: Callable[[], Any],
+        agents: Optional[list[str]] = None,
+        prompts: Optional[list[str]] = None,
+    ):
+        """
+        Register a workflow.
+
+        Args:
+            name: Name of the workflow
+            builder: Function returning the compiled graph
+            agents: Agents of the graph, their LLM clients are created on warmup
+            prompts: Prompt templates of the graph, compiled on warmup
+        """
+        self._entries[name] = _GraphEntry(
+            builder=builder, agents=agents or [], prompts=prompts or []
+        )
+
+    def get(self, name: str):
+        """Get the compiled graph of a workflow, compiling it on first use."""
+        entry = self._entries[name]
+        if entry.graph is None:
+            with self._lock:
+                if entry.graph is None:
+                    started = time.perf_counter()
+                    entry.graph = entry.builder()
+                    entry.compile_seconds = time.perf_counter() - started
+                    logger.info(
+                        f"Compiled {name} graph in {entry.compile_seconds:.3f}s"
+                    )
+        return entry.graph
+
+    def warmup(self, name: str):
+        """Create the LLM clients and compile the prompt templates of a workflow."""
+        entry = self._entries[name]
+        started = time.perf_counter()
+        for agent in entry.agents:
+            get_llm_by_type(AGENT_LLM_MAP[agent])
+        for prompt in entry.prompts:
+            get_prompt_template(prompt)
+        entry.warm_seconds = time.perf_counter() - started
+
+    def compile_all(self, warmup: bool = True):
+        """Compile, and optionally warm up, every registered workflow."""
+        for name in self._entries:
+            self.get(name)
+            if warmup:
+                try:
+                    self.warmup(name)
+                except Exception as e:
+                    # A broken warmup must not keep the server from starting
+                    logger.warning(f"Failed to warm up {name} graph: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            name: {
+                "compiled": entry.graph is not None,
+                "compile_seconds": entry.compile_seconds,
+                "warm_seconds": entry.warm_seconds,
+            }
+            for name, entry in self._entries.items()
+        }
+
+
+graph_registry = GraphRegistry()
+graph_registry.register(
+    "podcast",
+    build_podcast_graph,
+    agents=["podcast_script_writer"],
+    prompts=["podcast/podcast_script_writer"],
+)
+graph_registry.register(
+    "ppt", build_ppt_graph, agents=["ppt_composer"], prompts=["ppt/ppt_composer"]
+)
+graph_registry.register(
+    "prose",
+    build_prose_graph,
+    agents=["prose_writer"],
+    prompts=[
+        "prose/prose_continue",
+        "prose/prose_fix",
+        "prose/prose_improver",
+        "prose/prose_longer",
+        "prose/prose_shorter",
+        "prose/prose_zap",
+    ],
+)
@@ -0,0 +1,282 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Background jobs for long running artifact generation (podcast, PPT, prose).
+
+A submitted job waits in a bounded queue until one of a fixed number of
+workers picks it up, so heavy generations neither block the event loop nor
+pile up without limit. Jobs publish progress events, can be cancelled and
+are kept for a while after they finish so clients can fetch the result.
+
+Configured by the `JOBS` section of conf.yaml:
+
+    JOBS:
+      max_concurrency: 2
+      max_queue_size: 100
+      retention_seconds: 3600
+      max_retained: 200
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field, fields
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from src.config import load_conf_section
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_FINISHED = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+
+@dataclass(kw_only=True)
+class JobSettings:
+    """The job queue fields of conf.yaml."""
+
+    max_concurrency: int = 2  # Jobs running at the same time
+    max_queue_size: int = 100  # Jobs waiting for a worker, submissions fail beyond
+    retention_seconds: int = 3600  # Time finished jobs and their results are kept
+    max_retained: int = 200  # Finished jobs kept at most
+
+    @classmethod
+    def from_conf(cls) -> "JobSettings":
+        """Create a JobSettings instance from conf.yaml."""
+        conf = load_conf_section("JOBS")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+@dataclass
+class JobResult:
+    content: Union[bytes, str]
+    media_type: str
+    headers: dict[str, str] = field(default_factory=dict)
+    path: Optional[str] = None  # File holding the result, sent instead of content
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+
+@dataclass
+class Job:
+    kind: str
+    runner: Callable[["Job"], Awaitable[JobResult]]
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[JobResult] = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+    task: Optional[asyncio.Task] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def publish(self, event: str, **data: Any):
+        """Record a progress event and wake up the watchers."""
+        self.events.append({"event": event, "time": time.time(), **data})
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def set_status(self, status: str, **data: Any):
+        self.status = status
+        if status == JOB_RUNNING:
+            self.started_at = time.time()
+        elif status in _FINISHED:
+            self.finished_at = time.time()
+        self.publish("status", status=status, **data)
+
+    async def watch(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield every event of the job, past and future, until it finishes."""
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            await self.changed.wait()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "progress": [
+                event["node"] for event in self.events if event["event"] == "progress"
+            ],
+        }
+
+
+async def run_graph(job: Job, workflow, graph_input: dict[str, Any]) -> dict[str, Any]:
+    """Run a compiled graph, publishing a progress event per finished node."""
+    final_state: dict[str, Any] = {}
+    async for mode, chunk in workflow.astream(
+        graph_input, stream_mode=["updates", "values"]
+    ):
+        if mode == "values":
+            final_state = chunk
+        else:
+            for node in chunk:
+                job.publish("progress", node=node)
+    return final_state
+
+
+class JobManager:
+    """
+    Bounded queue of jobs executed by a fixed pool of worker tasks.
+    """
+
+    def __init__(self, settings: Optional[JobSettings] = None):
+        self.settings = settings or JobSettings.from_conf()
+        self._jobs: dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.completed: dict[str, int] = {status: 0 for status in _FINISHED}
+
+    def start(self):
+        """Start the workers on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.settings.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.settings.max_concurrency)
+        ]
+
+    async def stop(self):
+        """Cancel every unfinished job and stop the workers."""
+        for job in self._jobs.values():
+            self.cancel(job.id)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, runner: Callable[[Job], Awaitable[JobResult]]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Kind of the job, e.g. podcast
+            runner: Coroutine function producing the result of the job
+
+        Raises:
+            QueueFullError: If too many jobs are waiting already
+        """
+        if self._queue is None:
+            self.start()
+        self.prune()
+        job = Job(kind=kind, runner=runner)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError("Too many jobs are waiting, try again later")
+        self._jobs[job.id] = job
+        self.submitted += 1
+        job.publish("status", status=JOB_QUEUED)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job, False if it is unknown or finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            # Still queued, the worker will skip it
+            self._finish(job, JOB_CANCELLED)
+        return True
+
+    def _finish(self, job: Job, status: str, **data: Any):
+        self.completed[status] += 1
+        job.set_status(status, **data)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if not job.finished:
+                    await self._run(job)
+            except Exception as e:
+                logger.exception(f"Job worker failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.set_status(JOB_RUNNING)
+        job.task = asyncio.create_task(job.runner(job))
+        # Wait without propagating the job's cancellation into the worker
+        await asyncio.wait([job.task])
+        if job.task.cancelled():
+            self._finish(job, JOB_CANCELLED)
+        elif (error := job.task.exception()) is not None:
+            logger.error(f"{job.kind} job {job.id} failed: {error!r}")
+            job.error = str(error)
+            self._finish(job, JOB_FAILED, error=job.error)
+        else:
+            job.result = job.task.result()
+            self._finish(job, JOB_SUCCEEDED)
+
+    def prune(self) -> int:
+        """Forget finished jobs past their retention, returning how many."""
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.finished_at,
+        )
+        expired = [
+            job
+            for i, job in enumerate(finished)
+            if now - job.finished_at > self.settings.retention_seconds
+            or len(finished) - i > self.settings.max_retained
+        ]
+        for job in expired:
+            del self._jobs[job.id]
+        return len(expired)
+
+    def stats(self) -> dict[str, Any]:
+        running = sum(job.status == JOB_RUNNING for job in self._jobs.values())
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": running,
+            "retained": len(self._jobs),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": dict(self.completed),
+        }
+
+
+job_manager = JobManager()
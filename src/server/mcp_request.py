@@ -25,6 +25,9 @@ class MCPServerMetadataRequest(BaseModel):
     timeout_seconds: Optional[int] = Field(
         None, description="Optional custom timeout in seconds for the operation"
     )
+    refresh: bool = Field(
+        False, description="Whether to ignore cached metadata and query the server"
+    )
 
 
 class MCPServerMetadataResponse(BaseModel):
@@ -1,9 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import hashlib
+import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 from mcp import ClientSession, StdioServerParameters
@@ -102,3 +108,166 @@ async def load_mcp_tools(
             logger.exception(f"Error loading MCP tools: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
         raise
+
+
+def mcp_metadata_key(
+    server_type: str,
+    command: Optional[str] = None,
+    args: Optional[List[str]] = None,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> str:
+    """Return the cache key of an MCP server, env values are only kept hashed."""
+    payload = json.dumps(
+        {
+            "transport": server_type,
+            "command": command,
+            "args": args or [],
+            "url": url,
+            "env": hashlib.sha256(
+                json.dumps(env or {}, sort_keys=True).encode("utf-8")
+            ).hexdigest(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MCPMetadataCache:
+    """
+    Cache of the tools listed by MCP servers.
+
+    Fresh entries are served directly. Stale entries are still served, while
+    a background task revalidates them. Concurrent loads of the same server
+    share one in-flight request, so a server is never started twice at once.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        stale_seconds: float = 3600,
+        max_entries: int = 64,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds during which an entry is served without revalidation
+            stale_seconds: Seconds after the ttl during which an entry is still
+                served while it is revalidated in the background
+            max_entries: Maximum number of servers kept in the cache
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, List]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Metrics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.load_errors = 0  # Failed loads a request waited for
+        self.refresh_errors = 0  # Failed background revalidations
+
+    async def get_tools(
+        self,
+        server_type: str,
+        command: Optional[str] = None,
+        args: Optional[List[str]] = None,
+        url: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout_seconds: int = 60,
+        refresh: bool = False,
+    ) -> List:
+        """
+        Get the tools of an MCP server, loading them with load_mcp_tools if needed.
+
+        Args:
+            refresh: Ignore the cached entry and load the tools again
+
+        The other arguments are the ones of load_mcp_tools.
+        """
+        key = mcp_metadata_key(server_type, command, args, url, env)
+        loader = partial(
+            load_mcp_tools,
+            server_type=server_type,
+            command=command,
+            args=args,
+            url=url,
+            env=env,
+            timeout_seconds=timeout_seconds,
+        )
+
+        entry = self._entries.get(key)
+        if entry is not None and not refresh:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl_seconds:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._load(key, loader, background=True)
+                return entry[1]
+
+        self.misses += 1
+        # Shielded, so a disconnecting client doesn't cancel a shared load
+        return await asyncio.shield(self._load(key, loader))
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop the entry of key, or every entry if no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[List]],
+        background: bool = False,
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        task = asyncio.create_task(self._fetch(key, loader))
+        self._inflight[key] = task
+        task.add_done_callback(partial(self._on_loaded, key, background))
+        return task
+
+    async def _fetch(self, key: str, loader: Callable[[], Awaitable[List]]) -> List:
+        tools = await loader()
+        self._entries[key] = (time.monotonic(), tools)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return tools
+
+    def _on_loaded(self, key: str, background: bool, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Also retrieves the exception of background revalidations
+            if background:
+                self.refresh_errors += 1
+            else:
+                self.load_errors += 1
+            logger.warning(f"Failed to load MCP server metadata: {task.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "load_errors": self.load_errors,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+mcp_metadata_cache = MCPMetadataCache()
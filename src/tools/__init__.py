@@ -3,7 +3,7 @@
 
 import os
 
-from .crawl import crawl_tool
+from .crawl import batch_crawl_tool, crawl_tool
 from .python_repl import python_repl_tool
 from .search import (
     tavily_search_tool,
@@ -26,6 +26,7 @@ web_search_tool = search_tool_mappings.get(SELECTED_SEARCH_ENGINE, tavily_search
 
 __all__ = [
     "crawl_tool",
+    "batch_crawl_tool",
     "web_search_tool",
     "python_repl_tool",
     "VolcengineTTS",
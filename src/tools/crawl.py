@@ -2,27 +2,83 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from typing import Annotated
+from contextvars import ContextVar
+from typing import Annotated, Optional
 
 from langchain_core.tools import tool
 from .decorators import log_io
 
-from src.crawler import Crawler
+from src.crawler import Article, Crawler, select_chunks
 
 logger = logging.getLogger(__name__)
 
+# Task of the agent step crawling, the default focus of the crawled content
+crawl_focus: ContextVar[Optional[str]] = ContextVar("crawl_focus", default=None)
+
+
+def _crawled_content(crawler: Crawler, article: Article, query: Optional[str]) -> str:
+    # Return the parts of the page most relevant to the query, not its beginning
+    budget = crawler.settings.content_budget
+    title = f"# {article.title}\n\n"
+    return title + select_chunks(
+        article.to_markdown(including_title=False),
+        query or crawl_focus.get() or article.title,
+        max(0, budget - len(title)),
+    )
+
 
 @tool
 @log_io
 def crawl_tool(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[
+        Optional[str], "What to look for, the most relevant parts are returned."
+    ] = None,
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
     try:
         crawler = Crawler()
-        article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        article = crawler.crawl(url, max_chars=crawler.settings.max_extract_chars)
+        return {
+            "url": url,
+            "crawled_content": _crawled_content(crawler, article, query),
+        }
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+@tool
+@log_io
+async def batch_crawl_tool(
+    urls: Annotated[list[str], "The urls to crawl, at most 10."],
+    query: Annotated[
+        Optional[str], "What to look for, the most relevant parts are returned."
+    ] = None,
+) -> list:
+    """Use this to crawl several urls at once and get a readable content of each in markdown format."""
+    crawler = Crawler()
+    urls = list(dict.fromkeys(urls))
+    max_batch_size = crawler.settings.max_batch_size
+    skipped = [
+        {"url": url, "error": f"Skipped, at most {max_batch_size} urls per call"}
+        for url in urls[max_batch_size:]
+    ]
+    # Results are listed in the order the pages finished
+    crawled = []
+    async for url, article in crawler.crawl_many(
+        urls[:max_batch_size], max_chars=crawler.settings.max_extract_chars
+    ):
+        if isinstance(article, Exception):
+            error_msg = f"Failed to crawl. Error: {repr(article)}"
+            logger.error(f"{error_msg} ({url})")
+            crawled.append({"url": url, "error": error_msg})
+        else:
+            crawled.append(
+                {
+                    "url": url,
+                    "crawled_content": _crawled_content(crawler, article, query),
+                }
+            )
+    return crawled + skipped
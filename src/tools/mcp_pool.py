@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide pool of long-lived MCP server sessions.
+
+Starting a stdio MCP server spawns a subprocess and lists its tools, which
+is far too slow to repeat for every research step. The pool starts each
+server lazily on first use, keeps its session and tool list for reuse,
+pings it before handing it out again and shuts it down once it has been
+idle for a while. Steps lease the tools for as long as they run, so a
+session is never shut down under a step that is still using it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+logger = logging.getLogger(__name__)
+
+
+def mcp_server_key(server_name: str, server_config: dict[str, Any]) -> str:
+    """Return a stable key of an MCP server configuration."""
+    payload = json.dumps([server_name, server_config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _MCPSession:
+    """One running MCP server, owned by its own task."""
+
+    def __init__(self, server_name: str, server_config: dict[str, Any]):
+        self.server_name = server_name
+        self.server_config = server_config
+        self.tools: list[BaseTool] = []
+        self.client: Optional[MultiServerMCPClient] = None
+        self.error: Optional[BaseException] = None
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self.leases = 0  # Steps currently using the tools
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        # The MCP transports are anyio task groups, so the session has to be
+        # entered and exited by the same task.
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            async with MultiServerMCPClient(
+                {self.server_name: self.server_config}
+            ) as client:
+                self.client = client
+                for tool in client.get_tools():
+                    tool.description = (
+                        f"Powered by '{self.server_name}'.\n{tool.description}"
+                    )
+                    self.tools.append(tool)
+                logger.info(
+                    f"MCP server '{self.server_name}' started with {len(self.tools)} tools"
+                )
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            logger.error(f"MCP server '{self.server_name}' failed: {e!r}")
+            self.error = e
+        finally:
+            self.client = None
+            self._ready.set()
+
+    async def wait_ready(self, timeout: float):
+        await asyncio.wait_for(self._ready.wait(), timeout)
+        if self.error is not None:
+            raise self.error
+
+    @property
+    def alive(self) -> bool:
+        return not self._task.done() and self.error is None
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive or self.client is None:
+            return False
+        try:
+            session = self.client.sessions[self.server_name]
+            await asyncio.wait_for(session.send_ping(), timeout)
+            self.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(
+                f"MCP server '{self.server_name}' failed health check: {e!r}"
+            )
+            return False
+
+    async def close(self):
+        self._closing.set()
+        try:
+            await asyncio.wait_for(self._task, 10)
+        except (asyncio.TimeoutError, Exception):
+            # Cancel inside the owning task so the transport unwinds cleanly
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPClientPool:
+    """
+    Pool of MCP sessions keyed by server configuration.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 600,
+        health_check_interval: float = 30,
+        start_timeout: float = 120,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            idle_timeout: Seconds after which an unused session is shut down
+            health_check_interval: Minimum seconds between pings of a session
+            start_timeout: Seconds to wait for a server to start and list its tools
+        """
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.start_timeout = start_timeout
+        self._sessions: dict[str, _MCPSession] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get_tools(
+        self, server_name: str, server_config: dict[str, Any]
+    ) -> list[BaseTool]:
+        """
+        Get the tools of an MCP server, starting it if needed.
+
+        The session may be shut down once it is idle for idle_timeout, use
+        lease() to keep it running while the tools are in use.
+        """
+        session = await self._get_session(server_name, server_config)
+        return session.tools
+
+    @asynccontextmanager
+    async def lease(
+        self, server_name: str, server_config: dict[str, Any]
+    ) -> AsyncIterator[list[BaseTool]]:
+        """Get the tools of an MCP server, keeping its session open until exit."""
+        session = await self._get_session(server_name, server_config, lease=True)
+        try:
+            yield session.tools
+        finally:
+            session.leases -= 1
+            session.last_used = time.monotonic()
+
+    async def _get_session(
+        self, server_name: str, server_config: dict[str, Any], lease: bool = False
+    ) -> _MCPSession:
+        key = mcp_server_key(server_name, server_config)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            session = self._sessions.get(key)
+            if session is not None and not await self._is_healthy(session):
+                await self._discard(key)
+                session = None
+            if session is None:
+                session = _MCPSession(server_name, server_config)
+                self._sessions[key] = session
+            try:
+                await session.wait_ready(self.start_timeout)
+            except BaseException:
+                await self._discard(key)
+                raise
+            session.last_used = time.monotonic()
+            if lease:
+                session.leases += 1
+            return session
+
+    async def _is_healthy(self, session: _MCPSession) -> bool:
+        if not session.alive:
+            return False
+        # A failed ping must not pull a session from under a running step
+        if session.leases:
+            return True
+        if time.monotonic() - session.last_checked < self.health_check_interval:
+            return True
+        return await session.ping(timeout=5)
+
+    async def _discard(self, key: str):
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            await session.close()
+
+    async def close_idle(self) -> int:
+        """Shut down unleased sessions that have not been used within idle_timeout."""
+        now = time.monotonic()
+        idle = [
+            key
+            for key, session in self._sessions.items()
+            if not session.alive
+            or (not session.leases and now - session.last_used > self.idle_timeout)
+        ]
+        for key in idle:
+            logger.info(f"Closing idle MCP server '{self._sessions[key].server_name}'")
+            await self._discard(key)
+        return len(idle)
+
+    async def close(self):
+        """Shut down every session of the pool."""
+        for key in list(self._sessions):
+            await self._discard(key)
+
+    async def run_idle_reaper(self, interval: float = 60):
+        """Close idle sessions periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.close_idle()
+            except Exception as e:
+                logger.error(f"Failed to close idle MCP sessions: {e}", exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "sessions": [
+                {
+                    "server_name": session.server_name,
+                    "alive": session.alive,
+                    "tools": len(session.tools),
+                    "leases": session.leases,
+                    "idle_seconds": now - session.last_used,
+                }
+                for session in self._sessions.values()
+            ]
+        }
+
+
+mcp_client_pool = MCPClientPool()
@@ -15,10 +15,13 @@ from src.tools.tavily_search.tavily_search_results_with_images import (
 )
 
 from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import create_cached_search_tool
 
 logger = logging.getLogger(__name__)
 
-LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages)
+LoggedTavilySearch = create_logged_tool(
+    create_cached_search_tool(TavilySearchResultsWithImages)
+)
 if os.getenv("SEARCH_API", "") == SearchEngine.TAVILY.value:
     tavily_search_tool = LoggedTavilySearch(
         name="web_search",
@@ -30,12 +33,14 @@ if os.getenv("SEARCH_API", "") == SearchEngine.TAVILY.value:
 else:
     tavily_search_tool = None
 
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
+LoggedDuckDuckGoSearch = create_logged_tool(
+    create_cached_search_tool(DuckDuckGoSearchResults)
+)
 duckduckgo_search_tool = LoggedDuckDuckGoSearch(
     name="web_search", max_results=SEARCH_MAX_RESULTS
 )
 
-LoggedBraveSearch = create_logged_tool(BraveSearch)
+LoggedBraveSearch = create_logged_tool(create_cached_search_tool(BraveSearch))
 brave_search_tool = LoggedBraveSearch(
     name="web_search",
     search_wrapper=BraveSearchWrapper(
@@ -44,7 +49,7 @@ brave_search_tool = LoggedBraveSearch(
     ),
 )
 
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
+LoggedArxivSearch = create_logged_tool(create_cached_search_tool(ArxivQueryRun))
 arxiv_search_tool = LoggedArxivSearch(
     name="web_search",
     api_wrapper=ArxivAPIWrapper(
@@ -0,0 +1,227 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Result cache for the web search tools.
+
+Configured by the `SEARCH_CACHE` section of conf.yaml:
+
+    SEARCH_CACHE:
+      enabled: true
+      path: .cache/search_cache.db
+      max_entries: 1024
+      ttl_seconds: 3600
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Any, Optional, Type, TypeVar
+
+from src.config import load_conf_section
+from src.utils.cache import TwoTierCache
+from src.utils.rate_limiter import get_rate_limit_scheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tool and wrapper fields that change the results of a search
+_TOOL_PARAMS = (
+    "max_results",
+    "search_depth",
+    "include_domains",
+    "exclude_domains",
+    "include_answer",
+    "include_raw_content",
+    "include_images",
+    "include_image_descriptions",
+    "output_format",
+    "backend",
+    "source",
+)
+# Rate limited upstreams of the search tools that don't use the shared HTTP
+# client, Tavily is rate limited by its API wrapper.
+_RATE_LIMIT_UPSTREAMS = {
+    "DuckDuckGoSearchResults": "duckduckgo",
+    "BraveSearch": "brave_search",
+    "ArxivQueryRun": "arxiv",
+}
+_WRAPPER_PARAMS = (
+    "search_kwargs",
+    "top_k_results",
+    "load_max_docs",
+    "load_all_available_meta",
+    "doc_content_chars_max",
+)
+
+
+# Set while _arun searches, so the _run that BaseTool._arun calls in an
+# executor doesn't look the cache up and wait for the rate limit again
+_searching: ContextVar[bool] = ContextVar("search_cache_searching", default=False)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different spellings share one key."""
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+@dataclass(kw_only=True)
+class SearchCacheSettings:
+    """The search cache fields of conf.yaml."""
+
+    enabled: bool = True
+    path: Optional[str] = ".cache/search_cache.db"  # Disk tier, memory only if empty
+    max_entries: int = 1024  # Results kept in memory
+    ttl_seconds: int = 3600  # Time to live of a search result
+
+    @classmethod
+    def from_conf(cls) -> "SearchCacheSettings":
+        """Create a SearchCacheSettings instance from conf.yaml."""
+        conf = load_conf_section("SEARCH_CACHE")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if f.name in conf and conf[f.name] is not None
+            }
+        )
+
+
+_search_cache: Optional[TwoTierCache] = None
+_search_cache_enabled: bool = True
+
+
+def get_search_cache() -> Optional[TwoTierCache]:
+    """Get the process-wide search cache, None if it is disabled."""
+    global _search_cache, _search_cache_enabled
+    if _search_cache is None and _search_cache_enabled:
+        settings = SearchCacheSettings.from_conf()
+        _search_cache_enabled = settings.enabled
+        if settings.enabled:
+            _search_cache = TwoTierCache(
+                max_entries=settings.max_entries,
+                ttl_seconds=settings.ttl_seconds,
+                path=settings.path or None,
+            )
+    return _search_cache
+
+
+class CachedSearchToolMixin:
+    """A mixin class that serves repeated searches from the search cache."""
+
+    def _search_engine(self) -> str:
+        return self.__class__.__name__.replace("Logged", "").replace("Cached", "")
+
+    def _search_params(self) -> dict[str, Any]:
+        params = {
+            name: getattr(self, name) for name in _TOOL_PARAMS if hasattr(self, name)
+        }
+        for wrapper_name in ("api_wrapper", "search_wrapper"):
+            wrapper = getattr(self, wrapper_name, None)
+            for name in _WRAPPER_PARAMS:
+                if wrapper is not None and hasattr(wrapper, name):
+                    params[f"{wrapper_name}.{name}"] = getattr(wrapper, name)
+        return params
+
+    def _cache_key(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        query = args[0] if args else kwargs.get("query")
+        if not isinstance(query, str):
+            return None
+        payload = json.dumps(
+            {
+                "engine": self._search_engine(),
+                "query": normalize_query(query),
+                "params": self._search_params(),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _restore(self, cached: Any) -> Any:
+        # JSON turns the (content, artifact) tuple into a list
+        if getattr(self, "response_format", "content") == "content_and_artifact":
+            return tuple(cached)
+        return cached
+
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        # Failed searches come back as a repr string (with an empty artifact)
+        if isinstance(result, tuple):
+            return bool(result) and not isinstance(result[0], str)
+        return bool(result)
+
+    def _lookup(self, *args: Any, **kwargs: Any) -> tuple[Optional[str], Any]:
+        cache = get_search_cache()
+        if cache is None:
+            return None, None
+        key = self._cache_key(*args, **kwargs)
+        if key is None:
+            return None, None
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {self._search_engine()}: {args}")
+        return key, cached
+
+    def _store(self, key: Optional[str], result: Any):
+        cache = get_search_cache()
+        if key is None or cache is None or not self._is_cacheable(result):
+            return
+        try:
+            cache.set(key, result)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Search result is not cacheable: {e}")
+
+    def _upstream(self) -> Optional[str]:
+        return _RATE_LIMIT_UPSTREAMS.get(self._search_engine())
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _run method to serve cached results."""
+        if _searching.get():
+            return super()._run(*args, **kwargs)
+        key, cached = self._lookup(*args, **kwargs)
+        if cached is not None:
+            return self._restore(cached)
+        get_rate_limit_scheduler().acquire(self._upstream())
+        result = super()._run(*args, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _arun method to serve cached results."""
+        # The disk tier of the cache is sqlite, keep it off the event loop
+        key, cached = await asyncio.to_thread(self._lookup, *args, **kwargs)
+        if cached is not None:
+            return self._restore(cached)
+        await get_rate_limit_scheduler().acquire_async(self._upstream())
+        token = _searching.set(True)
+        try:
+            result = await super()._arun(*args, **kwargs)
+        finally:
+            _searching.reset(token)
+        await asyncio.to_thread(self._store, key, result)
+        return result
+
+
+def create_cached_search_tool(base_tool_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a cached version of a search tool class.
+
+    Args:
+        base_tool_class: The original search tool class
+
+    Returns:
+        A new class that inherits from both CachedSearchToolMixin and the base tool class
+    """
+
+    class CachedTool(CachedSearchToolMixin, base_tool_class):
+        pass
+
+    CachedTool.__name__ = f"Cached{base_tool_class.__name__}"
+    return CachedTool
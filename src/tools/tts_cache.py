@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Disk cache of synthesized speech keyed by a hash of the text and voice settings.
+
+Cached audio is stored as plain files, so the server can send it with
+`FileResponse` without loading it into memory. A response only opens the
+file after get_path returned, so eviction leaves alone the files used or
+stored in the last eviction_grace_seconds, letting the cache go over
+max_bytes until they age. Configured by the `TTS_CACHE` section of
+conf.yaml:
+
+    TTS_CACHE:
+      enabled: true
+      path: .cache/tts
+      max_bytes: 536870912
+      eviction_grace_seconds: 60
+
+The index is built from the directory at startup and then kept per
+process. Server workers sharing a path each bound the files they stored or
+used themselves, so the directory can grow up to workers * max_bytes.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+from src.config import load_conf_section
+
+from .tts import VolcengineTTS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class TTSCacheSettings:
+    """The TTS cache fields of conf.yaml."""
+
+    enabled: bool = True
+    path: str = ".cache/tts"  # Directory of the cached audio files
+    max_bytes: int = 512 * 1024 * 1024  # Total size of the cached audio
+    eviction_grace_seconds: float = 60.0  # Recently used files aren't evicted
+
+    @classmethod
+    def from_conf(cls) -> "TTSCacheSettings":
+        """Create a TTSCacheSettings instance from conf.yaml."""
+        conf = load_conf_section("TTS_CACHE")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+def tts_cache_key(text: str, **params: Any) -> str:
+    """
+    Return the cache key of text synthesized with params.
+
+    params must hold every setting that changes the audio, e.g. cluster,
+    voice_type, encoding and the speed/volume/pitch ratios.
+    """
+    payload = json.dumps(
+        {"text": text, **params}, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Defaults of the text_to_speech options, so omitted and explicit ones match
+_TTS_DEFAULTS = {
+    name: parameter.default
+    for name, parameter in inspect.signature(
+        VolcengineTTS.text_to_speech
+    ).parameters.items()
+    if parameter.default is not inspect.Parameter.empty and name != "uid"
+}
+
+
+def synthesis_cache_key(tts_client: VolcengineTTS, text: str, **options: Any) -> str:
+    """Return the cache key of tts_client.text_to_speech(text, **options)."""
+    params = {**_TTS_DEFAULTS, **options}
+    params["voice_type"] = params["voice_type"] or tts_client.voice_type
+    return tts_cache_key(text, cluster=tts_client.cluster, **params)
+
+
+class TTSAudioCache:
+    """
+    Size-bounded directory of audio files, evicting the least recently used.
+    """
+
+    def __init__(self, settings: Optional[TTSCacheSettings] = None):
+        self.settings = settings or TTSCacheSettings.from_conf()
+        self._lock = threading.Lock()
+        # File name -> (size, last use time), least recently used first
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._total_bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if self.settings.enabled:
+            os.makedirs(self.settings.path, exist_ok=True)
+            self._load_index()
+
+    def _load_index(self):
+        files = []
+        for entry in os.scandir(self.settings.path):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for mtime, name, size in sorted(files):
+            self._entries[name] = (size, mtime)
+            self._total_bytes += size
+
+    @staticmethod
+    def _file_name(key: str, encoding: str) -> str:
+        return f"{key}.{encoding}"
+
+    def get_path(self, key: str, encoding: str) -> Optional[str]:
+        """Return the path of the cached audio, or None."""
+        if not self.settings.enabled:
+            return None
+        name = self._file_name(key, encoding)
+        path = os.path.join(self.settings.path, name)
+        with self._lock:
+            if name in self._entries:
+                try:
+                    # The modification time keeps the recency across restarts
+                    os.utime(path)
+                except OSError:
+                    # Removed behind our back, e.g. by another process
+                    self._total_bytes -= self._entries.pop(name)[0]
+                else:
+                    self._entries[name] = (self._entries[name][0], time.time())
+                    self._entries.move_to_end(name)
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+
+    def get(self, key: str, encoding: str) -> Optional[bytes]:
+        """Return the cached audio, or None."""
+        path = self.get_path(key, encoding)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key: str, encoding: str, audio: bytes) -> Optional[str]:
+        """Store audio, returning its path or None if the cache is disabled."""
+        if not self.settings.enabled or len(audio) > self.settings.max_bytes:
+            return None
+        name = self._file_name(key, encoding)
+        path = os.path.join(self.settings.path, name)
+        # Write then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.settings.path, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        now = time.time()
+        with self._lock:
+            self._total_bytes += len(audio) - self._entries.pop(name, (0, 0))[0]
+            self._entries[name] = (len(audio), now)
+            self.stores += 1
+            while self._total_bytes > self.settings.max_bytes:
+                evicted, (size, last_used) = next(iter(self._entries.items()))
+                if now - last_used < self.settings.eviction_grace_seconds:
+                    # Everything left may still be sent by a response
+                    break
+                del self._entries[evicted]
+                self._total_bytes -= size
+                self.evictions += 1
+                try:
+                    os.remove(os.path.join(self.settings.path, evicted))
+                except OSError:
+                    pass
+        return path
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.settings.enabled,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_tts_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """Get the process-wide TTS audio cache."""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache()
+    return _tts_cache
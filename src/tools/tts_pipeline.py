@@ -0,0 +1,216 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Concurrent speech synthesis of many text segments, delivered in order.
+
+Shared by /api/tts for long texts and by the podcast for its script lines.
+Configured by the `TTS` section of conf.yaml:
+
+    TTS:
+      max_concurrency: 4
+      requests_per_second: 5
+      retries: 2
+      backoff_seconds: 1
+      max_segment_bytes: 1000
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import re
+import struct
+import wave
+from dataclasses import dataclass, fields
+from typing import Any, AsyncIterator, Optional
+
+from src.config import load_conf_section
+from src.utils.rate_limiter import AsyncRateLimiter
+
+from .tts import VolcengineTTS
+from .tts_cache import get_tts_cache, synthesis_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends, CJK punctuation ends a sentence even without a space after it
+_SENTENCE_END = re.compile(r"(?<=[。！？；…\n])|(?<=[.!?;])(?=\s)")
+# Clause ends, used to split sentences that are too long on their own
+_CLAUSE_END = re.compile(r"(?<=[，、：,:])")
+
+
+@dataclass(kw_only=True)
+class TTSSettings:
+    """The TTS pipeline fields of conf.yaml."""
+
+    max_concurrency: int = 4  # Segments synthesized at the same time per request
+    requests_per_second: float = 5.0  # Provider quota, 0 disables the limit
+    retries: int = 2  # Retries of a segment that failed to synthesize
+    backoff_seconds: float = 1.0  # Backoff is backoff_seconds * 2 ** attempt
+    max_segment_bytes: int = 1000  # UTF-8 size limit of one provider request
+
+    @classmethod
+    def from_conf(cls) -> "TTSSettings":
+        """Create a TTSSettings instance from conf.yaml."""
+        conf = load_conf_section("TTS")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+def _byte_size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _hard_split(text: str, max_bytes: int) -> list[str]:
+    parts, current = [], ""
+    for char in text:
+        if current and _byte_size(current + char) > max_bytes:
+            parts.append(current)
+            current = ""
+        current += char
+    return parts + [current] if current else parts
+
+
+def _pack(pieces: list[str], max_bytes: int) -> list[str]:
+    segments, current = [], ""
+    for piece in pieces:
+        if current and _byte_size(current + piece) > max_bytes:
+            segments.append(current)
+            current = ""
+        current += piece
+    return segments + [current] if current else segments
+
+
+def split_text(text: str, max_bytes: int = 1000) -> list[str]:
+    """
+    Split text into segments of at most max_bytes UTF-8 bytes.
+
+    Segments end at sentence boundaries whenever possible, falling back to
+    clause boundaries and finally to a hard split for very long sentences.
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        if _byte_size(sentence) <= max_bytes:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_END.split(sentence):
+            pieces.extend(_hard_split(clause, max_bytes))
+    return [segment.strip() for segment in _pack(pieces, max_bytes) if segment.strip()]
+
+
+_rate_limiter: Optional[AsyncRateLimiter] = None
+
+
+def get_tts_rate_limiter(settings: Optional[TTSSettings] = None) -> AsyncRateLimiter:
+    """Get the process-wide rate limiter of the TTS provider."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = settings or TTSSettings.from_conf()
+        _rate_limiter = AsyncRateLimiter(settings.requests_per_second)
+    return _rate_limiter
+
+
+async def synthesize_segment(
+    tts_client: VolcengineTTS,
+    text: str,
+    options: dict[str, Any],
+    settings: Optional[TTSSettings] = None,
+) -> Optional[bytes]:
+    """
+    Synthesize one segment, served from the TTS cache when possible.
+
+    Returns:
+        The audio, None if the segment still failed after all retries
+    """
+    settings = settings or TTSSettings.from_conf()
+    encoding = options.get("encoding", "mp3")
+    cache = get_tts_cache()
+    key = synthesis_cache_key(tts_client, text, **options)
+    audio = await asyncio.to_thread(cache.get, key, encoding)
+    if audio is not None:
+        return audio
+    rate_limiter = get_tts_rate_limiter(settings)
+    for attempt in range(settings.retries + 1):
+        await rate_limiter.acquire()
+        result = await tts_client.text_to_speech_async(text, **options)
+        if result["success"]:
+            audio = base64.b64decode(result["audio_data"])
+            await asyncio.to_thread(cache.set, key, encoding, audio)
+            return audio
+        logger.warning(
+            f"TTS failed (attempt {attempt + 1}/{settings.retries + 1}): {result['error']}"
+        )
+        if attempt < settings.retries:
+            await asyncio.sleep(settings.backoff_seconds * 2**attempt)
+    return None
+
+
+async def synthesize_segments(
+    tts_client: VolcengineTTS,
+    segments: list[tuple[str, dict[str, Any]]],
+    settings: Optional[TTSSettings] = None,
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """
+    Synthesize (text, options) segments concurrently, yielding (index, audio)
+    in segment order.
+
+    A segment is yielded as soon as it and every segment before it are done,
+    the audio is None if the segment still failed after all retries.
+    """
+    settings = settings or TTSSettings.from_conf()
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    async def synthesize(text: str, options: dict[str, Any]) -> Optional[bytes]:
+        async with semaphore:
+            return await synthesize_segment(tts_client, text, options, settings)
+
+    # Segments queue for the semaphore in order, so early ones finish first
+    tasks = [
+        asyncio.create_task(synthesize(text, options)) for text, options in segments
+    ]
+    try:
+        for index, task in enumerate(tasks):
+            yield index, await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def stream_part(audio: bytes, encoding: str, first: bool) -> bytes:
+    """
+    Turn the audio of one segment into a part of a concatenated stream.
+
+    MP3, PCM and Ogg segments can be concatenated as is. WAV segments keep
+    only their samples, and the first one gets a header of unknown length.
+    """
+    if encoding != "wav":
+        return audio
+    with wave.open(io.BytesIO(audio)) as wav:
+        channels, width, rate = (
+            wav.getnchannels(),
+            wav.getsampwidth(),
+            wav.getframerate(),
+        )
+        frames = wav.readframes(wav.getnframes())
+    if not first:
+        return frames
+    header = (
+        b"RIFF\xff\xff\xff\xffWAVEfmt "
+        + struct.pack(
+            "<IHHIIHH",
+            16,
+            1,
+            channels,
+            rate,
+            rate * channels * width,
+            channels * width,
+            width * 8,
+        )
+        + b"data\xff\xff\xff\xff"
+    )
+    return header + frames
@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Shared HTTP client for outbound calls (crawler, search and TTS).
+
+All callers share keep-alive connection pools instead of paying a TCP/TLS
+handshake per request. The pools are configured by the `HTTP_CLIENT`
+section of conf.yaml:
+
+    HTTP_CLIENT:
+      timeout: 30
+      connect_timeout: 10
+      max_connections: 100
+      max_keepalive_connections: 20
+      max_connections_per_host: 10
+      retries: 2
+      backoff_factor: 0.5
+      http2: true
+
+Transient failures are retried with backoff, for POST requests only when
+the caller passes retry=True because replaying them is safe.
+
+Requests can name the upstream API and the domain they count against, to
+be queued under their quota by the rate limit scheduler.
+"""
+
+import asyncio
+import email.utils
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config import load_conf_section
+
+from .rate_limiter import get_rate_limit_scheduler
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Methods replayed by default, others only when the caller passes retry=True
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+
+
+@dataclass(kw_only=True)
+class HttpClientSettings:
+    """The HTTP client fields of conf.yaml."""
+
+    timeout: float = 30.0  # Read/write/pool timeout in seconds
+    connect_timeout: float = 10.0  # Connect timeout in seconds
+    max_connections: int = 100  # Maximum open connections across all hosts
+    max_keepalive_connections: int = 20  # Idle connections kept for reuse
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    max_connections_per_host: int = 10  # Maximum concurrent requests per host
+    retries: int = 2  # Retries on transport errors and retryable status codes
+    backoff_factor: float = 0.5  # Backoff is backoff_factor * 2 ** attempt seconds
+    max_backoff: float = 10.0  # Upper bound for a single backoff
+    http2: bool = True  # Use HTTP/2 when the h2 package is installed
+
+    @classmethod
+    def from_conf(cls) -> "HttpClientSettings":
+        """Create a HttpClientSettings instance from conf.yaml."""
+        conf = load_conf_section("HTTP_CLIENT")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+class _AsyncPool:
+    """Async client and per-host semaphores bound to one event loop."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+class HttpClient:
+    """
+    Pooled sync and async HTTP client with per-host limits and retries.
+    """
+
+    def __init__(self, settings: Optional[HttpClientSettings] = None):
+        self.settings = settings or HttpClientSettings.from_conf()
+        self.http2 = self.settings.http2 and importlib.util.find_spec("h2") is not None
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        # httpx.AsyncClient can't be shared across event loops
+        self._async_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        settings = self.settings
+        return {
+            "timeout": httpx.Timeout(
+                settings.timeout, connect=settings.connect_timeout
+            ),
+            "limits": httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            "http2": self.http2,
+            "follow_redirects": True,
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared synchronous client."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_kwargs())
+        return self._client
+
+    def _async_pool(self) -> _AsyncPool:
+        loop = asyncio.get_running_loop()
+        pool = self._async_pools.get(loop)
+        if pool is None:
+            pool = _AsyncPool(httpx.AsyncClient(**self._client_kwargs()))
+            self._async_pools[loop] = pool
+        return pool
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The shared asynchronous client of the running event loop."""
+        return self._async_pool().client
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._client_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(
+                    self.settings.max_connections_per_host
+                )
+            return self._host_semaphores[host]
+
+    @staticmethod
+    def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+        if response is None or not (retry_after := response.headers.get("Retry-After")):
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, date.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.settings.max_backoff)
+        return min(self.settings.backoff_factor * 2**attempt, self.settings.max_backoff)
+
+    def _retries(self, method: str, retry: Optional[bool]) -> int:
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        return self.settings.retries if retry else 0
+
+    def _throttled(
+        self,
+        response: httpx.Response,
+        upstream: Optional[str],
+        domain: Optional[str],
+    ):
+        # A throttled quota holds back every request to it, not only this one
+        if response.status_code not in (429, 503):
+            return
+        retry_after = self._retry_after(response)
+        if retry_after is None and response.status_code == 503:
+            return
+        get_rate_limit_scheduler().defer(
+            retry_after if retry_after is not None else self.settings.backoff_factor,
+            upstream=upstream,
+            domain=None if upstream else domain,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        upstream: Optional[str] = None,
+        domain: Optional[str] = None,
+        retry: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request with the shared client, retrying transient failures.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            upstream: Rate limited upstream API the request counts against
+            domain: Rate limited domain the request is about, e.g. of a crawl
+            retry: Whether failures may be retried, by default only for
+                idempotent methods, as a replayed POST may run (and bill) twice
+            **kwargs: Passed through to `httpx.Client.request`
+
+        Returns:
+            The final response, callers are responsible for checking its status
+
+        Raises:
+            httpx.TransportError: If the request still fails after all retries
+        """
+        scheduler = get_rate_limit_scheduler()
+        retries = self._retries(method, retry)
+        for attempt in range(retries + 1):
+            response = None
+            try:
+                scheduler.acquire(upstream, domain)
+                with self._host_semaphore(url):
+                    response = self.client.request(method, url, **kwargs)
+                self._throttled(response, upstream, domain)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"{method} {url} failed: {e!r}, retrying")
+            delay = self._backoff(attempt, response)
+            logger.debug(f"Retrying {method} {url} in {delay:.1f}s")
+            time.sleep(delay)
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        upstream: Optional[str] = None,
+        domain: Optional[str] = None,
+        retry: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Asynchronous version of `request`."""
+        scheduler = get_rate_limit_scheduler()
+        pool = self._async_pool()
+        host = urlsplit(url).netloc
+        if host not in pool.host_semaphores:
+            pool.host_semaphores[host] = asyncio.Semaphore(
+                self.settings.max_connections_per_host
+            )
+        semaphore = pool.host_semaphores[host]
+        retries = self._retries(method, retry)
+        for attempt in range(retries + 1):
+            response = None
+            try:
+                await scheduler.acquire_async(upstream, domain)
+                async with semaphore:
+                    response = await pool.client.request(method, url, **kwargs)
+                self._throttled(response, upstream, domain)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"{method} {url} failed: {e!r}, retrying")
+            delay = self._backoff(attempt, response)
+            logger.debug(f"Retrying {method} {url} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def close(self):
+        """Close the synchronous client."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self):
+        """Close the asynchronous client of the running event loop."""
+        pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.client.aclose()
+
+
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide shared HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
@@ -0,0 +1,285 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token bucket rate limiters.
+
+AsyncRateLimiter throttles asyncio callers of one quota. RateLimitScheduler
+keeps one bucket per upstream API and per crawled domain, shared by sync and
+async callers, and is configured by the `RATE_LIMITS` section of conf.yaml:
+
+    RATE_LIMITS:
+      enabled: true
+      upstreams:
+        jina: {rate: 3, burst: 10}
+        jina_anonymous: {rate: 0.33, burst: 2}
+      domain_rate: 1
+      domain_burst: 3
+      domains:
+        sec.gov: {rate: 10, burst: 10}
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional
+
+from src.config import load_conf_section
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing `rate` acquisitions per second with bursts of up
+    to `burst` acquisitions. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Acquisitions per second, 0 or less disables the limit
+            burst: Bucket size, defaults to max(1, rate)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            self.acquired += 1
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
+            self.acquired += 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+# Requests per second and burst of the upstream APIs
+_DEFAULT_UPSTREAMS = {
+    "jina": {"rate": 3.0, "burst": 10},  # 200 requests per minute with a key
+    "jina_anonymous": {"rate": 0.33, "burst": 2},  # 20 requests per minute
+    "tavily": {"rate": 1.5, "burst": 5},
+    "duckduckgo": {"rate": 1.0, "burst": 2},
+    "brave_search": {"rate": 1.0, "burst": 1},
+    "arxiv": {"rate": 0.33, "burst": 1},
+}
+
+
+@dataclass(kw_only=True)
+class RateLimitSettings:
+    """The rate limit fields of conf.yaml."""
+
+    enabled: bool = True
+    # Upstream name -> {rate, burst}, upstreams without an entry are unlimited
+    upstreams: dict = field(default_factory=lambda: dict(_DEFAULT_UPSTREAMS))
+    domain_rate: float = 1.0  # Requests per second to one crawled domain
+    domain_burst: int = 3
+    domains: dict = field(default_factory=dict)  # Per-domain overrides
+
+    @classmethod
+    def from_conf(cls) -> "RateLimitSettings":
+        """Create a RateLimitSettings instance from conf.yaml."""
+        conf = load_conf_section("RATE_LIMITS")
+        return cls(
+            **{
+                f.name: conf[f.name]
+                for f in fields(cls)
+                if conf.get(f.name) is not None
+            }
+        )
+
+
+class TokenBucket:
+    """
+    Token bucket shared by threads and event loops.
+
+    Callers reserve a slot and then wait for it outside of the lock, so
+    requests are scheduled in arrival order without holding anyone up.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self._interval = 1 / rate if rate > 0 else 0.0
+        # Time at which the bucket is empty again, see GCRA
+        self._empty_at = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.deferred = 0
+
+    def reserve(self) -> float:
+        """Take a token, returning the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            arrival = max(now, self._blocked_until)
+            if self._interval:
+                empty_at = max(self._empty_at, arrival)
+                start = max(arrival, empty_at - (self.burst - 1) * self._interval)
+                self._empty_at = empty_at + self._interval
+            else:
+                start = arrival
+            delay = start - now
+            self.acquired += 1
+            self.waited_seconds += delay
+            self.max_wait_seconds = max(self.max_wait_seconds, delay)
+            return delay
+
+    def defer(self, seconds: float):
+        """Hold every request back for seconds, e.g. after a Retry-After."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self.deferred += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "waited_seconds": self.waited_seconds,
+            "avg_wait_seconds": (
+                self.waited_seconds / self.acquired if self.acquired else 0.0
+            ),
+            "max_wait_seconds": self.max_wait_seconds,
+            "deferred": self.deferred,
+        }
+
+
+class RateLimitScheduler:
+    """
+    Token buckets per upstream API and per crawled domain.
+    """
+
+    def __init__(self, settings: Optional[RateLimitSettings] = None):
+        self.settings = settings or RateLimitSettings.from_conf()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _domain_rule(self, domain: str) -> dict:
+        # The most specific domain rule wins
+        best_match, rule = "", None
+        for name, domain_rule in self.settings.domains.items():
+            name = name.lower().lstrip(".")
+            if (domain == name or domain.endswith("." + name)) and len(name) > len(
+                best_match
+            ):
+                best_match, rule = name, domain_rule
+        if rule is None:
+            return {
+                "rate": self.settings.domain_rate,
+                "burst": self.settings.domain_burst,
+            }
+        return rule
+
+    def _bucket(self, key: str, rule: dict) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(
+                    float(rule.get("rate", 0)), int(rule.get("burst", 1))
+                )
+            return self._buckets[key]
+
+    def buckets(
+        self, upstream: Optional[str] = None, domain: Optional[str] = None
+    ) -> list[TokenBucket]:
+        """Return the buckets a request to upstream about domain goes through."""
+        if not self.settings.enabled:
+            return []
+        buckets = []
+        if upstream and upstream in self.settings.upstreams:
+            buckets.append(
+                self._bucket(f"upstream:{upstream}", self.settings.upstreams[upstream])
+            )
+        if domain:
+            domain = domain.lower()
+            buckets.append(self._bucket(f"domain:{domain}", self._domain_rule(domain)))
+        return buckets
+
+    def _reserve(self, upstream: Optional[str], domain: Optional[str]) -> float:
+        # Every bucket is reserved at once, the request waits for the slowest
+        delays = [bucket.reserve() for bucket in self.buckets(upstream, domain)]
+        delay = max(delays, default=0.0)
+        if delay > 0:
+            logger.debug(
+                f"Rate limited {upstream or ''} {domain or ''} for {delay:.2f}s"
+            )
+        return delay
+
+    def acquire(self, upstream: Optional[str] = None, domain: Optional[str] = None):
+        """Block until a request to upstream about domain may be sent."""
+        delay = self._reserve(upstream, domain)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(
+        self, upstream: Optional[str] = None, domain: Optional[str] = None
+    ):
+        """Asynchronous version of `acquire`."""
+        delay = self._reserve(upstream, domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def defer(
+        self,
+        seconds: float,
+        upstream: Optional[str] = None,
+        domain: Optional[str] = None,
+    ):
+        """Hold back every request to upstream about domain for seconds."""
+        logger.warning(
+            f"Throttled by {upstream or domain}, holding requests for {seconds:.1f}s"
+        )
+        for bucket in self.buckets(upstream, domain):
+            bucket.defer(seconds)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            "enabled": self.settings.enabled,
+            "buckets": {key: bucket.stats() for key, bucket in buckets.items()},
+        }
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+
+
+def get_rate_limit_scheduler() -> RateLimitScheduler:
+    """Get the process-wide rate limit scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RateLimitScheduler()
+    return _scheduler
@@ -4,6 +4,7 @@
 import asyncio
 import logging
 from src.graph import build_graph
+from src.tools.mcp_pool import mcp_client_pool
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +30,7 @@ async def run_agent_workflow_async(
     max_plan_iterations: int = 1,
     max_step_num: int = 3,
     enable_background_investigation: bool = True,
+    max_parallel_steps: int = 1,
 ):
     """Run the agent workflow asynchronously with the given user input.
 
@@ -38,6 +40,7 @@ async def run_agent_workflow_async(
         max_plan_iterations: Maximum number of plan iterations
         max_step_num: Maximum number of steps in a plan
         enable_background_investigation: If True, performs web search before planning to enhance context
+        max_parallel_steps: Maximum number of research steps executed concurrently
 
     Returns:
         The final state after the workflow completes
@@ -60,6 +63,7 @@ async def run_agent_workflow_async(
             "thread_id": "default",
             "max_plan_iterations": max_plan_iterations,
             "max_step_num": max_step_num,
+            "max_parallel_steps": max_parallel_steps,
             "mcp_settings": {
                 "servers": {
                     "mcp-github-trending": {
@@ -95,6 +99,8 @@ async def run_agent_workflow_async(
             logger.error(f"Error processing stream output: {e}")
             print(f"Error processing output: {str(e)}")
 
+    # shut down the MCP servers started for this run
+    await mcp_client_pool.close()
     logger.info("Async workflow completed successfully")
 
 
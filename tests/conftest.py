@@ -0,0 +1,7 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+
+# The default search engine, tavily, needs an API key for src.tools to import
+os.environ.setdefault("SEARCH_API", "duckduckgo")
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.crawler.chunk_selector import select_chunks, split_chunks, tokenize
+
+FILLER = "The weather was mild and the markets were quiet for most of the week. "
+
+
+def paragraphs(*texts: str) -> str:
+    return "\n\n".join(texts)
+
+
+def test_tokenize_splits_cjk_into_bigrams():
+    assert tokenize("Revenue 150.6 营业收入") == [
+        "revenue",
+        "150.6",
+        "营业",
+        "业收",
+        "收入",
+    ]
+    assert tokenize("茅") == ["茅"]
+
+
+def test_split_table_keeps_header_row():
+    header = "| Year | Revenue |\n| --- | --- |"
+    rows = [f"| {2000 + i} | {i * 10.5} |" for i in range(40)]
+    table = "\n".join([header, *rows])
+
+    chunks = split_chunks(table, max_chars=200)
+
+    assert len(chunks) > 1
+    for _, chunk in chunks:
+        assert chunk.startswith(header + "\n")
+        assert len(chunk) <= 200
+    body_rows = [row for _, chunk in chunks for row in chunk.splitlines()[2:]]
+    assert body_rows == rows
+
+
+def test_split_tracks_the_section_heading():
+    markdown = paragraphs("# Intro", "Hello.", "## Results", "Revenue grew.")
+    assert split_chunks(markdown) == [
+        ("Intro", "# Intro\n\nHello."),
+        ("Results", "## Results\n\nRevenue grew."),
+    ]
+
+
+def test_selects_the_chunk_matching_a_cjk_query():
+    markdown = paragraphs(
+        *[FILLER * 3] * 4,
+        "贵州茅台2023年营业收入1505.6亿元，同比增长18.04%。",
+        *[FILLER * 3] * 4,
+    )
+
+    content = select_chunks(markdown, "茅台营业收入", budget=300)
+
+    assert "营业收入1505.6亿元" in content
+    # The rest of the budget goes to the top of the page
+    assert content.startswith("The weather")
+    assert content.endswith("\n\n...")
+    assert len(content) <= 300
+
+
+def test_without_query_cuts_the_page_from_the_top():
+    blocks = [(f"Paragraph {i}. " + FILLER * 2).strip() for i in range(10)]
+    markdown = paragraphs(*blocks)
+
+    content = select_chunks(markdown, None, budget=600)
+
+    assert content.startswith("Paragraph 0.")
+    assert content.endswith("\n\n...")
+    kept = content.removesuffix("\n\n...")
+    assert markdown.startswith(kept)
+    assert len(content) <= 600
+
+
+def test_unmatched_query_falls_back_to_the_top():
+    markdown = paragraphs(*[f"Paragraph {i}. " + FILLER * 2 for i in range(10)])
+    assert select_chunks(markdown, "xylophone", budget=600) == select_chunks(
+        markdown, None, budget=600
+    )
+
+
+def test_short_page_is_returned_whole():
+    assert select_chunks("Just a line.", "query", budget=100) == "Just a line."
+
+
+@pytest.mark.parametrize("budget", [250, 400, 700, 1000])
+def test_budget_is_respected(budget):
+    markdown = paragraphs(
+        *[
+            f"Section {i} mentions revenue {i} times. " + FILLER * (i % 3 + 1)
+            for i in range(20)
+        ]
+    )
+    content = select_chunks(markdown, "revenue section", budget=budget)
+    assert 0 < len(content) <= budget
+
+
+def test_budget_smaller_than_a_chunk_cuts_the_best_chunk():
+    markdown = paragraphs(FILLER * 5, "Net profit rose to 74.7 billion yuan. " * 5)
+
+    content = select_chunks(markdown, "net profit", budget=50, max_chunk_chars=500)
+
+    assert len(content) == 50
+    assert content.startswith("Net profit rose")
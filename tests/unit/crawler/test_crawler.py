@@ -0,0 +1,69 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from collections import Counter
+
+from src.crawler import crawler as crawler_module
+from src.crawler.crawler import Crawler, CrawlerSettings
+
+
+class CountingCrawler(Crawler):
+    """Records how many pages are crawled at the same time."""
+
+    def __init__(self, settings, state):
+        super().__init__(cache=object(), settings=settings)
+        self.state = state
+
+    async def acrawl(self, url, max_chars=None):
+        domain = url.split("/")[2]
+        self.state["running"][domain] += 1
+        self.state["total"] += 1
+        self.state["peak_total"] = max(self.state["peak_total"], self.state["total"])
+        self.state["peak"][domain] = max(
+            self.state["peak"][domain], self.state["running"][domain]
+        )
+        await asyncio.sleep(0.01)
+        self.state["running"][domain] -= 1
+        self.state["total"] -= 1
+        return url
+
+
+def new_state():
+    return {"running": Counter(), "peak": Counter(), "total": 0, "peak_total": 0}
+
+
+async def collect(crawler, urls):
+    return [result async for result in crawler.crawl_many(urls)]
+
+
+def test_limits_are_shared_across_batches():
+    settings = CrawlerSettings(max_concurrency=3, max_concurrency_per_domain=1)
+    state = new_state()
+
+    async def run():
+        batches = [
+            [f"https://{domain}/{batch}" for domain in ("a", "b", "c", "d")]
+            for batch in range(3)
+        ]
+        results = await asyncio.gather(
+            *(collect(CountingCrawler(settings, state), urls) for urls in batches)
+        )
+        assert [len(result) for result in results] == [4, 4, 4]
+        # The per-domain semaphores are dropped once their crawls are done
+        assert crawler_module._get_crawl_limits(settings)._domains == {}
+
+    asyncio.run(run())
+    assert state["peak_total"] == 3
+    assert max(state["peak"].values()) == 1
+
+
+def test_each_event_loop_gets_its_own_limits():
+    settings = CrawlerSettings(max_concurrency=2, max_concurrency_per_domain=2)
+
+    for _ in range(2):
+        state = new_state()
+        urls = [f"https://a/{i}" for i in range(4)]
+        results = asyncio.run(collect(CountingCrawler(settings, state), urls))
+        assert sorted(url for url, _ in results) == urls
+        assert state["peak_total"] == 2
@@ -0,0 +1,160 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.crawler import direct_client
+from src.crawler.direct_client import (
+    BlockedAddressError,
+    DirectClient,
+    UnsupportedContentError,
+)
+
+GB2312_PAGE = (
+    '<html><head><meta http-equiv="Content-Type" content="text/html; '
+    'charset=gb2312"><title>贵州茅台</title></head>'
+    "<body><p>营业收入同比增长</p></body></html>"
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the pages the tests fetch."""
+
+    def do_GET(self):
+        if self.path == "/gb2312":
+            self._send(200, "text/html", GB2312_PAGE.encode("gb2312"))
+        elif self.path == "/large":
+            self._send(200, "text/html; charset=utf-8", b"a" * 100_000)
+        elif self.path == "/report.pdf":
+            self._send(200, "application/pdf", b"%PDF-1.7")
+        elif self.path == "/moved":
+            self._redirect("/gb2312")
+        elif self.path == "/loop":
+            self._redirect("/loop")
+        elif self.path == "/to-intranet":
+            self._redirect("http://10.0.0.1/admin")
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NoRateLimits:
+    def acquire(self, **limits):
+        pass
+
+    async def acquire_async(self, **limits):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limits(monkeypatch):
+    monkeypatch.setattr(direct_client, "get_rate_limit_scheduler", NoRateLimits)
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    # The stub server listens on loopback
+    return DirectClient(max_bytes=1000, allow_private_addresses=True)
+
+
+@pytest.fixture(params=["sync", "async"])
+def fetch(request):
+    def fetch(client, url):
+        if request.param == "sync":
+            return client.crawl(url)
+        return asyncio.run(client.acrawl(url))
+
+    return fetch
+
+
+def test_decodes_gb2312_declared_in_meta(fetch, client, server_url):
+    html = fetch(client, f"{server_url}/gb2312")
+    assert "<title>贵州茅台</title>" in html
+    assert "营业收入同比增长" in html
+
+
+def test_body_is_cut_off_at_max_bytes(fetch, client, server_url):
+    assert fetch(client, f"{server_url}/large") == "a" * 1000
+
+
+def test_rejects_pdf(fetch, client, server_url):
+    with pytest.raises(UnsupportedContentError, match="application/pdf"):
+        fetch(client, f"{server_url}/report.pdf")
+
+
+def test_follows_redirects(fetch, client, server_url):
+    assert "营业收入同比增长" in fetch(client, f"{server_url}/moved")
+
+
+def test_stops_redirect_loops(fetch, client, server_url):
+    with pytest.raises(httpx.TooManyRedirects):
+        fetch(client, f"{server_url}/loop")
+
+
+def test_http_errors_raise(fetch, client, server_url):
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(client, f"{server_url}/missing")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/",
+        "http://localhost/",
+        "http://10.1.2.3/",
+        "http://192.168.0.1/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "http://0.0.0.0/",
+    ],
+)
+def test_rejects_internal_addresses(fetch, url):
+    with pytest.raises(BlockedAddressError):
+        fetch(DirectClient(), url)
+
+
+def test_rejects_non_http_urls(fetch):
+    with pytest.raises(ValueError, match="http"):
+        fetch(DirectClient(), "file:///etc/passwd")
+
+
+def test_redirect_targets_are_checked(fetch, server_url, monkeypatch):
+    # Let the stub server pass as a public site, but nothing else internal
+    monkeypatch.setattr(
+        direct_client,
+        "_is_public",
+        lambda address: address.is_loopback or address.is_global,
+    )
+    with pytest.raises(BlockedAddressError, match="10.0.0.1"):
+        fetch(DirectClient(), f"{server_url}/to-intranet")
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+
+import pytest
+
+from src.crawler.lxml_readability import LxmlReadabilityExtractor
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def extractor():
+    return LxmlReadabilityExtractor()
+
+
+@pytest.fixture
+def article_html():
+    return (FIXTURES / "article.html").read_text(encoding="utf-8")
+
+
+def test_extracts_the_article_body(extractor, article_html):
+    article = extractor.extract_article(article_html)
+
+    assert article.title == "Moutai Annual Results"
+    assert "150.6 billion yuan" in article.markdown
+    assert "i-Moutai app" in article.markdown
+    assert not article.truncated
+    for noise in ("tracking", "Markets", "newsletter", "All rights reserved"):
+        assert noise not in article.markdown
+    assert set(article.timings) == {"parse", "clean", "score", "markdown", "total"}
+
+
+def test_keeps_tables_as_markdown(extractor, article_html):
+    markdown = extractor.extract_article(article_html).markdown
+
+    assert "| Year | Revenue | Net profit |" in markdown
+    assert "| 2023 | 150.6 | 74.7 |" in markdown
+    # The table stays between the paragraphs around it
+    assert markdown.index("gross margin") < markdown.index("| Year")
+    assert markdown.index("| 2023") < markdown.index("Analysts expect")
+
+
+def test_keeps_articles_of_form_wrapped_pages(extractor):
+    # ASP.NET WebForms pages put their whole body into one form
+    html = (FIXTURES / "webforms.html").read_text(encoding="utf-8")
+    article = extractor.extract_article(html)
+
+    assert article.title == "贵州茅台发布2023年年度报告"
+    assert "营业总收入1505.6亿元" in article.markdown
+    assert "力争营业总收入增长15%左右" in article.markdown
+    # The search box inside the article is dropped
+    assert "高级搜索" not in article.markdown
+    assert "版权所有" not in article.markdown
+
+
+@pytest.mark.parametrize(
+    "head, title",
+    [
+        (
+            '<meta property="og:title" content="From og"><title>From title</title>',
+            "From og",
+        ),
+        ("<title> From title </title>", "From title"),
+        ("", "From heading"),
+    ],
+)
+def test_title_fallbacks(extractor, head, title):
+    html = f"<html><head>{head}</head><body><h1>From heading</h1></body></html>"
+    assert extractor.extract_article(html).title == title
+
+
+def test_max_chars_stops_the_conversion_early(extractor, article_html):
+    full = extractor.extract_article(article_html)
+    article = extractor.extract_article(article_html, max_chars=100)
+
+    assert article.truncated
+    assert full.markdown.startswith(article.markdown)
+    assert len(article.markdown) < len(full.markdown)
+    assert "i-Moutai app" not in article.markdown
+    assert "150.6 billion yuan" in article.markdown
+
+
+def test_max_chars_beyond_the_article_is_not_truncated(extractor, article_html):
+    full = extractor.extract_article(article_html)
+    article = extractor.extract_article(article_html, max_chars=100_000)
+
+    assert not article.truncated
+    assert article.markdown == full.markdown
+
+
+@pytest.mark.parametrize("html", ["", "   ", None])
+def test_empty_input(extractor, html):
+    article = extractor.extract_article(html)
+
+    assert article.title == ""
+    assert article.markdown == ""
+    assert not article.truncated
+    assert "total" in article.timings
+
+
+def test_xml_declaration_is_ignored(extractor, article_html):
+    html = '<?xml version="1.0" encoding="utf-8"?>\n' + article_html
+    article = extractor.extract_article(html)
+
+    assert article.title == "Moutai Annual Results"
+    assert "150.6 billion yuan" in article.markdown
+    assert "xml version" not in article.markdown
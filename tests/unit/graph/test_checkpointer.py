@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import operator
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.checkpoint.base import id as checkpoint_id
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.checkpointer import (
+    CheckpointerSettings,
+    checkpoint_timestamp,
+    open_checkpointer,
+    prune_checkpoints,
+)
+
+
+class State(TypedDict):
+    count: int
+    log: Annotated[list[str], operator.add]
+
+
+def build(saver):
+    builder = StateGraph(State)
+    builder.add_node(
+        "step", lambda state: {"count": state["count"] + 1, "log": ["step"]}
+    )
+    builder.add_node("finish", lambda state: {"log": ["finish"]})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", "finish")
+    builder.add_edge("finish", END)
+    # Stops like the human feedback node does, the thread must stay resumable
+    return builder.compile(checkpointer=saver, interrupt_before=["finish"])
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+async def count_checkpoints(saver, thread_id: str) -> int:
+    return len([c async for c in saver.alist(config(thread_id))])
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def settings(request, tmp_path):
+    return CheckpointerSettings(
+        backend=request.param,
+        sqlite_path=str(tmp_path / "checkpoints.db"),
+        ttl_seconds=3600,
+        max_checkpoints_per_thread=2,
+    )
+
+
+def test_checkpoint_timestamp_reads_uuid6_ids():
+    assert abs(checkpoint_timestamp(str(checkpoint_id.uuid6())) - time.time()) < 5
+
+
+def test_keeps_the_latest_checkpoints_and_resumes(settings):
+    async def run():
+        async with open_checkpointer(settings) as saver:
+            graph = build(saver)
+            for _ in range(3):
+                await graph.ainvoke({"count": 0, "log": []}, config("a"))
+            await graph.ainvoke({"count": 10, "log": []}, config("b"))
+            assert await count_checkpoints(saver, "a") > 2
+
+            assert await prune_checkpoints(saver, settings) == 0
+
+            assert await count_checkpoints(saver, "a") == 2
+            assert await count_checkpoints(saver, "b") == 2
+            # The interrupted thread resumes from its latest checkpoint
+            state = await graph.ainvoke(None, config("a"))
+            assert state["count"] == 1
+            assert state["log"][-2:] == ["step", "finish"]
+            assert (await graph.aget_state(config("b"))).next == ("finish",)
+
+    asyncio.run(run())
+
+
+def test_drops_threads_idle_beyond_the_ttl(settings, monkeypatch):
+    async def run():
+        async with open_checkpointer(settings) as saver:
+            graph = build(saver)
+            # Checkpoint ids carry the time they were taken at
+            with monkeypatch.context() as patch:
+                two_hours_ago = time.time_ns() - 7200 * 10**9
+                patch.setattr(time, "time_ns", lambda: two_hours_ago)
+                # uuid6 never goes back behind the ids it handed out already
+                patch.setattr(checkpoint_id, "_last_v6_timestamp", None)
+                await graph.ainvoke({"count": 0, "log": []}, config("old"))
+            await graph.ainvoke({"count": 0, "log": []}, config("new"))
+
+            assert await prune_checkpoints(saver, settings) == 1
+
+            assert await count_checkpoints(saver, "old") == 0
+            assert (await graph.aget_state(config("old"))).values == {}
+            assert await count_checkpoints(saver, "new") > 0
+            state = await graph.ainvoke(None, config("new"))
+            assert state["log"][-1] == "finish"
+
+    asyncio.run(run())
+
+
+def test_disabled_rules_keep_everything(settings):
+    settings.ttl_seconds = 0
+    settings.max_checkpoints_per_thread = 0
+
+    async def run():
+        async with open_checkpointer(settings) as saver:
+            graph = build(saver)
+            for _ in range(3):
+                await graph.ainvoke({"count": 0, "log": []}, config("a"))
+            before = await count_checkpoints(saver, "a")
+
+            assert await prune_checkpoints(saver, settings) == 0
+            assert await count_checkpoints(saver, "a") == before
+
+    asyncio.run(run())
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.graph.findings import (
+    Finding,
+    build_findings_context,
+    estimate_tokens,
+    summarize_finding,
+)
+
+TRUNCATED = "[...]"
+
+
+def test_estimate_tokens_counts_four_latin_chars_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("abcde") == 2
+
+
+def test_estimate_tokens_counts_every_cjk_char():
+    assert estimate_tokens("贵州茅台营业收入") == 8
+    # Full-width punctuation counts like CJK characters
+    assert estimate_tokens("营收增长，利润下降。") == 10
+    assert estimate_tokens("营收 growth") == 2 + 2
+
+
+def test_summarize_finding_keeps_short_text():
+    text = "# Revenue\n\nRevenue grew."
+    assert summarize_finding(text, max_tokens=100) == text
+
+
+def test_summarize_finding_prefers_headings_and_figures():
+    filler = "This paragraph only repeats general remarks about the market. " * 8
+    text = "\n\n".join(
+        [
+            "# Kweichow Moutai",
+            filler,
+            "Revenue reached 150.6 billion yuan in 2023, up 18%.",
+            filler,
+            "- Gross margin: 92%",
+        ]
+    )
+    summary = summarize_finding(text, max_tokens=60)
+
+    assert summary.startswith("# Kweichow Moutai")
+    assert "150.6 billion" in summary
+    assert "Gross margin: 92%" in summary
+    assert filler.strip() not in summary
+    assert summary.endswith(TRUNCATED)
+    # The kept blocks stay in document order
+    assert summary.index("150.6") < summary.index("Gross margin")
+
+
+def test_summarize_finding_respects_budget():
+    text = "\n\n".join(f"Paragraph {i} with figure {i * 7}." * 20 for i in range(20))
+    summary = summarize_finding(text, max_tokens=200)
+    assert estimate_tokens(summary) <= 200 + estimate_tokens(f"\n\n{TRUNCATED}")
+
+
+def test_summarize_finding_truncates_an_oversized_block():
+    text = "营业收入" * 500
+    summary = summarize_finding(text, max_tokens=100)
+    assert summary.startswith("营业收入")
+    assert summary.endswith(TRUNCATED)
+    assert estimate_tokens(summary) <= 100
+
+
+def test_build_findings_context_empty():
+    assert build_findings_context([], max_tokens=100) == []
+
+
+def test_build_findings_context_uses_full_results_when_they_fit():
+    findings = [Finding("a", "first result"), Finding("b", "second result")]
+    assert build_findings_context(findings, max_tokens=100) == [
+        "first result",
+        "second result",
+    ]
+
+
+def test_build_findings_context_upgrades_the_latest_findings_first():
+    findings = [
+        Finding(f"step {i}", "x" * 400, summary=f"summary {i}") for i in range(3)
+    ]
+    # The full results take 100 tokens each, the summaries 3
+    texts = build_findings_context(findings, max_tokens=150)
+
+    assert texts == ["summary 0", "summary 1", "x" * 400]
+
+
+def test_build_findings_context_summarizes_missing_summaries():
+    content = "\n\n".join(["# Heading", "y" * 4000, "Figure 42"])
+    texts = build_findings_context([Finding("a", content)], max_tokens=900)
+
+    assert texts == [summarize_finding(content)]
+    assert "Figure 42" in texts[0]
+
+
+def test_build_findings_context_truncates_summaries_evenly():
+    findings = [Finding(f"step {i}", "z" * 4000, summary="w" * 400) for i in range(4)]
+    # Even the summaries (100 tokens each) don't fit into 200 tokens
+    texts = build_findings_context(findings, max_tokens=200)
+
+    assert len(texts) == 4
+    for text in texts:
+        assert text.startswith("w")
+        assert text.endswith(TRUNCATED)
+        assert estimate_tokens(text) <= 50 + estimate_tokens(f"\n\n{TRUNCATED}")
@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.graph import findings, nodes
+from src.graph.nodes import _execute_agent_step, _get_steps_to_execute, reporter_node
+from src.prompts.planner_model import Plan, Step, StepType
+from src.tools.crawl import crawl_focus
+
+R, P = StepType.RESEARCH, StepType.PROCESSING
+
+
+def make_plan(*step_types: StepType) -> Plan:
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="",
+        title="Plan",
+        steps=[
+            Step(
+                need_web_search=step_type == R,
+                title=f"step {i}",
+                description=f"do {i}",
+                step_type=step_type,
+            )
+            for i, step_type in enumerate(step_types)
+        ],
+    )
+
+
+def titles(steps: list[Step]) -> list[str]:
+    return [step.title for step in steps]
+
+
+class FakeAgent:
+    """Answers every step after a delay, recording what it saw."""
+
+    def __init__(self, delays=None, fail=None):
+        self.delays = delays or {}
+        self.fail = fail
+        self.running = 0
+        self.peak = 0
+        self.focus = {}
+        self.finished = []
+
+    async def ainvoke(self, input):
+        task = input["messages"][0].content.split("## Title\n\n")[1].split("\n")[0]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(task, 0.01))
+            self.focus[task] = crawl_focus.get()
+            if task == self.fail:
+                raise RuntimeError(f"{task} failed")
+            self.finished.append(task)
+            return {"messages": [AIMessage(content=f"result of {task}")]}
+        finally:
+            self.running -= 1
+
+
+def test_batches_consecutive_research_steps():
+    plan = make_plan(R, R, R, P, R)
+    assert titles(_get_steps_to_execute(plan, 2)) == ["step 0", "step 1"]
+    assert titles(_get_steps_to_execute(plan, 5)) == ["step 0", "step 1", "step 2"]
+    assert titles(_get_steps_to_execute(plan, 1)) == ["step 0"]
+
+
+def test_processing_steps_run_alone():
+    plan = make_plan(P, R, R)
+    assert titles(_get_steps_to_execute(plan, 3)) == ["step 0"]
+    plan.steps[0].execution_res = "done"
+    assert titles(_get_steps_to_execute(plan, 3)) == ["step 1", "step 2"]
+
+
+def test_batches_stop_at_executed_steps():
+    plan = make_plan(R, R, R)
+    plan.steps[1].execution_res = "done"
+    assert titles(_get_steps_to_execute(plan, 3)) == ["step 0"]
+    plan.steps[0].execution_res = "done"
+    assert titles(_get_steps_to_execute(plan, 3)) == ["step 2"]
+    plan.steps[2].execution_res = "done"
+    assert _get_steps_to_execute(plan, 3) == []
+
+
+def test_mixed_plan_runs_in_order_with_isolated_steps():
+    plan = make_plan(R, R, R, P, R)
+    # The first step is the slowest, its result still comes first
+    agent = FakeAgent(delays={"step 0": 0.05})
+    state = {"current_plan": plan, "observations": [], "locale": "en-US"}
+
+    async def run():
+        batches = []
+        while _get_steps_to_execute(plan, 2):
+            command = await _execute_agent_step(state, agent, "researcher", 2)
+            batches.append(command.update["observations"][len(state["observations"]) :])
+            state["observations"] = command.update["observations"]
+        return batches
+
+    batches = asyncio.run(run())
+
+    assert batches == [
+        ["result of step 0", "result of step 1"],
+        ["result of step 2"],
+        ["result of step 3"],
+        ["result of step 4"],
+    ]
+    assert agent.peak == 2
+    assert [step.execution_res for step in plan.steps] == [
+        f"result of step {i}" for i in range(5)
+    ]
+    assert all(step.execution_summary for step in plan.steps)
+    # Every concurrent step crawls with its own focus
+    for i in range(5):
+        assert agent.focus[f"step {i}"] == f"step {i}\ndo {i}"
+
+
+def test_failed_step_cancels_its_batch():
+    plan = make_plan(R, R, R)
+    agent = FakeAgent(delays={"step 0": 10, "step 1": 0.01}, fail="step 1")
+    state = {"current_plan": plan, "observations": []}
+
+    async def run():
+        with pytest.raises(RuntimeError, match="step 1 failed"):
+            await _execute_agent_step(state, agent, "researcher", 3)
+        # Nothing of the batch keeps running in the background
+        assert agent.running == 0
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert agent.finished == ["step 2"]
+    assert all(step.execution_res is None for step in plan.steps)
+
+
+class FakeLLM:
+    def __init__(self):
+        self.messages = None
+
+    async def ainvoke(self, messages):
+        self.messages = messages
+        return AIMessage(content="report")
+
+
+def test_reporter_reuses_step_summaries(monkeypatch):
+    plan = make_plan(R, R)
+    for i, step in enumerate(plan.steps):
+        step.execution_res = f"result of step {i} " * 200
+        step.execution_summary = f"summary of step {i}"
+    # An observation no step produced anymore, e.g. from before a replan
+    observations = ["earlier result " * 200] + [s.execution_res for s in plan.steps]
+    summarized = []
+
+    def summarize(text, max_tokens=None):
+        summarized.append(text)
+        return "summarized"
+
+    llm = FakeLLM()
+    monkeypatch.setattr(findings, "summarize_finding", summarize)
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: llm)
+    state = {"current_plan": plan, "observations": observations}
+    config = {"configurable": {"max_report_findings_tokens": 30}}
+
+    result = asyncio.run(reporter_node(state, config))
+
+    assert result == {"final_report": "report"}
+    assert summarized == [observations[0]]
+    sent = [
+        m.content for m in llm.messages if getattr(m, "name", None) == "observation"
+    ]
+    assert "summarized" in sent[0]
+    assert "summary of step 0" in sent[1]
+    assert "summary of step 1" in sent[2]
@@ -0,0 +1,243 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import io
+import subprocess
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+from src.podcast import audio
+from src.podcast.audio import (
+    AudioDecodeError,
+    AudioMixer,
+    FFmpegEncoder,
+    PodcastAudioSettings,
+    WavEncoder,
+    decode_wav,
+    resample,
+)
+from src.podcast.graph.audio_mixer_node import audio_mixer_node
+from src.podcast.types import Script, ScriptLine
+
+RATE = 8000
+
+
+def make_wav(samples: np.ndarray, sample_rate: int = RATE, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((samples * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def tone(seconds: float, sample_rate: int = RATE, amplitude: float = 0.3):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def read_wav(data: bytes) -> tuple[int, np.ndarray]:
+    with wave.open(io.BytesIO(data)) as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        frames = wav.readframes(wav.getnframes())
+        return wav.getframerate(), np.frombuffer(frames, "<i2") / 32768.0
+
+
+@pytest.fixture
+def settings():
+    return PodcastAudioSettings(
+        input_format="wav",
+        output_format="wav",
+        sample_rate=RATE,
+        pause_ms=100,
+        crossfade_ms=10,
+    )
+
+
+def mix(mixer: AudioMixer, chunks: list[bytes]) -> bytes:
+    parts = [mixer.feed(chunk) for chunk in chunks]
+    parts.append(mixer.finish())
+    return mixer.finalize(b"".join(parts))
+
+
+def test_mix_length_accounts_for_pause_and_crossfades(settings):
+    mixer = AudioMixer(settings)
+    output = mix(mixer, [make_wav(tone(0.5)), make_wav(tone(0.25))])
+
+    sample_rate, pcm = read_wav(output)
+    assert sample_rate == RATE
+    crossfade, pause = RATE // 100, RATE // 10
+    # Both joins (line to pause, pause to line) overlap by one crossfade
+    assert len(pcm) == RATE // 2 + pause + RATE // 4 - 2 * crossfade
+
+
+def test_crossfade_fades_the_end_of_the_podcast_out(settings):
+    mixer = AudioMixer(settings)
+    _, pcm = read_wav(mix(mixer, [make_wav(np.full(RATE, 0.5, np.float32))]))
+
+    crossfade = RATE // 100
+    assert len(pcm) == RATE
+    assert np.all(np.diff(np.abs(pcm[-crossfade:])) <= 1e-4)
+    assert abs(pcm[-1]) < 0.01
+    # Ahead of the fade the line keeps its (normalized) level
+    assert np.allclose(pcm[: RATE - crossfade], pcm[0], atol=1e-3)
+
+
+def test_lines_are_resampled_to_the_mix_rate(settings):
+    mixer = AudioMixer(settings)
+    output = mix(mixer, [make_wav(tone(0.5, sample_rate=16000), sample_rate=16000)])
+
+    sample_rate, pcm = read_wav(output)
+    assert sample_rate == RATE
+    assert len(pcm) == RATE // 2
+
+
+def test_decode_wav_downmixes_stereo():
+    stereo = np.repeat(tone(0.1), 2)
+    pcm = decode_wav(make_wav(stereo, channels=2), RATE)
+    assert len(pcm) == len(tone(0.1))
+    assert np.allclose(pcm, tone(0.1), atol=1e-3)
+
+
+def test_resample_keeps_length_ratio():
+    pcm = tone(1.0, sample_rate=24000)
+    assert len(resample(pcm, 24000, 8000)) == 8000
+    assert resample(pcm, 24000, 24000) is pcm
+
+
+def test_wav_encoder_streams_then_finalizes_header():
+    encoder = WavEncoder(RATE)
+    streamed = encoder.encode(tone(0.1)) + encoder.encode(tone(0.1)) + encoder.flush()
+    # While streaming the length is unknown
+    assert streamed[:4] == b"RIFF" and streamed[8:16] == b"WAVEfmt "
+    assert streamed[40:44] == b"\xff\xff\xff\xff"
+
+    sample_rate, pcm = read_wav(encoder.finalize(streamed))
+    assert sample_rate == RATE
+    assert len(pcm) == 2 * len(tone(0.1))
+
+
+def test_wav_encoder_without_audio_writes_an_empty_file():
+    encoder = WavEncoder(RATE)
+    sample_rate, pcm = read_wav(encoder.finalize(encoder.flush()))
+    assert sample_rate == RATE
+    assert len(pcm) == 0
+
+
+def test_undecodable_line_leaves_the_mix_intact(settings):
+    mixer = AudioMixer(settings)
+    first = mixer.feed(make_wav(tone(0.5)))
+    with pytest.raises(AudioDecodeError):
+        mixer.feed(b"not a wav file")
+    rest = mixer.feed(make_wav(tone(0.25))) + mixer.finish()
+
+    _, pcm = read_wav(mixer.finalize(first + rest))
+    assert len(pcm) == RATE // 2 + RATE // 10 + RATE // 4 - 2 * (RATE // 100)
+
+
+def test_ffmpeg_failure_is_a_decode_error(settings, monkeypatch):
+    def run(*args, **kwargs):
+        raise subprocess.CalledProcessError(1, "ffmpeg", stderr=b"Invalid data")
+
+    monkeypatch.setattr(audio.subprocess, "run", run)
+    mixer = AudioMixer(settings, input_format="mp3")
+    with pytest.raises(AudioDecodeError, match="Invalid data"):
+        mixer.feed(b"\xff\xfb")
+
+
+def test_audio_mixer_node_reports_undecodable_lines(settings, monkeypatch):
+    monkeypatch.setattr(
+        PodcastAudioSettings, "from_conf", classmethod(lambda cls: settings)
+    )
+    script = Script(lines=[ScriptLine(paragraph=str(i)) for i in range(4)])
+    state = {
+        "script": script,
+        # Line 1 failed to synthesize, line 2 is corrupt
+        "audio_chunks": [make_wav(tone(0.5)), b"corrupt", make_wav(tone(0.25))],
+        "audio_format": "wav",
+        "failed_lines": [1],
+    }
+
+    result = audio_mixer_node(state)
+
+    assert result["failed_lines"] == [1, 2]
+    assert result["output_media_type"] == "audio/wav"
+    _, pcm = read_wav(result["output"])
+    assert len(pcm) == RATE // 2 + RATE // 10 + RATE // 4 - 2 * (RATE // 100)
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Replace ffmpeg with a process echoing its input, recording the processes."""
+    processes = []
+    popen = subprocess.Popen
+
+    def start(args, **kwargs):
+        process = popen(
+            [
+                sys.executable,
+                "-c",
+                "import shutil, sys; "
+                "shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)",
+            ],
+            **kwargs,
+        )
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(audio.subprocess, "Popen", start)
+    return processes
+
+
+def test_unused_ffmpeg_encoder_starts_no_process(fake_ffmpeg):
+    encoder = FFmpegEncoder(RATE, 64)
+    encoder.close()
+    assert fake_ffmpeg == []
+
+
+def test_ffmpeg_encoder_streams_and_flushes(fake_ffmpeg):
+    encoder = FFmpegEncoder(RATE, 64)
+    output = encoder.encode(tone(0.1)) + encoder.flush()
+    assert len(output) == 2 * len(tone(0.1))
+    encoder.close()
+    assert fake_ffmpeg[0].returncode == 0
+
+
+def test_abandoned_ffmpeg_encoder_is_stopped(fake_ffmpeg):
+    encoder = FFmpegEncoder(RATE, 64)
+    encoder.encode(tone(0.1))
+    (process,) = fake_ffmpeg
+    assert process.poll() is None
+
+    encoder.close()
+    assert process.poll() is not None
+    assert process.stdin.closed and process.stdout.closed
+    assert not encoder._reader.is_alive()
+    encoder.close()
+
+
+def test_audio_mixer_node_releases_the_encoder_on_errors(settings, monkeypatch):
+    monkeypatch.setattr(
+        PodcastAudioSettings, "from_conf", classmethod(lambda cls: settings)
+    )
+    closed = []
+    monkeypatch.setattr(AudioMixer, "close", lambda self: closed.append(self))
+
+    def feed(self, chunk):
+        raise MemoryError
+
+    monkeypatch.setattr(AudioMixer, "feed", feed)
+    state = {
+        "script": Script(lines=[ScriptLine(paragraph="a")]),
+        "audio_chunks": [make_wav(tone(0.5))],
+        "audio_format": "wav",
+    }
+
+    with pytest.raises(MemoryError):
+        audio_mixer_node(state)
+    assert len(closed) == 1
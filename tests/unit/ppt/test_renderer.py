@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from src.ppt import renderer
+from src.ppt.renderer import MarpRendererPool, MarpSettings, RendererBusyError
+
+
+class FakeServer:
+    """Stands in for a warm marp server."""
+
+    started = None
+
+    def __init__(self, settings):
+        if FakeServer.started is not None:
+            FakeServer.started.wait(5)
+        self.alive = True
+
+    def render(self, markdown):
+        return markdown.encode()
+
+    def stop(self):
+        self.alive = False
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(renderer, "_MarpServer", FakeServer)
+    monkeypatch.setattr(FakeServer, "started", None)
+    return MarpRendererPool(MarpSettings(workers=1, timeout_seconds=0.05))
+
+
+def test_renders_on_a_warm_server(pool):
+    assert pool.render("# deck") == b"# deck"
+    assert pool.stats()["server_renders"] == 1
+    assert pool.stats()["idle"] == 1
+
+
+def test_no_free_server_in_time_is_busy(pool, monkeypatch):
+    def oneshot(markdown):
+        raise AssertionError("must not spawn marp under load")
+
+    monkeypatch.setattr(pool, "_render_oneshot", oneshot)
+    pool._start()
+    server = pool._idle.get()
+
+    with pytest.raises(RendererBusyError):
+        pool.render("# deck")
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["waiting"] == 0
+
+    pool._idle.put(server)
+    assert pool.render("# deck") == b"# deck"
+
+
+def test_stats_stay_available_while_servers_boot(pool):
+    FakeServer.started = threading.Event()
+    thread = threading.Thread(target=pool._start)
+    thread.start()
+    try:
+        # _start holds only the start lock while the server boots
+        assert pool._lock.acquire(timeout=1)
+        pool._lock.release()
+        assert pool.stats()["servers"] == 0
+    finally:
+        FakeServer.started.set()
+        thread.join()
+    assert pool.stats()["servers"] == 1
+
+
+FAKE_MARP = """\
+#!/usr/bin/env node
+// Serves like `marp --server`, reporting where it listens
+const fs = require("fs");
+const http = require("http");
+const directory = process.argv[3];
+const server = http.createServer((req, res) => res.end("deck"));
+server.listen(process.env.PORT, () => {
+  fs.writeFileSync(directory + "/address", server.address().address);
+});
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_marp_server_listens_on_loopback_only(tmp_path):
+    command = tmp_path / "marp"
+    command.write_text(FAKE_MARP)
+    command.chmod(0o755)
+
+    server = renderer._MarpServer(MarpSettings(command=str(command)))
+    try:
+        address = os.path.join(server.directory, "address")
+        for _ in range(50):
+            if os.path.exists(address):
+                break
+            time.sleep(0.1)
+        with open(address) as f:
+            assert f.read() == "127.0.0.1"
+    finally:
+        server.stop()
+    assert not os.path.exists(server.preload)
+    assert not os.path.exists(server.directory)
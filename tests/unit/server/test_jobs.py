@@ -0,0 +1,185 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.server import jobs
+from src.server.jobs import (
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JobManager,
+    JobResult,
+    JobSettings,
+    QueueFullError,
+)
+
+
+def manager(**settings) -> JobManager:
+    return JobManager(JobSettings(**settings))
+
+
+async def wait_finished(job):
+    async for _ in job.watch():
+        pass
+
+
+def test_submitted_job_runs_and_keeps_its_result():
+    async def run():
+        jobs_ = manager()
+
+        async def runner(job):
+            job.publish("progress", node="writer")
+            return JobResult(content=b"done", media_type="text/plain")
+
+        job = jobs_.submit("prose", runner)
+        assert job.status == JOB_QUEUED
+        await wait_finished(job)
+
+        assert jobs_.get(job.id) is job
+        assert job.status == JOB_SUCCEEDED
+        assert job.result.content == b"done"
+        status = job.to_dict()
+        assert status["progress"] == ["writer"]
+        assert status["started_at"] <= status["finished_at"]
+        assert [e["status"] for e in job.events if e["event"] == "status"] == [
+            JOB_QUEUED,
+            JOB_RUNNING,
+            JOB_SUCCEEDED,
+        ]
+        assert jobs_.stats()["completed"][JOB_SUCCEEDED] == 1
+        await jobs_.stop()
+
+    asyncio.run(run())
+
+
+def test_failed_job_reports_its_error():
+    async def run():
+        jobs_ = manager()
+
+        async def runner(job):
+            raise RuntimeError("marp crashed")
+
+        job = jobs_.submit("ppt", runner)
+        await wait_finished(job)
+
+        assert job.status == JOB_FAILED
+        assert job.error == "marp crashed"
+        assert job.events[-1]["error"] == "marp crashed"
+        await jobs_.stop()
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_submissions():
+    async def run():
+        jobs_ = manager(max_concurrency=1, max_queue_size=1)
+        release = asyncio.Event()
+
+        async def runner(job):
+            await release.wait()
+            return JobResult(content="", media_type="text/plain")
+
+        running = jobs_.submit("podcast", runner)
+        await asyncio.sleep(0)
+        queued = jobs_.submit("podcast", runner)
+        with pytest.raises(QueueFullError):
+            jobs_.submit("podcast", runner)
+
+        assert jobs_.stats()["rejected"] == 1
+        release.set()
+        await wait_finished(running)
+        await wait_finished(queued)
+        await jobs_.stop()
+
+    asyncio.run(run())
+
+
+def test_cancel_running_and_queued_jobs():
+    async def run():
+        jobs_ = manager(max_concurrency=1)
+        started = asyncio.Event()
+
+        async def runner(job):
+            started.set()
+            await asyncio.sleep(3600)
+
+        running = jobs_.submit("podcast", runner)
+        queued = jobs_.submit("podcast", runner)
+        await started.wait()
+
+        assert jobs_.cancel(queued.id)
+        assert queued.status == JOB_CANCELLED
+        assert jobs_.cancel(running.id)
+        await wait_finished(running)
+        assert running.status == JOB_CANCELLED
+        # The worker skips the cancelled job instead of running it
+        await asyncio.sleep(0)
+        assert queued.started_at is None
+
+        assert not jobs_.cancel(running.id)
+        assert not jobs_.cancel("unknown")
+        assert jobs_.stats()["completed"][JOB_CANCELLED] == 2
+        await jobs_.stop()
+
+    asyncio.run(run())
+
+
+def test_finished_jobs_expire_after_retention(monkeypatch):
+    async def run():
+        now = [1000.0]
+        monkeypatch.setattr(jobs.time, "time", lambda: now[0])
+        jobs_ = manager(retention_seconds=60)
+
+        async def runner(job):
+            return JobResult(content="", media_type="text/plain")
+
+        job = jobs_.submit("prose", runner)
+        await wait_finished(job)
+
+        now[0] += 60
+        assert jobs_.prune() == 0
+        now[0] += 1
+        assert jobs_.prune() == 1
+        assert jobs_.get(job.id) is None
+        await jobs_.stop()
+
+    asyncio.run(run())
+
+
+def test_only_max_retained_finished_jobs_are_kept(monkeypatch):
+    async def run():
+        now = [1000.0]
+        monkeypatch.setattr(jobs.time, "time", lambda: now[0])
+        jobs_ = manager(max_retained=2)
+        release = asyncio.Event()
+
+        async def runner(job):
+            return JobResult(content="", media_type="text/plain")
+
+        async def blocked(job):
+            await release.wait()
+            return JobResult(content="", media_type="text/plain")
+
+        unfinished = jobs_.submit("podcast", blocked)
+        finished = []
+        for _ in range(3):
+            now[0] += 1
+            job = jobs_.submit("prose", runner)
+            await wait_finished(job)
+            finished.append(job)
+
+        assert jobs_.prune() == 1
+        # The oldest finished job goes, unfinished jobs are never evicted
+        assert jobs_.get(finished[0].id) is None
+        assert jobs_.get(finished[1].id) is finished[1]
+        assert jobs_.get(unfinished.id) is unfinished
+        release.set()
+        await wait_finished(unfinished)
+        await jobs_.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,179 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.server import mcp_utils
+from src.server.mcp_utils import MCPMetadataCache, mcp_metadata_key
+
+
+class FakeServer:
+    """Stands in for load_mcp_tools, listing a new version per load."""
+
+    def __init__(self):
+        self.loads = 0
+        self.fail = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def load(self, server_type, command=None, **kwargs):
+        self.loads += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("server crashed")
+        return [f"{command} v{self.loads}"]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    # Only the cache's clock, the event loop keeps the real one
+    monkeypatch.setattr(mcp_utils, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(mcp_utils, "load_mcp_tools", server.load)
+    return server
+
+
+def make_cache(**kwargs) -> MCPMetadataCache:
+    return MCPMetadataCache(**{"ttl_seconds": 60, "stale_seconds": 600, **kwargs})
+
+
+def get(cache, command="server", **kwargs):
+    return cache.get_tools("stdio", command=command, **kwargs)
+
+
+def test_key_hides_env_values():
+    key = mcp_metadata_key("stdio", "uvx", ["mcp"], env={"TOKEN": "secret"})
+    assert "secret" not in key
+    assert key != mcp_metadata_key("stdio", "uvx", ["mcp"], env={"TOKEN": "other"})
+    assert key == mcp_metadata_key("stdio", "uvx", ["mcp"], env={"TOKEN": "secret"})
+
+
+def test_concurrent_loads_share_one_request(clock, server):
+    async def run():
+        cache = make_cache()
+        server.release.clear()
+        calls = [asyncio.create_task(get(cache)) for _ in range(3)]
+        await asyncio.sleep(0)
+        server.release.set()
+        assert await asyncio.gather(*calls) == [["server v1"]] * 3
+        assert server.loads == 1
+        assert cache.stats()["misses"] == 3
+        assert cache.stats()["coalesced"] == 2
+        assert cache.stats()["inflight"] == 0
+
+    asyncio.run(run())
+
+
+def test_fresh_entries_are_served_from_the_cache(clock, server):
+    async def run():
+        cache = make_cache()
+        assert await get(cache) == ["server v1"]
+        clock[0] += 59
+        assert await get(cache) == ["server v1"]
+        assert server.loads == 1
+        assert cache.stats()["hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_stale_entries_are_served_while_revalidating(clock, server):
+    async def run():
+        cache = make_cache()
+        await get(cache)
+        clock[0] += 61
+        server.release.clear()
+        # Served at once, even though the server hangs
+        assert await get(cache) == ["server v1"]
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["inflight"] == 1
+        server.release.set()
+        await asyncio.sleep(0.01)
+        assert await get(cache) == ["server v2"]
+        assert cache.stats()["hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_expired_entries_are_loaded_again(clock, server):
+    async def run():
+        cache = make_cache()
+        await get(cache)
+        clock[0] += 661
+        assert await get(cache) == ["server v2"]
+        assert cache.stats()["misses"] == 2
+
+    asyncio.run(run())
+
+
+def test_refresh_ignores_the_cached_entry(clock, server):
+    async def run():
+        cache = make_cache()
+        await get(cache)
+        assert await get(cache, refresh=True) == ["server v2"]
+        assert await get(cache) == ["server v2"]
+
+    asyncio.run(run())
+
+
+def test_failed_loads_and_refreshes_are_counted_apart(clock, server):
+    async def run():
+        cache = make_cache()
+        server.fail = True
+        with pytest.raises(RuntimeError):
+            await get(cache)
+        assert cache.stats()["load_errors"] == 1
+        assert cache.stats()["refresh_errors"] == 0
+
+        server.fail = False
+        await get(cache)
+        clock[0] += 61
+        server.fail = True
+        # The stale entry outlives its failed revalidation
+        assert await get(cache) == ["server v2"]
+        await asyncio.sleep(0.01)
+        assert await get(cache) == ["server v2"]
+        await asyncio.sleep(0.01)
+        stats = cache.stats()
+        assert stats["load_errors"] == 1
+        assert stats["refresh_errors"] == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_request_keeps_the_shared_load(clock, server):
+    async def run():
+        cache = make_cache()
+        server.release.clear()
+        first = asyncio.create_task(get(cache))
+        second = asyncio.create_task(get(cache))
+        await asyncio.sleep(0)
+        first.cancel()
+        server.release.set()
+        assert await second == ["server v1"]
+        assert first.cancelled()
+
+    asyncio.run(run())
+
+
+def test_least_recently_used_servers_are_evicted(clock, server):
+    async def run():
+        cache = make_cache(max_entries=2)
+        await get(cache, "a")
+        await get(cache, "b")
+        await get(cache, "a")
+        await get(cache, "c")
+        assert cache.stats()["entries"] == 2
+        await get(cache, "a")
+        await get(cache, "b")
+        assert server.loads == 4
+
+    asyncio.run(run())
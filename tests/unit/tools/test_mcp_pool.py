@@ -0,0 +1,124 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.tools import mcp_pool
+from src.tools.mcp_pool import MCPClientPool
+
+
+class FakeSession:
+    """Stands in for a running MCP server."""
+
+    def __init__(self, server_name, server_config):
+        self.server_name = server_name
+        self.tools = [f"{server_name}_tool"]
+        self.last_used = 0.0
+        self.last_checked = 0.0
+        self.leases = 0
+        self.alive = True
+        self.closed = False
+
+    async def wait_ready(self, timeout):
+        pass
+
+    async def ping(self, timeout):
+        return True
+
+    async def close(self):
+        self.closed = True
+        self.alive = False
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(mcp_pool, "_MCPSession", FakeSession)
+    return MCPClientPool(idle_timeout=10, health_check_interval=3600)
+
+
+def _session(pool):
+    (session,) = pool._sessions.values()
+    return session
+
+
+def test_leased_session_survives_idle_timeout(pool, monkeypatch):
+    async def run():
+        now = [100.0]
+        monkeypatch.setattr(mcp_pool.time, "monotonic", lambda: now[0])
+        async with pool.lease("server", {"command": "x"}) as tools:
+            assert tools == ["server_tool"]
+            now[0] += 60
+            assert await pool.close_idle() == 0
+            assert not _session(pool).closed
+        assert _session(pool).leases == 0
+        # Idle time counts from the release
+        assert await pool.close_idle() == 0
+        now[0] += 11
+        assert await pool.close_idle() == 1
+        assert pool._sessions == {}
+
+    asyncio.run(run())
+
+
+def test_lease_is_released_on_error(pool):
+    async def run():
+        with pytest.raises(RuntimeError):
+            async with pool.lease("server", {"command": "x"}):
+                raise RuntimeError("step failed")
+        assert _session(pool).leases == 0
+
+    asyncio.run(run())
+
+
+def test_concurrent_leases_share_one_session(pool):
+    async def run():
+        async with pool.lease("server", {"command": "x"}):
+            async with pool.lease("server", {"command": "x"}):
+                assert _session(pool).leases == 2
+            assert _session(pool).leases == 1
+
+    asyncio.run(run())
+
+
+def test_dead_leased_session_is_closed(pool):
+    async def run():
+        async with pool.lease("server", {"command": "x"}):
+            session = _session(pool)
+            session.alive = False
+            assert await pool.close_idle() == 1
+            assert session.closed
+
+    asyncio.run(run())
+
+
+def test_failed_ping_spares_a_leased_session(monkeypatch):
+    monkeypatch.setattr(mcp_pool, "_MCPSession", FakeSession)
+    pool = MCPClientPool(idle_timeout=3600, health_check_interval=10)
+    pings = []
+
+    async def ping(self, timeout):
+        pings.append(self)
+        return False
+
+    monkeypatch.setattr(FakeSession, "ping", ping)
+
+    async def run():
+        now = [100.0]
+        monkeypatch.setattr(mcp_pool.time, "monotonic", lambda: now[0])
+        async with pool.lease("server", {"command": "x"}):
+            session = _session(pool)
+            now[0] += 60
+            # Another step asking for the same server shares the session
+            assert await pool.get_tools("server", {"command": "x"}) == session.tools
+            assert pings == []
+            assert _session(pool) is session and not session.closed
+
+        # Once released, a failed ping replaces it
+        await pool.get_tools("server", {"command": "x"})
+        assert pings == [session]
+        assert session.closed
+        assert _session(pool) is not session
+
+    asyncio.run(run())
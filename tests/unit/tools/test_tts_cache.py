@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.tools import tts_cache
+from src.tools.tts_cache import TTSAudioCache, TTSCacheSettings
+
+
+def test_removed_file_is_a_miss(tmp_path):
+    cache = TTSAudioCache(TTSCacheSettings(path=str(tmp_path)))
+    path = cache.set("key", "mp3", b"audio")
+    os.remove(path)
+
+    assert cache.get_path("key", "mp3") is None
+    assert cache.get("key", "mp3") is None
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+    assert stats["misses"] == 2
+
+
+def test_eviction_keeps_recently_used_audio(tmp_path):
+    cache = TTSAudioCache(
+        TTSCacheSettings(path=str(tmp_path), max_bytes=10, eviction_grace_seconds=0)
+    )
+    cache.set("a", "mp3", b"aaaa")
+    cache.set("b", "mp3", b"bbbb")
+    assert cache.get("a", "mp3") == b"aaaa"
+    cache.set("c", "mp3", b"cccc")
+
+    assert cache.get("b", "mp3") is None
+    assert cache.get("a", "mp3") == b"aaaa"
+    assert cache.get("c", "mp3") == b"cccc"
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "c.mp3"]
+
+
+def test_recently_used_audio_is_not_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tts_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = TTSAudioCache(
+        TTSCacheSettings(path=str(tmp_path), max_bytes=10, eviction_grace_seconds=60)
+    )
+    cache.set("a", "mp3", b"aaaa")
+    cache.set("b", "mp3", b"bbbb")
+    now[0] += 30
+    # "a" may still be streamed, so the cache goes over its bound for now
+    cache.set("c", "mp3", b"cccc")
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "b.mp3", "c.mp3"]
+    assert cache.stats()["bytes"] == 12
+
+    now[0] += 40
+    assert cache.get_path("a", "mp3") is not None
+    cache.set("d", "mp3", b"dddd")
+    # "b" aged out of the grace period, "a" was just used again
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "c.mp3", "d.mp3"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = TTSAudioCache(TTSCacheSettings(path=str(tmp_path)))
+
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tts_cache.os, "replace", replace)
+    with pytest.raises(OSError, match="disk full"):
+        cache.set("key", "mp3", b"audio")
+    assert os.listdir(tmp_path) == []
+    assert cache.stats()["entries"] == 0
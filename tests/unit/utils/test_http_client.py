@@ -0,0 +1,201 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import email.utils
+
+import httpx
+import pytest
+
+from src.utils import http_client
+from src.utils.http_client import HttpClient, HttpClientSettings, _AsyncPool
+
+URL = "https://api.example.com/search"
+NOW = 1_700_000_000.0
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.deferred = []
+
+    def acquire(self, upstream=None, domain=None):
+        pass
+
+    async def acquire_async(self, upstream=None, domain=None):
+        pass
+
+    def defer(self, seconds, upstream=None, domain=None):
+        self.deferred.append((seconds, upstream, domain))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(http_client, "get_rate_limit_scheduler", lambda: scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+
+    async def async_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    monkeypatch.setattr(http_client.asyncio, "sleep", async_sleep)
+    monkeypatch.setattr(http_client.time, "time", lambda: NOW)
+    return sleeps
+
+
+def mock_transport(responses):
+    """A transport answering from responses, which may hold exceptions."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.MockTransport(handler), requests
+
+
+def make_client(**settings) -> HttpClient:
+    return HttpClient(
+        HttpClientSettings(
+            **{"retries": 2, "backoff_factor": 0.5, "http2": False, **settings}
+        )
+    )
+
+
+def mock_client(responses, **settings):
+    transport, requests = mock_transport(responses)
+    client = make_client(**settings)
+    client._client = httpx.Client(transport=transport)
+    return client, requests
+
+
+def test_get_is_retried_with_exponential_backoff(scheduler, sleeps):
+    client, requests = mock_client([httpx.Response(502), httpx.Response(200)])
+    assert client.request("GET", URL).status_code == 200
+    assert len(requests) == 2
+    assert sleeps == [0.5]
+
+
+def test_last_response_is_returned_when_retries_run_out(scheduler, sleeps):
+    client, requests = mock_client([httpx.Response(503)])
+    assert client.request("GET", URL).status_code == 503
+    assert len(requests) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_backoff_is_capped(scheduler, sleeps):
+    client, _ = mock_client(
+        [httpx.Response(500)], retries=4, backoff_factor=1, max_backoff=3
+    )
+    client.request("GET", URL)
+    assert sleeps == [1, 2, 3, 3]
+
+
+def test_post_is_not_retried_by_default(scheduler, sleeps):
+    client, requests = mock_client([httpx.Response(503)])
+    assert client.request("POST", URL).status_code == 503
+    assert len(requests) == 1
+
+    client, requests = mock_client([httpx.ConnectError("refused")])
+    with pytest.raises(httpx.ConnectError):
+        client.request("POST", URL)
+    assert len(requests) == 1
+    assert sleeps == []
+
+
+def test_retry_opt_in_and_opt_out(scheduler, sleeps):
+    client, requests = mock_client([httpx.Response(503), httpx.Response(200)])
+    assert client.request("POST", URL, retry=True).status_code == 200
+    assert len(requests) == 2
+
+    client, requests = mock_client([httpx.Response(503)])
+    client.request("GET", URL, retry=False)
+    assert len(requests) == 1
+
+
+def test_transport_errors_are_retried(scheduler, sleeps):
+    client, requests = mock_client(
+        [httpx.ReadTimeout("slow"), httpx.ConnectError("refused"), httpx.Response(200)]
+    )
+    assert client.request("GET", URL).status_code == 200
+    assert len(requests) == 3
+
+    client, requests = mock_client([httpx.ConnectError("refused")])
+    with pytest.raises(httpx.ConnectError):
+        client.request("GET", URL)
+    assert len(requests) == 3
+
+
+def test_client_errors_are_not_retried(scheduler, sleeps):
+    client, requests = mock_client([httpx.Response(404)])
+    assert client.request("GET", URL).status_code == 404
+    assert len(requests) == 1
+
+
+def test_retry_after_seconds(scheduler, sleeps):
+    client, _ = mock_client(
+        [httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200)]
+    )
+    client.request("GET", URL, upstream="tavily", domain="example.com")
+    assert sleeps == [3.0]
+    # The whole upstream quota waits, not only this request
+    assert scheduler.deferred == [(3.0, "tavily", None)]
+
+
+def test_retry_after_http_date(scheduler, sleeps):
+    date = email.utils.formatdate(NOW + 7, usegmt=True)
+    client, _ = mock_client(
+        [httpx.Response(503, headers={"Retry-After": date}), httpx.Response(200)]
+    )
+    client.request("GET", URL, domain="example.com")
+    assert sleeps == [7.0]
+    assert scheduler.deferred == [(7.0, None, "example.com")]
+
+
+def test_retry_after_is_capped_and_invalid_values_ignored(scheduler, sleeps):
+    client, _ = mock_client(
+        [
+            httpx.Response(429, headers={"Retry-After": "3600"}),
+            httpx.Response(429, headers={"Retry-After": "soon"}),
+            httpx.Response(200),
+        ],
+        max_backoff=10,
+    )
+    client.request("GET", URL)
+    assert sleeps == [10, 1.0]
+
+
+def test_unthrottled_503_does_not_defer_the_quota(scheduler, sleeps):
+    client, _ = mock_client([httpx.Response(503), httpx.Response(200)])
+    client.request("GET", URL, upstream="jina")
+    assert scheduler.deferred == []
+
+
+def test_async_request_retries_like_the_sync_one(scheduler, sleeps):
+    async def run(method, responses, **kwargs):
+        transport, requests = mock_transport(responses)
+        client = make_client()
+        loop = asyncio.get_running_loop()
+        client._async_pools[loop] = _AsyncPool(httpx.AsyncClient(transport=transport))
+        response = await client.arequest(method, URL, **kwargs)
+        return response.status_code, len(requests)
+
+    assert asyncio.run(
+        run(
+            "GET",
+            [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)],
+        )
+    ) == (200, 2)
+    assert sleeps == [2.0]
+    assert asyncio.run(run("POST", [httpx.Response(503)])) == (503, 1)
+    assert asyncio.run(
+        run("POST", [httpx.Response(503), httpx.Response(200)], retry=True)
+    ) == (200, 2)
@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.utils import rate_limiter
+from src.utils.rate_limiter import RateLimitScheduler, RateLimitSettings, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A frozen time.monotonic, advanced by hand or by sleeping."""
+    now = [100.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    return now
+
+
+def test_burst_is_served_at_once_then_paced(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(5)] == [0, 0, 0, 0.5, 1.0]
+    stats = bucket.stats()
+    assert stats["acquired"] == 5
+    assert stats["max_wait_seconds"] == 1.0
+    assert stats["waited_seconds"] == 1.5
+
+
+def test_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(5):
+        bucket.reserve()
+    clock[0] += 10
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_partially_refilled_bucket(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    clock[0] += 1
+    # One token came back within the second
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 1
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    assert [bucket.reserve() for _ in range(100)] == [0] * 100
+
+
+def test_defer_holds_back_every_request(clock):
+    bucket = TokenBucket(rate=10, burst=10)
+    bucket.defer(5)
+    assert bucket.reserve() == 5
+    assert bucket.reserve() == 5
+    # A shorter Retry-After doesn't shorten the hold
+    bucket.defer(1)
+    assert bucket.reserve() == 5
+    clock[0] += 5
+    assert bucket.reserve() == 0
+    assert bucket.stats()["deferred"] == 2
+
+
+def scheduler(**settings) -> RateLimitScheduler:
+    return RateLimitScheduler(RateLimitSettings(**settings))
+
+
+def test_most_specific_domain_rule_wins():
+    limits = scheduler(
+        domain_rate=1,
+        domain_burst=3,
+        domains={
+            "sec.gov": {"rate": 10, "burst": 10},
+            ".data.sec.gov": {"rate": 2, "burst": 1},
+        },
+    )
+
+    def rule(domain):
+        (bucket,) = limits.buckets(domain=domain)
+        return bucket.rate, bucket.burst
+
+    assert rule("sec.gov") == (10, 10)
+    assert rule("WWW.SEC.GOV") == (10, 10)
+    assert rule("efts.data.sec.gov") == (2, 1)
+    assert rule("data.sec.gov") == (2, 1)
+    # Only whole labels match
+    assert rule("notsec.gov") == (1, 3)
+
+
+def test_buckets_are_shared_per_upstream_and_domain():
+    limits = scheduler()
+    jina = limits.buckets(upstream="jina", domain="example.com")
+    assert len(jina) == 2
+    assert limits.buckets(upstream="jina")[0] is jina[0]
+    assert limits.buckets(domain="EXAMPLE.com")[0] is jina[1]
+    assert limits.buckets(upstream="jina_anonymous")[0] is not jina[0]
+    # Upstreams without a configured quota are unlimited
+    assert limits.buckets(upstream="unknown") == []
+
+
+def test_request_waits_for_its_slowest_bucket(clock):
+    limits = scheduler(
+        upstreams={"tavily": {"rate": 1, "burst": 1}}, domain_rate=0.5, domain_burst=1
+    )
+    limits.acquire("tavily", "example.com")
+    assert clock[0] == 100
+    limits.acquire("tavily", "example.com")
+    assert clock[0] == 102
+    # Reservations were made in both buckets, the upstream one is free again
+    limits.acquire("tavily")
+    assert clock[0] == 102
+
+
+def test_defer_reaches_every_bucket_of_the_request(clock):
+    limits = scheduler(upstreams={"tavily": {"rate": 100, "burst": 100}})
+    limits.defer(3, upstream="tavily")
+    limits.acquire("tavily", "example.com")
+    assert clock[0] == 103
+    stats = limits.stats()["buckets"]
+    assert stats["upstream:tavily"]["deferred"] == 1
+    assert stats["domain:example.com"]["deferred"] == 0
+
+
+def test_disabled_scheduler_never_waits(clock):
+    limits = scheduler(
+        enabled=False, upstreams={"jina": {"rate": 0.1, "burst": 1}}, domain_rate=0.1
+    )
+    for _ in range(10):
+        limits.acquire("jina", "example.com")
+    limits.defer(60, upstream="jina")
+    limits.acquire("jina", "example.com")
+    assert clock[0] == 100
+    assert limits.stats() == {"enabled": False, "buckets": {}}
+
+
+def test_acquire_async_sleeps_for_the_reservation(clock, monkeypatch):
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", sleep)
+    limits = scheduler(upstreams={"arxiv": {"rate": 0.5, "burst": 1}})
+
+    async def run():
+        await limits.acquire_async("arxiv")
+        await limits.acquire_async("arxiv")
+
+    asyncio.run(run())
+    assert sleeps == [2.0]
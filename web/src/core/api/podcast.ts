@@ -15,7 +15,9 @@ export async function generatePodcast(content: string) {
     throw new Error(`HTTP error! status: ${response.status}`);
   }
   const arrayBuffer = await response.arrayBuffer();
-  const blob = new Blob([arrayBuffer], { type: "audio/mp3" });
+  const blob = new Blob([arrayBuffer], {
+    type: response.headers.get("Content-Type") ?? "audio/mp3",
+  });
   const audioUrl = URL.createObjectURL(blob);
   return audioUrl;
 }